@@ -0,0 +1,62 @@
+"""add a2a_history_messages table for incremental conversation history
+
+Revision ID: add_a2a_history_messages_table
+Revises: add_a2a_stream_events_table
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_a2a_history_messages_table"
+down_revision: Union[str, None] = "add_a2a_stream_events_table"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "a2a_history_messages",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("app_name", sa.String(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("session_id", sa.String(), nullable=False),
+        sa.Column("event_id", sa.String(), nullable=False),
+        sa.Column("part_index", sa.Integer(), nullable=False),
+        sa.Column("role", sa.String(), nullable=False),
+        sa.Column("author", sa.String(), nullable=True),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("invocation_id", sa.String(), nullable=True),
+        sa.Column("timestamp", sa.Float(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "session_id", "event_id", "part_index", name="uq_a2a_history_messages_event"
+        ),
+    )
+    op.create_index(
+        "idx_a2a_history_messages_session",
+        "a2a_history_messages",
+        ["app_name", "user_id", "session_id", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "idx_a2a_history_messages_session", table_name="a2a_history_messages"
+    )
+    op.drop_table("a2a_history_messages")
@@ -0,0 +1,50 @@
+"""add a2a_stream_events table for replayable A2A streams
+
+Revision ID: add_a2a_stream_events_table
+Revises: add_push_notification_deliveries
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_a2a_stream_events_table"
+down_revision: Union[str, None] = "add_push_notification_deliveries"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "a2a_stream_events",
+        sa.Column("task_id", sa.UUID(), nullable=False),
+        sa.Column("seq", sa.Integer(), nullable=False),
+        sa.Column("event", sa.JSON(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["task_id"], ["a2a_tasks.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("task_id", "seq"),
+    )
+    op.create_index(
+        "idx_a2a_stream_events_expires_at",
+        "a2a_stream_events",
+        ["expires_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_a2a_stream_events_expires_at", table_name="a2a_stream_events")
+    op.drop_table("a2a_stream_events")
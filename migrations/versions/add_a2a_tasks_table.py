@@ -0,0 +1,60 @@
+"""add a2a_tasks table for asynchronous A2A tasks
+
+Revision ID: add_a2a_tasks_table
+Revises: add_workflow_timers_table
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_a2a_tasks_table"
+down_revision: Union[str, None] = "add_workflow_timers_table"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "a2a_tasks",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("agent_id", sa.UUID(), nullable=False),
+        sa.Column("context_id", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("message", sa.JSON(), nullable=False),
+        sa.Column("history", sa.JSON(), nullable=True),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("push_notification_config", sa.JSON(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.CheckConstraint(
+            "status IN ('submitted', 'working', 'input-required', 'completed', 'canceled', 'failed')",
+            name="check_a2a_task_status",
+        ),
+        sa.ForeignKeyConstraint(["agent_id"], ["agents.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "idx_a2a_tasks_agent_context",
+        "a2a_tasks",
+        ["agent_id", "context_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_a2a_tasks_agent_context", table_name="a2a_tasks")
+    op.drop_table("a2a_tasks")
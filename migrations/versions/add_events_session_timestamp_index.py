@@ -0,0 +1,36 @@
+"""add events (app_name, user_id, session_id, timestamp) index
+
+Revision ID: add_events_session_timestamp_index
+Revises: add_retention_policies_table
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_events_session_timestamp_index"
+down_revision: Union[str, None] = "add_retention_policies_table"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Serves the windowed session loads and message paging, which read the
+    # latest events of one session. The events table is owned by the ADK.
+    op.create_index(
+        "idx_events_session_timestamp",
+        "events",
+        ["app_name", "user_id", "session_id", "timestamp"],
+        unique=False,
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_events_session_timestamp", table_name="events", if_exists=True)
@@ -0,0 +1,98 @@
+"""add indexes for hot lookups
+
+Revision ID: add_hot_lookup_indexes
+Revises: sanitize_agent_names
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_hot_lookup_indexes"
+down_revision: Union[str, None] = "sanitize_agent_names"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "idx_agents_client_name", "agents", ["client_id", "name"], unique=False
+    )
+    op.create_index(
+        "idx_agents_client_created_at",
+        "agents",
+        ["client_id", "created_at"],
+        unique=False,
+    )
+    op.create_index("idx_agents_folder_id", "agents", ["folder_id"], unique=False)
+    op.create_index(
+        "idx_agent_folders_client_name",
+        "agent_folders",
+        ["client_id", "name"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_api_keys_client_name", "api_keys", ["client_id", "name"], unique=False
+    )
+    op.create_index(
+        "idx_audit_logs_created_at", "audit_logs", ["created_at"], unique=False
+    )
+    op.create_index(
+        "idx_audit_logs_user_created_at",
+        "audit_logs",
+        ["user_id", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_audit_logs_resource_created_at",
+        "audit_logs",
+        ["resource_type", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_users_verification_token",
+        "users",
+        ["verification_token"],
+        unique=False,
+        postgresql_where=sa.text("verification_token IS NOT NULL"),
+    )
+    op.create_index(
+        "idx_users_password_reset_token",
+        "users",
+        ["password_reset_token"],
+        unique=False,
+        postgresql_where=sa.text("password_reset_token IS NOT NULL"),
+    )
+    # The sessions primary key already starts with app_name; this one also
+    # serves the per-agent listings ordered by update_time. The table is
+    # created by the ADK, so the index may already exist.
+    op.create_index(
+        "idx_sessions_app_name_update_time",
+        "sessions",
+        ["app_name", "update_time"],
+        unique=False,
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "idx_sessions_app_name_update_time", table_name="sessions", if_exists=True
+    )
+    op.drop_index("idx_users_password_reset_token", table_name="users")
+    op.drop_index("idx_users_verification_token", table_name="users")
+    op.drop_index("idx_audit_logs_resource_created_at", table_name="audit_logs")
+    op.drop_index("idx_audit_logs_user_created_at", table_name="audit_logs")
+    op.drop_index("idx_audit_logs_created_at", table_name="audit_logs")
+    op.drop_index("idx_api_keys_client_name", table_name="api_keys")
+    op.drop_index("idx_agent_folders_client_name", table_name="agent_folders")
+    op.drop_index("idx_agents_folder_id", table_name="agents")
+    op.drop_index("idx_agents_client_created_at", table_name="agents")
+    op.drop_index("idx_agents_client_name", table_name="agents")
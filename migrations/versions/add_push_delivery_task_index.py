@@ -0,0 +1,39 @@
+"""add push_notification_deliveries (task_id, created_at) index
+
+Revision ID: add_push_delivery_task_index
+Revises: add_hot_lookup_indexes
+Create Date: 2026-10-19 23:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_push_delivery_task_index"
+down_revision: Union[str, None] = "add_hot_lookup_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Serves the per-task ordering check made when deliveries are claimed
+    op.create_index(
+        "idx_push_notification_deliveries_task_created_at",
+        "push_notification_deliveries",
+        ["task_id", "created_at"],
+        unique=False,
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "idx_push_notification_deliveries_task_created_at",
+        table_name="push_notification_deliveries",
+        if_exists=True,
+    )
@@ -0,0 +1,84 @@
+"""add retention_policies table and sessions update_time index
+
+Revision ID: add_retention_policies_table
+Revises: add_archived_session_events_table
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_retention_policies_table"
+down_revision: Union[str, None] = "add_archived_session_events_table"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "retention_policies",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("client_id", sa.UUID(), nullable=True),
+        sa.Column("agent_id", sa.UUID(), nullable=True),
+        sa.Column("ttl_days", sa.Integer(), nullable=False),
+        sa.Column("action", sa.String(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.CheckConstraint(
+            "(client_id IS NULL) <> (agent_id IS NULL)",
+            name="check_retention_policy_scope",
+        ),
+        sa.CheckConstraint(
+            "action IN ('delete', 'archive')", name="check_retention_policy_action"
+        ),
+        sa.CheckConstraint("ttl_days >= 0", name="check_retention_policy_ttl"),
+        sa.ForeignKeyConstraint(["client_id"], ["clients.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["agent_id"], ["agents.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("client_id", name="uq_retention_policies_client"),
+        sa.UniqueConstraint("agent_id", name="uq_retention_policies_agent"),
+    )
+
+    # Sessions archived by the sweeper have no summary event
+    op.alter_column(
+        "archived_session_events",
+        "summary_event_id",
+        existing_type=sa.String(),
+        nullable=True,
+    )
+
+    # The sweeper scans sessions by last update time. The sessions table is
+    # created by the ADK, so the index may already exist.
+    op.create_index(
+        "idx_sessions_update_time",
+        "sessions",
+        ["update_time"],
+        unique=False,
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_sessions_update_time", table_name="sessions", if_exists=True)
+    op.execute(
+        "DELETE FROM archived_session_events WHERE summary_event_id IS NULL"
+    )
+    op.alter_column(
+        "archived_session_events",
+        "summary_event_id",
+        existing_type=sa.String(),
+        nullable=False,
+    )
+    op.drop_table("retention_policies")
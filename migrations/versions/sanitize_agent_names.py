@@ -0,0 +1,37 @@
+"""sanitize existing agent names
+
+Revision ID: sanitize_agent_names
+Revises: add_events_session_timestamp_index
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "sanitize_agent_names"
+down_revision: Union[str, None] = "add_events_session_timestamp_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Names are now sanitized when agents are created or updated instead of
+    # on every read; rewrite the rows saved before that
+    op.execute(
+        """
+        UPDATE agents
+        SET name = regexp_replace(name, '[^[:alnum:]_]', '_', 'g')
+        WHERE name ~ '[^[:alnum:]_]'
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The original names are not kept
+    pass
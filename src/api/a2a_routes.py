@@ -48,21 +48,21 @@ Features:
 - API key authentication
 """
 
+import asyncio
 import uuid
 import logging
 import json
 import base64
-import httpx
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 
 from fastapi import APIRouter, Depends, Header, Request, HTTPException
 from sqlalchemy.orm import Session
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, Response
 from sse_starlette.sse import EventSourceResponse
 from sqlalchemy.sql import text
 
-from src.config.database import get_db
+from src.config.database import get_db, SessionLocal, get_read_db
 from src.config.settings import settings
 from src.services.agent_service import get_agent
 from src.services.adk.agent_runner import run_agent, run_agent_stream
@@ -71,6 +71,29 @@ from src.services.service_providers import (
     artifacts_service,
     memory_service,
 )
+from src.services.a2a_task_service import (
+    TERMINAL_TASK_STATES,
+    a2a_stream_worker_pool,
+    a2a_task_worker_pool,
+    build_a2a_task_response,
+    create_a2a_task,
+    get_a2a_task,
+    set_a2a_task_push_config,
+    update_a2a_task_status,
+)
+from src.services.a2a_history_service import (
+    count_history_messages,
+    load_conversation_history,
+    message_hash,
+)
+from src.services.a2a_stream_service import a2a_stream_hub
+from src.utils.streaming import guard_event_stream
+from src.utils.a2a_enhanced_client import a2a_client_registry
+from src.services.agent_card_service import etag_matches, get_rendered_agent_card
+from src.services.push_notification_service import (
+    enqueue_push_notification,
+    push_notification_dispatcher,
+)
 from src.schemas.chat import FileData
 
 logger = logging.getLogger(__name__)
@@ -238,126 +261,23 @@ def create_task_response(
     return task_response
 
 
-def clean_message_content(content: str, role: str) -> str:
-    """Clean message content, extracting just the text if it contains JSON."""
-    if role == "agent" or role == "assistant":
-        # Check if content looks like JSON (starts with { and contains jsonrpc)
-        if content.strip().startswith("{") and "jsonrpc" in content:
-            try:
-                # Try to parse as JSON and extract the actual response text
-                import json
-
-                json_data = json.loads(content)
-
-                # Look for the actual text in artifacts
-                if "result" in json_data and "artifacts" in json_data["result"]:
-                    for artifact in json_data["result"]["artifacts"]:
-                        if "parts" in artifact:
-                            for part in artifact["parts"]:
-                                if part.get("type") == "text" and "text" in part:
-                                    return part["text"]
-
-                # Fallback: if we can't extract, return a cleaned version
-                return "Previous assistant response"
-
-            except (json.JSONDecodeError, KeyError):
-                # If not valid JSON, return as-is but truncated
-                return content[:100] + "..." if len(content) > 100 else content
-
-    return content
-
-
-def extract_conversation_history(
-    agent_id: str, external_id: str
+async def extract_conversation_history(
+    agent_id: str, external_id: str, limit: Optional[int] = None
 ) -> List[Dict[str, Any]]:
-    """Extract conversation history from session using the same logic as /sessions/{session_id}/messages."""
-    logger.info(
-        f"🔍 extract_conversation_history called with agent_id={agent_id}, external_id={external_id}"
-    )
-
+    """Latest messages of the conversation, read from the history projection."""
+    session_id = f"{external_id}_{agent_id}"
     try:
-        from src.services.session_service import get_session_events, get_session_by_id
-
-        # Get session ID in the correct format (same as working endpoint)
-        session_id = f"{external_id}_{agent_id}"
-        logger.info(f"📋 Constructed session_id: {session_id}")
-
-        # First, verify session exists (same as working endpoint)
-        logger.info(f"🔍 Verifying session exists...")
-        session = get_session_by_id(session_service, session_id)
-        if not session:
-            logger.warning(f"⚠️ Session not found: {session_id}")
-            return []
-
-        logger.info(f"✅ Session found: {session_id}")
-
-        # Get events using same method as working endpoint
-        logger.info(f"🔍 Getting events for session...")
-        events = get_session_events(session_service, session_id)
-        logger.info(
-            f"📋 get_session_events returned {len(events) if events else 0} events"
-        )
-
-        history = []
-
-        # Process events exactly like the working /messages endpoint
-        for i, event in enumerate(events):
-            logger.info(
-                f"🔍 Processing event {i}: id={getattr(event, 'id', 'NO_ID')}, author={getattr(event, 'author', 'NO_AUTHOR')}"
-            )
-
-            # Convert event to dict like in working endpoint
-            event_dict = (
-                event.model_dump() if hasattr(event, "model_dump") else event.__dict__
-            )
-
-            # Check if event has content with parts (same logic as working endpoint)
-            if event_dict.get("content") and event_dict["content"].get("parts"):
-                logger.info(
-                    f"📝 Event {i} has content with {len(event_dict['content']['parts'])} parts"
-                )
-
-                for j, part in enumerate(event_dict["content"]["parts"]):
-                    logger.info(f"📝 Processing part {j}: {part}")
-
-                    # Extract text content (same as working endpoint checks for text)
-                    if isinstance(part, dict) and part.get("text"):
-                        role = "user" if event_dict.get("author") == "user" else "agent"
-                        text_content = part["text"]
-
-                        # Clean the content to remove JSON artifacts
-                        cleaned_content = clean_message_content(text_content, role)
-                        logger.info(
-                            f"📝 Cleaned content for {role}: {cleaned_content[:50]}..."
-                        )
-
-                        # Create A2A compatible history entry
-                        history_entry = {
-                            "role": role,
-                            "content": cleaned_content,
-                            "messageId": event_dict.get("id"),
-                            "timestamp": event_dict.get("timestamp"),
-                            "author": event_dict.get("author"),
-                            "invocation_id": event_dict.get("invocation_id"),
-                        }
-
-                        history.append(history_entry)
-                        logger.info(f"✅ Added history entry {len(history)}: {role}")
-                    else:
-                        logger.info(f"📝 Part {j} has no text content: {part}")
-            else:
-                logger.warning(f"⚠️ Event {i} has no content or parts")
-
-        logger.info(
-            f"📚 extract_conversation_history extracted {len(history)} messages using working logic"
+        history = await load_conversation_history(
+            session_service,
+            app_name=agent_id,
+            user_id=external_id,
+            session_id=session_id,
+            limit=limit or settings.A2A_HISTORY_LIMIT,
         )
+        logger.debug(f"📚 {len(history)} history messages loaded for {session_id}")
         return history
-
     except Exception as e:
         logger.error(f"❌ Error extracting conversation history: {e}")
-        import traceback
-
-        logger.error(f"Full traceback: {traceback.format_exc()}")
         return []
 
 
@@ -395,34 +315,176 @@ def combine_histories(
     request_history: List[Dict[str, Any]], session_history: List[Dict[str, Any]]
 ) -> List[Dict[str, Any]]:
     """Combine request history with session history, avoiding duplicates."""
-    combined = []
-
-    # Add session history first
-    for msg in session_history:
-        combined.append(msg)
+    combined = list(session_history)
+    seen_ids = {msg["messageId"] for msg in combined if msg.get("messageId")}
+    seen_hashes = {message_hash(msg["role"], msg["content"]) for msg in combined}
 
     # Add request history, avoiding duplicates based on messageId or content
     for req_msg in request_history:
-        # Check if this message already exists in combined history
-        is_duplicate = False
-        for existing_msg in combined:
-            if (
-                req_msg.get("messageId")
-                and req_msg["messageId"] == existing_msg.get("messageId")
-            ) or (
-                req_msg["content"] == existing_msg["content"]
-                and req_msg["role"] == existing_msg["role"]
-            ):
-                is_duplicate = True
-                break
+        content_hash = message_hash(req_msg["role"], req_msg["content"])
+        if req_msg.get("messageId") in seen_ids or content_hash in seen_hashes:
+            continue
 
-        if not is_duplicate:
-            combined.append(req_msg)
+        combined.append(req_msg)
+        seen_hashes.add(content_hash)
+        if req_msg.get("messageId"):
+            seen_ids.add(req_msg["messageId"])
 
-    # Sort by timestamp if available, otherwise maintain order
     return combined
 
 
+SUPPORTED_METHODS = [
+    "message/send",
+    "message/stream",
+    "tasks/get",
+    "tasks/cancel",
+    "tasks/pushNotificationConfig/set",
+    "tasks/pushNotificationConfig/get",
+    "tasks/resubscribe",
+    "agent/authenticatedExtendedCard",
+]
+
+# Methods answered with an SSE stream, which cannot be part of a batch
+STREAMING_METHODS = {"message/stream", "tasks/resubscribe"}
+
+
+async def dispatch_a2a_method(
+    agent_id: uuid.UUID,
+    method: str,
+    params: Dict[str, Any],
+    request_id: Any,
+    db: Session,
+    request: Request,
+):
+    """Routes a JSON-RPC request to the handler of its method."""
+    logger.info(f"📝 Method: {method}, ID: {request_id}")
+
+    if method == "message/send":
+        return await handle_message_send(agent_id, params, request_id, db)
+    elif method == "message/stream":
+        return await handle_message_stream(agent_id, params, request_id, db)
+    elif method == "tasks/get":
+        return await handle_tasks_get(agent_id, params, request_id, db)
+    elif method == "tasks/cancel":
+        return await handle_tasks_cancel(agent_id, params, request_id, db)
+    elif method == "tasks/pushNotificationConfig/set":
+        return await handle_tasks_push_notification_config_set(
+            agent_id, params, request_id, db
+        )
+    elif method == "tasks/pushNotificationConfig/get":
+        return await handle_tasks_push_notification_config_get(
+            agent_id, params, request_id, db
+        )
+    elif method == "tasks/resubscribe":
+        return await handle_tasks_resubscribe(
+            agent_id,
+            params,
+            request_id,
+            db,
+            last_event_id=request.headers.get("last-event-id"),
+        )
+    elif method == "agent/authenticatedExtendedCard":
+        return await handle_agent_authenticated_extended_card(
+            agent_id, params, request_id, db
+        )
+    else:
+        # JSON-RPC error for method not found
+        return JSONResponse(
+            status_code=400,
+            content={
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "error": {
+                    "code": -32601,
+                    "message": "Method not found",
+                    "data": {
+                        "method": method,
+                        "supported_methods": SUPPORTED_METHODS,
+                    },
+                },
+            },
+        )
+
+
+def jsonrpc_error(request_id: Any, code: int, message: str, data: Any = None):
+    """Builds a JSON-RPC error object."""
+    error = {"code": code, "message": message}
+    if data is not None:
+        error["data"] = data
+    return {"jsonrpc": "2.0", "id": request_id, "error": error}
+
+
+async def process_a2a_batch(
+    agent_id: uuid.UUID, batch: List[Any], request: Request
+) -> Response:
+    """Executes a JSON-RPC batch.
+
+    Items run concurrently (up to A2A_BATCH_MAX_CONCURRENCY), each with its
+    own database session, and a failing item only produces its own error.
+    Results keep the order of the batch; notifications (no id) get no entry.
+    """
+    if not batch:
+        return JSONResponse(
+            content=jsonrpc_error(None, -32600, "Invalid Request", "Empty batch")
+        )
+    if len(batch) > settings.A2A_BATCH_MAX_SIZE:
+        return JSONResponse(
+            content=jsonrpc_error(
+                None,
+                -32600,
+                "Invalid Request",
+                f"Batch exceeds {settings.A2A_BATCH_MAX_SIZE} requests",
+            )
+        )
+
+    semaphore = asyncio.Semaphore(settings.A2A_BATCH_MAX_CONCURRENCY)
+
+    async def run_item(item: Any) -> Optional[Dict[str, Any]]:
+        if (
+            not isinstance(item, dict)
+            or item.get("jsonrpc") != "2.0"
+            or not isinstance(item.get("method"), str)
+        ):
+            request_id = item.get("id") if isinstance(item, dict) else None
+            return jsonrpc_error(request_id, -32600, "Invalid Request")
+
+        method = item["method"]
+        request_id = item.get("id")
+        if method in STREAMING_METHODS:
+            return jsonrpc_error(
+                request_id,
+                -32600,
+                "Invalid Request",
+                f"{method} is not supported in batch requests",
+            )
+
+        async with semaphore:
+            item_db = SessionLocal()
+            try:
+                response = await dispatch_a2a_method(
+                    agent_id, method, item.get("params", {}), request_id, item_db, request
+                )
+                result = json.loads(response.body)
+            except HTTPException as e:
+                result = jsonrpc_error(request_id, -32603, "Internal error", e.detail)
+            except Exception as e:
+                logger.error(f"Error processing batch item {request_id}: {e}")
+                result = jsonrpc_error(
+                    request_id, -32603, "Internal error", {"error": str(e)}
+                )
+            finally:
+                item_db.close()
+
+        # Notifications are executed but not answered
+        return result if "id" in item else None
+
+    results = await asyncio.gather(*(run_item(item) for item in batch))
+    responses = [result for result in results if result is not None]
+    if not responses:
+        return Response(status_code=204)
+    return JSONResponse(content=responses)
+
+
 @router.post("/{agent_id}")
 async def process_a2a_message(
     agent_id: uuid.UUID,
@@ -436,6 +498,7 @@ async def process_a2a_message(
     Supports:
     - message/send: Send a message and get response
     - message/stream: Send a message and stream response
+    - JSON-RPC 2.0 batches of non-streaming requests
     """
     logger.info(f"🎯 A2A Spec endpoint called for agent {agent_id}")
 
@@ -451,64 +514,21 @@ async def process_a2a_message(
         # Parse JSON-RPC request
         request_body = await request.json()
 
+        if isinstance(request_body, list):
+            return await process_a2a_batch(agent_id, request_body, request)
+
         jsonrpc = request_body.get("jsonrpc")
         if jsonrpc != "2.0":
             raise HTTPException(status_code=400, detail="Invalid JSON-RPC version")
 
-        method = request_body.get("method")
-        params = request_body.get("params", {})
-        request_id = request_body.get("id")
-
-        logger.info(f"📝 Method: {method}, ID: {request_id}")
-
-        if method == "message/send":
-            return await handle_message_send(agent_id, params, request_id, db)
-        elif method == "message/stream":
-            return await handle_message_stream(agent_id, params, request_id, db)
-        elif method == "tasks/get":
-            return await handle_tasks_get(agent_id, params, request_id, db)
-        elif method == "tasks/cancel":
-            return await handle_tasks_cancel(agent_id, params, request_id, db)
-        elif method == "tasks/pushNotificationConfig/set":
-            return await handle_tasks_push_notification_config_set(
-                agent_id, params, request_id, db
-            )
-        elif method == "tasks/pushNotificationConfig/get":
-            return await handle_tasks_push_notification_config_get(
-                agent_id, params, request_id, db
-            )
-        elif method == "tasks/resubscribe":
-            return await handle_tasks_resubscribe(agent_id, params, request_id, db)
-        elif method == "agent/authenticatedExtendedCard":
-            return await handle_agent_authenticated_extended_card(
-                agent_id, params, request_id, db
-            )
-        else:
-            # JSON-RPC error for method not found
-            return JSONResponse(
-                status_code=400,
-                content={
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "error": {
-                        "code": -32601,
-                        "message": "Method not found",
-                        "data": {
-                            "method": method,
-                            "supported_methods": [
-                                "message/send",
-                                "message/stream",
-                                "tasks/get",
-                                "tasks/cancel",
-                                "tasks/pushNotificationConfig/set",
-                                "tasks/pushNotificationConfig/get",
-                                "tasks/resubscribe",
-                                "agent/authenticatedExtendedCard",
-                            ],
-                        },
-                    },
-                },
-            )
+        return await dispatch_a2a_method(
+            agent_id,
+            request_body.get("method"),
+            request_body.get("params", {}),
+            request_body.get("id"),
+            db,
+            request,
+        )
 
     except json.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Invalid JSON")
@@ -518,7 +538,11 @@ async def process_a2a_message(
             status_code=500,
             content={
                 "jsonrpc": "2.0",
-                "id": request_body.get("id") if "request_body" in locals() else None,
+                "id": (
+                    request_body.get("id")
+                    if isinstance(locals().get("request_body"), dict)
+                    else None
+                ),
                 "error": {
                     "code": -32603,
                     "message": "Internal error",
@@ -648,15 +672,23 @@ async def handle_message_send(
     logger.info(f"📎 Extracted files: {len(files)}")
 
     # Generate IDs
-    task_id = str(uuid.uuid4())
+    task_id = None
     context_id = message.get("messageId", str(uuid.uuid4()))
 
+    # Runs with push notifications, or where the client does not want to wait,
+    # are executed by the worker pool and message/send returns the task at once
+    run_in_background = (
+        push_notification_config is not None or configuration.get("blocking") is False
+    )
+
     try:
         # Extract conversation history for context
         logger.info(
             f"🔍 Attempting to extract conversation history for agent {agent_id}, context {context_id}"
         )
-        conversation_history = extract_conversation_history(str(agent_id), context_id)
+        conversation_history = await extract_conversation_history(
+            str(agent_id), context_id
+        )
         logger.info(
             f"📚 Session history extracted: {len(conversation_history)} messages"
         )
@@ -671,9 +703,44 @@ async def handle_message_send(
         combined_history = combine_histories(request_history, conversation_history)
         logger.info(f"📖 Combined history has {len(combined_history)} total messages")
 
-        # Log detailed combined history for debugging
-        for i, msg in enumerate(combined_history):
-            logger.info(f"  History[{i}]: {msg['role']} - {msg['content'][:50]}...")
+        # Create current user message object for history
+        current_user_message = {
+            "content": text,
+            "messageId": message.get("messageId"),
+            "timestamp": None,  # Could add current timestamp
+        }
+
+        task = create_a2a_task(
+            db,
+            agent_id,
+            context_id,
+            message,
+            status="submitted" if run_in_background else "working",
+            push_notification_config=push_notification_config,
+        )
+        task_id = str(task.id)
+
+        if run_in_background:
+            a2a_task_worker_pool.submit(
+                task_id,
+                lambda: execute_a2a_task(
+                    task_id,
+                    agent_id,
+                    context_id,
+                    text,
+                    files,
+                    combined_history,
+                    current_user_message,
+                ),
+            )
+            logger.info(f"📨 Task {task_id} submitted to the worker pool")
+            return JSONResponse(
+                content={
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "result": build_a2a_task_response(get_a2a_task(db, task_id)),
+                }
+            )
 
         # Execute agent with files - the ADK runner will handle session history automatically
         logger.info(
@@ -702,13 +769,6 @@ async def handle_message_send(
             f"🏗️ Creating task response with {len(combined_history) if combined_history else 0} history messages"
         )
 
-        # Create current user message object for history
-        current_user_message = {
-            "content": text,
-            "messageId": message.get("messageId"),
-            "timestamp": None,  # Could add current timestamp
-        }
-
         # Create A2A compliant response with history
         task_response = create_task_response(
             task_id,
@@ -717,26 +777,23 @@ async def handle_message_send(
             combined_history if combined_history else None,
             current_user_message,
         )
+        update_a2a_task_status(db, task_id, "completed", result=task_response)
 
         logger.info(
             f"📦 Task response created with {len(task_response.get('artifacts', []))} artifacts"
         )
 
-        # Handle push notification if configured
-        if push_notification_config:
-            try:
-                await send_push_notification(task_response, push_notification_config)
-                logger.info(f"🔔 Push notification sent successfully")
-            except Exception as e:
-                logger.error(f"❌ Push notification failed: {e}")
-                # Continue execution - push notification failure shouldn't break the response
-
         return JSONResponse(
             content={"jsonrpc": "2.0", "id": request_id, "result": task_response}
         )
 
     except Exception as e:
         logger.error(f"❌ Agent execution error: {e}")
+        if task_id:
+            try:
+                update_a2a_task_status(db, task_id, "failed", error=str(e))
+            except Exception as update_error:
+                logger.error(f"❌ Could not mark task {task_id} as failed: {update_error}")
         return JSONResponse(
             content={
                 "jsonrpc": "2.0",
@@ -750,6 +807,93 @@ async def handle_message_send(
         )
 
 
+def notify_a2a_task(db: Session, snapshot: Optional[Dict[str, Any]]):
+    """Queues the task state for the push notification webhook, if configured."""
+    if not snapshot or not snapshot.get("push_notification_config"):
+        return
+    try:
+        enqueue_push_notification(
+            db,
+            build_a2a_task_response(snapshot),
+            snapshot["push_notification_config"],
+            task_id=snapshot["id"],
+        )
+        logger.info(f"🔔 Push notification queued for task {snapshot['id']}")
+    except Exception as e:
+        # Push notification failure shouldn't change the task state
+        logger.error(f"❌ Push notification failed for task {snapshot['id']}: {e}")
+
+
+async def execute_a2a_task(
+    task_id: str,
+    agent_id: uuid.UUID,
+    context_id: str,
+    text: str,
+    files: List[FileData],
+    combined_history: List[Dict[str, Any]],
+    current_user_message: Dict[str, Any],
+):
+    """Runs a submitted task on the worker pool, reporting each state transition.
+
+    The run uses its own database session because the request that created
+    the task has already returned.
+    """
+    db = SessionLocal()
+    try:
+        snapshot = update_a2a_task_status(db, task_id, "working")
+        if snapshot is None:
+            # Canceled before a worker picked it up
+            return
+        notify_a2a_task(db, snapshot)
+
+        try:
+            result = await asyncio.wait_for(
+                run_agent(
+                    agent_id=str(agent_id),
+                    external_id=context_id,
+                    message=text,
+                    session_service=session_service,
+                    artifacts_service=artifacts_service,
+                    memory_service=memory_service,
+                    db=db,
+                    files=files if files else None,
+                ),
+                timeout=settings.A2A_TASK_TIMEOUT,
+            )
+            task_response = create_task_response(
+                task_id,
+                context_id,
+                result.get("final_response", "No response"),
+                combined_history if combined_history else None,
+                current_user_message,
+            )
+            snapshot = update_a2a_task_status(
+                db, task_id, "completed", result=task_response
+            )
+        except asyncio.CancelledError:
+            snapshot = update_a2a_task_status(db, task_id, "canceled")
+            notify_a2a_task(db, snapshot)
+            raise
+        except asyncio.TimeoutError:
+            snapshot = update_a2a_task_status(
+                db,
+                task_id,
+                "failed",
+                error=f"Task timed out after {settings.A2A_TASK_TIMEOUT} seconds",
+            )
+        except Exception as e:
+            logger.error(f"❌ Task {task_id} execution error: {e}")
+            snapshot = update_a2a_task_status(db, task_id, "failed", error=str(e))
+
+        notify_a2a_task(db, snapshot)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Error running task {task_id}: {e}")
+    finally:
+        db.close()
+
+
 async def handle_message_stream(
     agent_id: uuid.UUID, params: Dict[str, Any], request_id: str, db: Session
 ) -> EventSourceResponse:
@@ -788,17 +932,79 @@ async def handle_message_stream(
         text = "Analyze the provided files"
 
     # Extract and combine conversation history
-    conversation_history = extract_conversation_history(str(agent_id), context_id)
+    conversation_history = await extract_conversation_history(
+        str(agent_id), context_id
+    )
     request_history = extract_history_from_params(params)
     combined_history = combine_histories(request_history, conversation_history)
 
-    async def stream_generator():
-        try:
-            logger.info(f"🌊 Starting stream for: {text} with {len(files)} files")
-            logger.info(
-                f"📚 ADK will provide session context automatically ({len(combined_history)} previous messages available)"
-            )
+    # The run is decoupled from this connection: events go to the task replay
+    # log, so clients can reconnect with tasks/resubscribe and Last-Event-ID
+    task = create_a2a_task(db, agent_id, context_id, message)
+    task_id = str(task.id)
+    a2a_stream_hub.open(task_id)
+    a2a_stream_worker_pool.submit(
+        task_id,
+        lambda: execute_a2a_stream_task(task_id, agent_id, context_id, text, files),
+    )
+    logger.info(
+        f"🌊 Stream task {task_id} started ({len(combined_history)} previous messages available)"
+    )
+
+    return EventSourceResponse(
+        guard_event_stream(
+            stream_a2a_task_events(task_id, request_id),
+            on_abort=lambda: a2a_stream_hub.release(task_id),
+        )
+    )
+
 
+def create_status_update_event(
+    task_id: str,
+    context_id: str,
+    state: str,
+    message: Optional[Dict[str, Any]] = None,
+    final: bool = False,
+) -> Dict[str, Any]:
+    """Create TaskStatusUpdateEvent according to A2A specification."""
+    status = {"state": state, "timestamp": datetime.now().isoformat() + "Z"}
+    if message:
+        status["message"] = message
+    return {
+        "id": task_id,
+        "taskId": task_id,
+        "contextId": context_id,
+        "kind": "status-update",
+        "status": status,
+        "final": final,
+    }
+
+
+async def execute_a2a_stream_task(
+    task_id: str,
+    agent_id: uuid.UUID,
+    context_id: str,
+    text: str,
+    files: List[FileData],
+):
+    """Runs a message/stream task, publishing every event to the replay log."""
+    db = SessionLocal()
+    seq = 0
+
+    async def publish(payload: Dict[str, Any]):
+        nonlocal seq
+        seq += 1
+        await a2a_stream_hub.publish(task_id, seq, payload)
+
+    try:
+        snapshot = update_a2a_task_status(db, task_id, "working")
+        if snapshot is None:
+            # Canceled before a worker picked it up
+            return
+        notify_a2a_task(db, snapshot)
+        await publish({"result": build_a2a_task_response(snapshot)})
+
+        try:
             # Stream agent execution - ADK handles session history automatically
             async for chunk in run_agent_stream(
                 agent_id=str(agent_id),
@@ -813,108 +1019,117 @@ async def handle_message_stream(
                 # Parse chunk and convert to A2A format
                 try:
                     chunk_data = json.loads(chunk)
-
-                    # Create TaskStatusUpdateEvent
-                    event = {
-                        "jsonrpc": "2.0",
-                        "id": request_id,
-                        "result": {
-                            "id": str(uuid.uuid4()),
-                            "status": {
-                                "state": "working",
-                                "message": chunk_data.get("content", {}),
-                            },
-                            "final": False,
-                        },
-                    }
-
-                    yield {"data": json.dumps(event)}
-
                 except Exception as e:
                     logger.error(f"Error processing chunk: {e}")
                     continue
 
-            # Send final event
-            final_event = {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {
-                    "id": str(uuid.uuid4()),
-                    "status": {"state": "completed"},
-                    "final": True,
-                },
-            }
-            yield {"data": json.dumps(final_event)}
+                await publish(
+                    {
+                        "result": create_status_update_event(
+                            task_id, context_id, "working", chunk_data.get("content", {})
+                        )
+                    }
+                )
 
+            snapshot = update_a2a_task_status(db, task_id, "completed")
+            await publish(
+                {
+                    "result": create_status_update_event(
+                        task_id, context_id, "completed", final=True
+                    )
+                }
+            )
+        except asyncio.CancelledError:
+            snapshot = update_a2a_task_status(db, task_id, "canceled")
+            notify_a2a_task(db, snapshot)
+            await publish(
+                {
+                    "result": create_status_update_event(
+                        task_id, context_id, "canceled", final=True
+                    )
+                }
+            )
+            raise
         except Exception as e:
             logger.error(f"❌ Streaming error: {e}")
-            error_event = {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "error": {
-                    "code": -32603,
-                    "message": "Streaming failed",
-                    "data": {"error": str(e)},
-                },
-            }
-            yield {"data": json.dumps(error_event)}
+            snapshot = update_a2a_task_status(db, task_id, "failed", error=str(e))
+            await publish(
+                {
+                    "error": {
+                        "code": -32603,
+                        "message": "Streaming failed",
+                        "data": {"error": str(e)},
+                    }
+                }
+            )
 
-    return EventSourceResponse(stream_generator())
+        notify_a2a_task(db, snapshot)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Error running stream task {task_id}: {e}")
+    finally:
+        await a2a_stream_hub.close(task_id)
+        db.close()
+
+
+async def stream_a2a_task_events(
+    task_id: str, request_id: Any, last_event_id: int = 0
+):
+    """SSE generator replaying the task log after last_event_id, then live events."""
+    replayed = False
+    async for seq, event in a2a_stream_hub.subscribe(task_id, last_event_id):
+        replayed = True
+        yield {
+            "id": str(seq),
+            "data": json.dumps({"jsonrpc": "2.0", "id": request_id, **event}),
+        }
+
+    if not replayed and not last_event_id:
+        # Task without a stream log (e.g. message/send): send its final state
+        db = SessionLocal()
+        try:
+            snapshot = get_a2a_task(db, task_id)
+        finally:
+            db.close()
+        if snapshot:
+            yield {
+                "data": json.dumps(
+                    {
+                        "jsonrpc": "2.0",
+                        "id": request_id,
+                        "result": build_a2a_task_response(snapshot),
+                    }
+                )
+            }
 
 
 @router.get("/{agent_id}/.well-known/agent.json")
 async def get_agent_card(
     agent_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: Session = Depends(get_read_db),
 ):
-    """Get agent card according to A2A specification."""
+    """Get agent card according to A2A specification.
 
-    logger.info(f"📋 Getting agent card for {agent_id}")
+    Cards are rendered once per agent version and served with a strong ETag,
+    so polling peers get a 304 while the agent is unchanged.
+    """
 
-    agent = get_agent(db, agent_id)
-    if not agent:
+    logger.debug(f"📋 Getting agent card for {agent_id}")
+
+    card = get_rendered_agent_card(db, agent_id)
+    if not card:
         raise HTTPException(status_code=404, detail="Agent not found")
 
-    # Build agent card following A2A specification
-    agent_card = {
-        "name": agent.name,
-        "description": agent.description or f"AI Agent {agent.name}",
-        "url": f"{settings.API_URL}/api/v1/a2a/{agent_id}",
-        "provider": {
-            "organization": "Evo AI Platform",
-            "url": settings.API_URL,
-        },
-        "version": "1.0.0",
-        "documentationUrl": f"{settings.API_URL}/docs",
-        "capabilities": {
-            "streaming": True,
-            "pushNotifications": True,  # Now supporting push notifications
-            "stateTransitionHistory": False,
-        },
-        "securitySchemes": {
-            "apiKey": {
-                "type": "apiKey",
-                "in": "header",
-                "name": "x-api-key",
-            }
-        },
-        "security": [{"apiKey": []}],
-        "defaultInputModes": ["text/plain", "application/json"],
-        "defaultOutputModes": ["text/plain", "application/json"],
-        "skills": [
-            {
-                "id": "general-assistance",
-                "name": "General AI Assistant",
-                "description": "Provides general AI assistance and task completion",
-                "tags": ["assistant", "general", "ai", "help"],
-                "examples": ["Help me with a task", "Answer my question"],
-                "inputModes": ["text"],
-                "outputModes": ["text"],
-            }
-        ],
+    headers = {
+        "ETag": card.etag,
+        "Cache-Control": f"public, max-age={settings.A2A_AGENT_CARD_MAX_AGE}",
     }
+    if etag_matches(request.headers.get("if-none-match"), card.etag):
+        return Response(status_code=304, headers=headers)
 
-    return JSONResponse(agent_card)
+    return Response(content=card.body, media_type="application/json", headers=headers)
 
 
 @router.get("/health")
@@ -967,6 +1182,7 @@ async def health_check():
             "authenticated_extended_cards": True,
             "https_security": True,
             "json_rpc_2_0": True,
+            "json_rpc_batch": True,
         },
         # Security features per A2A spec
         "security": {
@@ -975,6 +1191,8 @@ async def health_check():
             "webhook_validation": "HTTPS-only webhooks to prevent SSRF",
             "input_validation": "Full parameter validation on all RPC methods",
         },
+        "push_notification_delivery": push_notification_dispatcher.metrics(),
+        "a2a_remotes": a2a_client_registry.metrics(),
         # Extensions beyond A2A spec
         "extensions": {
             "conversation_history": f"{settings.API_URL}/api/v1/a2a/{{agent_id}}/conversation/history",
@@ -984,7 +1202,7 @@ async def health_check():
         "compatibility_notes": [
             "Supports both official A2A format and common variations",
             "Backward compatible with alternative field names",
-            "Task management adapted for synchronous execution model",
+            "Streams are replayable with tasks/resubscribe and Last-Event-ID",
             "Push notifications with multiple authentication schemes",
         ],
     }
@@ -1015,20 +1233,23 @@ async def list_agent_sessions(
         session_id = f"{external_id}_{agent_id}"
 
         # Try to get session
-        session = session_service.get_session(
+        session = await session_service.get_session(
             app_name=str(agent_id), user_id=external_id, session_id=session_id
         )
 
         if session:
-            # Extract conversation history
-            history = extract_conversation_history(str(agent_id), external_id)
+            # Make sure the projection exists before counting it
+            await extract_conversation_history(str(agent_id), external_id, limit=1)
+            message_count = count_history_messages(
+                db, str(agent_id), external_id, session_id
+            )
 
             sessions.append(
                 {
                     "sessionId": session_id,
                     "contextId": external_id,
                     "lastUpdate": getattr(session, "last_update_time", None),
-                    "messageCount": len(history),
+                    "messageCount": message_count,
                     "status": "active",
                 }
             )
@@ -1045,7 +1266,7 @@ async def get_session_history(
     agent_id: uuid.UUID,
     session_id: str,
     x_api_key: str = Header(None, alias="x-api-key"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     limit: int = 50,
 ):
     """Get conversation history for a specific session (A2A extension)."""
@@ -1067,12 +1288,10 @@ async def get_session_history(
         else:
             external_id = session_id
 
-        # Extract conversation history
-        history = extract_conversation_history(str(agent_id), external_id)
-
-        # Limit results
-        if limit > 0:
-            history = history[-limit:]
+        # Extract conversation history (only the requested window is loaded)
+        history = await extract_conversation_history(
+            str(agent_id), external_id, limit=limit if limit > 0 else None
+        )
 
         return JSONResponse(
             {"sessionId": session_id, "history": history, "total": len(history)}
@@ -1134,13 +1353,11 @@ async def get_conversation_history(
                 }
             )
 
-        # Extract conversation history using session_service
-        history = extract_conversation_history(str(agent_id), context_id)
-
-        # Limit history if requested
+        # Extract conversation history (only the requested window is loaded)
         limit = params.get("limit", 50)
-        if limit > 0:
-            history = history[-limit:]
+        history = await extract_conversation_history(
+            str(agent_id), context_id, limit=limit if limit > 0 else None
+        )
 
         # Format as A2A Task response with history artifacts
         task_id = str(uuid.uuid4())
@@ -1221,7 +1438,11 @@ async def get_conversation_history(
         return JSONResponse(
             content={
                 "jsonrpc": "2.0",
-                "id": request_body.get("id") if "request_body" in locals() else None,
+                "id": (
+                    request_body.get("id")
+                    if isinstance(locals().get("request_body"), dict)
+                    else None
+                ),
                 "error": {
                     "code": -32603,
                     "message": "Internal error",
@@ -1231,180 +1452,6 @@ async def get_conversation_history(
         )
 
 
-async def send_push_notification(
-    task_response: Dict[str, Any], push_notification_config: Dict[str, Any]
-):
-    """Send push notification according to A2A specification section 9.5.
-
-    A2A spec PushNotificationConfig object:
-    - url: The absolute HTTPS webhook URL where the A2A Server should POST task updates
-    - token (optional): Client-generated opaque token for validation
-    - authentication (optional): PushNotificationAuthenticationInfo for authenticating to client's webhook
-
-    Alternative formats supported for compatibility:
-    - webhookUrl instead of url
-    - webhookAuthenticationInfo instead of authentication
-    """
-    # Support both official spec format and common variations
-    webhook_url = push_notification_config.get("url") or push_notification_config.get(
-        "webhookUrl"
-    )
-    webhook_token = push_notification_config.get("token")
-
-    # Support both official and alternative authentication field names
-    authentication = push_notification_config.get(
-        "authentication"
-    ) or push_notification_config.get("webhookAuthenticationInfo")
-
-    if not webhook_url:
-        raise ValueError("pushNotificationConfig.url (or webhookUrl) is required")
-
-    # Validate HTTPS requirement (A2A spec: url MUST be HTTPS for security to prevent SSRF)
-    if not webhook_url.startswith("https://"):
-        raise ValueError(
-            "pushNotificationConfig.url MUST use HTTPS to prevent SSRF attacks"
-        )
-
-    logger.info(f"🔔 Sending push notification to: {webhook_url}")
-
-    # Prepare headers according to A2A spec section 9.5
-    headers = {
-        "Content-Type": "application/json",
-        "User-Agent": f"A2A-Server/{getattr(settings, 'API_VERSION', '1.0.0')}",
-    }
-
-    # Add client token if provided (A2A spec: server SHOULD include in X-A2A-Notification-Token header)
-    if webhook_token:
-        headers["X-A2A-Notification-Token"] = webhook_token
-        logger.info(f"🔑 Added client token to notification headers")
-
-    # Handle authentication according to A2A spec PushNotificationAuthenticationInfo
-    if authentication:
-        auth_type = authentication.get("type")
-
-        # Handle "none" type (no authentication)
-        if auth_type == "none":
-            logger.info(f"🔓 No authentication required for webhook")
-
-        # Handle schemes-based authentication (official A2A spec format)
-        elif "schemes" in authentication:
-            auth_schemes = authentication.get("schemes", [])
-            auth_credentials = authentication.get("credentials")
-
-            for scheme in auth_schemes:
-                if scheme.lower() == "bearer":
-                    # Bearer token authentication
-                    if auth_credentials:
-                        headers["Authorization"] = f"Bearer {auth_credentials}"
-                        logger.info(f"🔐 Added Bearer authentication")
-                    else:
-                        logger.warning(
-                            "⚠️ Bearer scheme specified but no credentials provided"
-                        )
-
-                elif scheme.lower() == "apikey":
-                    # API Key authentication
-                    if auth_credentials:
-                        try:
-                            # A2A spec example: JSON like {"in": "header", "name": "X-Client-Webhook-Key", "value": "actual_key"}
-                            if isinstance(auth_credentials, str):
-                                cred_data = json.loads(auth_credentials)
-                            else:
-                                cred_data = auth_credentials
-
-                            if cred_data.get("in") == "header":
-                                header_name = cred_data.get("name", "X-API-Key")
-                                header_value = cred_data.get("value")
-                                if header_value:
-                                    headers[header_name] = header_value
-                                    logger.info(
-                                        f"🔐 Added API Key authentication to header: {header_name}"
-                                    )
-                        except (json.JSONDecodeError, TypeError):
-                            # Fallback: treat credentials as direct API key value
-                            headers["X-API-Key"] = str(auth_credentials)
-                            logger.info(f"🔐 Added API Key authentication (fallback)")
-                    else:
-                        logger.warning(
-                            "⚠️ ApiKey scheme specified but no credentials provided"
-                        )
-
-                else:
-                    logger.warning(f"⚠️ Unsupported authentication scheme: {scheme}")
-
-        # Handle basic authentication types
-        elif auth_type == "bearer":
-            token = authentication.get("token") or authentication.get("credentials")
-            if token:
-                headers["Authorization"] = f"Bearer {token}"
-                logger.info(f"🔐 Added Bearer authentication (alternative format)")
-
-        elif auth_type == "apikey":
-            api_key = (
-                authentication.get("apiKey")
-                or authentication.get("key")
-                or authentication.get("credentials")
-            )
-            header_name = authentication.get("headerName", "X-API-Key")
-            if api_key:
-                headers[header_name] = api_key
-                logger.info(f"🔐 Added API Key authentication to header: {header_name}")
-
-        else:
-            logger.warning(f"⚠️ Unsupported authentication type: {auth_type}")
-
-    # According to A2A spec section 9.5, the notification payload should contain
-    # sufficient information for client to identify Task ID and new state
-    # The spec suggests sending the full Task object as JSON payload
-    notification_payload = task_response
-
-    try:
-        # Use 30 second timeout as recommended for webhook calls
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            logger.info(
-                f"📤 Sending POST request to webhook with {len(headers)} headers"
-            )
-
-            response = await client.post(
-                webhook_url, headers=headers, json=notification_payload
-            )
-
-            # Log the response according to A2A spec recommendations
-            if response.status_code == 200:
-                logger.info(f"✅ Push notification sent successfully to {webhook_url}")
-            elif 200 <= response.status_code < 300:
-                logger.info(
-                    f"✅ Push notification accepted with status {response.status_code} from {webhook_url}"
-                )
-            else:
-                logger.warning(
-                    f"⚠️ Push notification received non-success response: {response.status_code} from {webhook_url}"
-                )
-                try:
-                    response_text = response.text[
-                        :200
-                    ]  # Log first 200 chars of response
-                    logger.warning(f"Response body: {response_text}")
-                except:
-                    pass
-
-            # Don't raise exception for non-200 status codes per A2A spec
-            # The webhook might have its own status handling, and notification
-            # delivery is best-effort
-
-    except httpx.TimeoutException:
-        logger.error(f"❌ Push notification timeout (30s) to {webhook_url}")
-        raise Exception(f"Push notification timeout to {webhook_url}")
-
-    except httpx.RequestError as e:
-        logger.error(f"❌ Push notification request error to {webhook_url}: {e}")
-        raise Exception(f"Push notification request error: {e}")
-
-    except Exception as e:
-        logger.error(f"❌ Push notification unexpected error to {webhook_url}: {e}")
-        raise Exception(f"Push notification error: {e}")
-
-
 # Task management functions (A2A spec section 7.3-7.7)
 async def handle_tasks_get(
     agent_id: uuid.UUID, params: Dict[str, Any], request_id: str, db: Session
@@ -1413,7 +1460,7 @@ async def handle_tasks_get(
     logger.info(f"🔍 Processing tasks/get for agent {agent_id}")
 
     try:
-        task_id = params.get("taskId")
+        task_id = params.get("taskId") or params.get("id")
         if not task_id:
             return JSONResponse(
                 content={
@@ -1427,19 +1474,26 @@ async def handle_tasks_get(
                 }
             )
 
-        # In our implementation, tasks are ephemeral and complete immediately
-        # For A2A compliance, we return a completed task with minimal info
-        task_response = {
-            "id": task_id,
-            "status": {
-                "state": "completed",
-                "timestamp": datetime.now().isoformat() + "Z",
-            },
-            "kind": "task",
-        }
+        snapshot = get_a2a_task(db, task_id, agent_id)
+        if not snapshot:
+            return JSONResponse(
+                content={
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "error": {
+                        "code": -32001,
+                        "message": "Task not found",
+                        "data": {"taskId": task_id},
+                    },
+                }
+            )
 
         return JSONResponse(
-            content={"jsonrpc": "2.0", "id": request_id, "result": task_response}
+            content={
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "result": build_a2a_task_response(snapshot),
+            }
         )
 
     except Exception as e:
@@ -1464,7 +1518,7 @@ async def handle_tasks_cancel(
     logger.info(f"🛑 Processing tasks/cancel for agent {agent_id}")
 
     try:
-        task_id = params.get("taskId")
+        task_id = params.get("taskId") or params.get("id")
         if not task_id:
             return JSONResponse(
                 content={
@@ -1478,16 +1532,48 @@ async def handle_tasks_cancel(
                 }
             )
 
-        # In our implementation, tasks complete immediately, so cancellation is not needed
-        # Return success for A2A compliance
+        snapshot = get_a2a_task(db, task_id, agent_id)
+        if not snapshot:
+            return JSONResponse(
+                content={
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "error": {
+                        "code": -32001,
+                        "message": "Task not found",
+                        "data": {"taskId": task_id},
+                    },
+                }
+            )
+
+        canceled = None
+        if snapshot["status"] not in TERMINAL_TASK_STATES:
+            canceled = update_a2a_task_status(db, task_id, "canceled")
+
+        if not canceled:
+            return JSONResponse(
+                content={
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "error": {
+                        "code": -32002,
+                        "message": "Task cannot be canceled",
+                        "data": {"taskId": task_id, "state": snapshot["status"]},
+                    },
+                }
+            )
+
+        # Stops the run when it is executing in this process; runs in other
+        # processes see the canceled state and do not overwrite it
+        a2a_task_worker_pool.cancel(canceled["id"])
+        a2a_stream_worker_pool.cancel(canceled["id"])
+        notify_a2a_task(db, canceled)
+
         return JSONResponse(
             content={
                 "jsonrpc": "2.0",
                 "id": request_id,
-                "result": {
-                    "success": True,
-                    "message": f"Task {task_id} cancellation requested",
-                },
+                "result": build_a2a_task_response(canceled),
             }
         )
 
@@ -1507,8 +1593,6 @@ async def handle_tasks_cancel(
 
 
 # Task push notification config management (A2A spec section 7.5-7.6)
-task_push_configs = {}  # In-memory storage for demo - use database in production
-
 
 async def handle_tasks_push_notification_config_set(
     agent_id: uuid.UUID, params: Dict[str, Any], request_id: str, db: Session
@@ -1561,8 +1645,18 @@ async def handle_tasks_push_notification_config_set(
                 }
             )
 
-        # Store the config (in production, save to database)
-        task_push_configs[task_id] = push_config
+        if not set_a2a_task_push_config(db, task_id, agent_id, push_config):
+            return JSONResponse(
+                content={
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "error": {
+                        "code": -32001,
+                        "message": "Task not found",
+                        "data": {"taskId": task_id},
+                    },
+                }
+            )
         logger.info(f"✅ Push notification config stored for task {task_id}")
 
         return JSONResponse(
@@ -1609,8 +1703,8 @@ async def handle_tasks_push_notification_config_get(
                 }
             )
 
-        # Retrieve the config (in production, get from database)
-        push_config = task_push_configs.get(task_id)
+        snapshot = get_a2a_task(db, task_id, agent_id)
+        push_config = snapshot.get("push_notification_config") if snapshot else None
 
         if push_config:
             return JSONResponse(
@@ -1652,13 +1746,21 @@ async def handle_tasks_push_notification_config_get(
 
 
 async def handle_tasks_resubscribe(
-    agent_id: uuid.UUID, params: Dict[str, Any], request_id: str, db: Session
-) -> JSONResponse:
-    """Handle tasks/resubscribe according to A2A spec section 7.7."""
+    agent_id: uuid.UUID,
+    params: Dict[str, Any],
+    request_id: str,
+    db: Session,
+    last_event_id: Optional[str] = None,
+):
+    """Handle tasks/resubscribe according to A2A spec section 7.7.
+
+    Replays the task stream log after Last-Event-ID and continues with the
+    live events, without running the agent again.
+    """
     logger.info(f"🔄 Processing tasks/resubscribe for agent {agent_id}")
 
     try:
-        task_id = params.get("taskId")
+        task_id = params.get("taskId") or params.get("id")
         push_config = params.get("pushNotificationConfig")
 
         if not task_id:
@@ -1674,23 +1776,33 @@ async def handle_tasks_resubscribe(
                 }
             )
 
+        snapshot = get_a2a_task(db, task_id, agent_id)
+        if not snapshot:
+            return JSONResponse(
+                content={
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "error": {
+                        "code": -32001,
+                        "message": "Task not found",
+                        "data": {"taskId": task_id},
+                    },
+                }
+            )
+
         # Update push notification config if provided
         if push_config:
-            task_push_configs[task_id] = push_config
+            set_a2a_task_push_config(db, task_id, agent_id, push_config)
             logger.info(f"✅ Push notification config updated for task {task_id}")
 
-        # In our implementation, tasks complete immediately
-        # Return success for A2A compliance
-        return JSONResponse(
-            content={
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {
-                    "success": True,
-                    "taskId": task_id,
-                    "message": "Resubscription successful",
-                },
-            }
+        cursor = int(last_event_id) if last_event_id and last_event_id.isdigit() else 0
+        logger.info(f"🔁 Resubscribing to task {task_id} after event {cursor}")
+
+        return EventSourceResponse(
+            guard_event_stream(
+                stream_a2a_task_events(snapshot["id"], request_id, cursor),
+                on_abort=lambda: a2a_stream_hub.release(snapshot["id"]),
+            )
         )
 
     except Exception as e:
@@ -1715,9 +1827,8 @@ async def handle_agent_authenticated_extended_card(
     logger.info(f"🛡️ Processing agent/authenticatedExtendedCard for agent {agent_id}")
 
     try:
-        # Get agent from database
-        agent = get_agent(db, agent_id)
-        if not agent:
+        extended_card = get_rendered_agent_card(db, agent_id, extended=True)
+        if not extended_card:
             return JSONResponse(
                 content={
                     "jsonrpc": "2.0",
@@ -1729,65 +1840,14 @@ async def handle_agent_authenticated_extended_card(
                 }
             )
 
-        # Build authenticated extended agent card (can include additional info after auth)
-        extended_card = {
-            "name": agent.name,
-            "description": agent.description or f"AI Agent {agent.name}",
-            "url": f"{settings.API_URL}/api/v1/a2a/{agent_id}",
-            "provider": {
-                "organization": "Evo AI Platform",
-                "url": settings.API_URL,
-            },
-            "version": "1.0.0",
-            "documentationUrl": f"{settings.API_URL}/docs",
-            "capabilities": {
-                "streaming": True,
-                "pushNotifications": True,
-                "stateTransitionHistory": False,
-                "multiTurnConversations": True,
-                "fileProcessing": True,
-            },
-            "securitySchemes": {
-                "apiKey": {
-                    "type": "apiKey",
-                    "in": "header",
-                    "name": "x-api-key",
-                }
-            },
-            "security": [{"apiKey": []}],
-            "defaultInputModes": ["text/plain", "application/json"],
-            "defaultOutputModes": ["text/plain", "application/json"],
-            "skills": [
-                {
-                    "id": "general-assistance",
-                    "name": "General AI Assistant",
-                    "description": "Provides general AI assistance and task completion",
-                    "tags": ["assistant", "general", "ai", "help"],
-                    "examples": ["Help me with a task", "Answer my question"],
-                    "inputModes": ["text"],
-                    "outputModes": ["text"],
-                }
-            ],
-            # Extended information available after authentication
-            "extended": {
-                "agent_id": str(agent_id),
-                "creation_date": getattr(agent, "created_at", None),
-                "available_endpoints": [
-                    "message/send",
-                    "message/stream",
-                    "tasks/get",
-                    "tasks/cancel",
-                    "tasks/pushNotificationConfig/set",
-                    "tasks/pushNotificationConfig/get",
-                    "tasks/resubscribe",
-                    "agent/authenticatedExtendedCard",
-                ],
-                "rate_limits": {"requests_per_minute": 100, "concurrent_tasks": 10},
-            },
-        }
-
-        return JSONResponse(
-            content={"jsonrpc": "2.0", "id": request_id, "result": extended_card}
+        # Authenticated extended agent card (can include additional info after auth)
+        return Response(
+            content=b'{"jsonrpc":"2.0","id":'
+            + json.dumps(request_id).encode("utf-8")
+            + b',"result":'
+            + extended_card.body
+            + b"}",
+            media_type="application/json",
         )
 
     except Exception as e:
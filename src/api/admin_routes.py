@@ -27,12 +27,12 @@
 └──────────────────────────────────────────────────────────────────────────────┘
 """
 
-from typing import List
+from typing import Any, Dict, List
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from sqlalchemy.orm import Session
 import uuid
 
-from src.config.database import get_db
+from src.config.database import get_db, get_read_db, database_pool_metrics
 from src.core.jwt_middleware import get_jwt_token, verify_admin
 from src.schemas.audit import AuditLogResponse, AuditLogFilter
 from src.services.audit_service import get_audit_logs, create_audit_log
@@ -45,6 +45,13 @@ from src.services.user_service import (
     admin_reset_password,
 )
 from src.schemas.user import UserResponse, AdminUserCreate, AdminUserUpdate, AdminResetPassword, MessageResponse
+from src.schemas.retention import RetentionPolicyCreate, RetentionPolicyResponse
+from src.services.retention_service import (
+    get_retention_policies,
+    upsert_retention_policy,
+    delete_retention_policy,
+    retention_sweeper,
+)
 
 router = APIRouter(
     prefix="/admin",
@@ -58,7 +65,7 @@ router = APIRouter(
 @router.get("/audit-logs", response_model=List[AuditLogResponse])
 async def read_audit_logs(
     filters: AuditLogFilter = Depends(),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     payload: dict = Depends(get_jwt_token),
 ):
     """
@@ -90,7 +97,7 @@ async def read_audit_logs(
 async def read_admin_users(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     payload: dict = Depends(get_jwt_token),
 ):
     """
@@ -213,7 +220,7 @@ async def read_all_users(
     skip: int = 0,
     limit: int = 100,
     client_id: uuid.UUID = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     payload: dict = Depends(get_jwt_token),
 ):
     """
@@ -339,3 +346,126 @@ async def reset_user_password(
     )
 
     return {"message": message}
+
+
+# Session retention routes
+@router.get("/retention-policies", response_model=List[RetentionPolicyResponse])
+async def read_retention_policies(
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_read_db),
+    payload: dict = Depends(get_jwt_token),
+):
+    """
+    List session retention policies
+
+    Args:
+        skip: Number of records to skip
+        limit: Maximum number of records to return
+        db: Database session
+        payload: JWT token payload
+
+    Returns:
+        List[RetentionPolicyResponse]: Client and agent retention policies
+    """
+    return get_retention_policies(db, skip, limit)
+
+
+@router.post("/retention-policies", response_model=RetentionPolicyResponse)
+async def save_retention_policy(
+    policy_data: RetentionPolicyCreate,
+    request: Request,
+    db: Session = Depends(get_db),
+    payload: dict = Depends(get_jwt_token),
+):
+    """
+    Create or replace the retention policy of a client or agent
+
+    Args:
+        policy_data: Policy scope, retention period and action
+        request: FastAPI Request object
+        db: Database session
+        payload: JWT token payload
+
+    Returns:
+        RetentionPolicyResponse: Saved policy
+    """
+    policy = upsert_retention_policy(db, policy_data)
+
+    user_id = payload.get("user_id")
+    if user_id:
+        create_audit_log(
+            db,
+            user_id=uuid.UUID(user_id),
+            action="update",
+            resource_type="retention_policy",
+            resource_id=str(policy.id),
+            details={"ttl_days": policy.ttl_days, "action": policy.action},
+            request=request,
+        )
+
+    return policy
+
+
+@router.delete(
+    "/retention-policies/{policy_id}", status_code=status.HTTP_204_NO_CONTENT
+)
+async def remove_retention_policy(
+    policy_id: uuid.UUID,
+    request: Request,
+    db: Session = Depends(get_db),
+    payload: dict = Depends(get_jwt_token),
+):
+    """
+    Delete a retention policy; its sessions fall back to the next policy
+
+    Args:
+        policy_id: ID of the policy
+        request: FastAPI Request object
+        db: Database session
+        payload: JWT token payload
+
+    Raises:
+        HTTPException: If the policy does not exist
+    """
+    if not delete_retention_policy(db, policy_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Retention policy not found",
+        )
+
+    user_id = payload.get("user_id")
+    if user_id:
+        create_audit_log(
+            db,
+            user_id=uuid.UUID(user_id),
+            action="delete",
+            resource_type="retention_policy",
+            resource_id=str(policy_id),
+            details=None,
+            request=request,
+        )
+
+
+@router.get("/retention/metrics")
+async def read_retention_metrics() -> Dict[str, Any]:
+    """
+    Counters of the session retention sweeper since the process started
+
+    Returns:
+        Dict[str, Any]: Sweeps run, sessions deleted or archived and the last
+        sweep duration
+    """
+    return retention_sweeper.metrics()
+
+
+@router.get("/database/pools")
+async def read_database_pools() -> Dict[str, Any]:
+    """
+    Connection pool usage of the primary and read replica engines
+
+    Returns:
+        Dict[str, Any]: Pool counters per engine, with the replication lag and
+        health of each replica
+    """
+    return database_pool_metrics()
@@ -39,7 +39,7 @@ from fastapi import (
     Form,
 )
 from sqlalchemy.orm import Session
-from src.config.database import get_db
+from src.config.database import get_db, get_read_db
 from typing import List, Dict, Any, Optional, Union
 import uuid
 from src.core.jwt_middleware import (
@@ -133,7 +133,7 @@ async def read_api_keys(
         "name", description="Field to sort: name, provider, created_at"
     ),
     sort_direction: str = Query("asc", description="Sort direction: asc, desc"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     payload: dict = Depends(get_jwt_token),
 ):
     """List API keys for a client"""
@@ -150,7 +150,7 @@ async def read_api_keys(
 async def read_api_key(
     key_id: uuid.UUID,
     x_client_id: uuid.UUID = Header(..., alias="x-client-id"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     payload: dict = Depends(get_jwt_token),
 ):
     """Get details of a specific API key"""
@@ -266,7 +266,7 @@ async def read_folders(
     x_client_id: uuid.UUID = Header(..., alias="x-client-id"),
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     payload: dict = Depends(get_jwt_token),
 ):
     """List agent folders for a client"""
@@ -280,7 +280,7 @@ async def read_folders(
 async def read_folder(
     folder_id: uuid.UUID,
     x_client_id: uuid.UUID = Header(..., alias="x-client-id"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     payload: dict = Depends(get_jwt_token),
 ):
     """Get details of a specific folder"""
@@ -374,7 +374,7 @@ async def read_folder_agents(
     x_client_id: uuid.UUID = Header(..., alias="x-client-id"),
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     payload: dict = Depends(get_jwt_token),
 ):
     """List agents in a specific folder"""
@@ -464,7 +464,7 @@ async def read_agents(
     folder_id: Optional[uuid.UUID] = Query(None, description="Filter by folder"),
     sort_by: str = Query("name", description="Field to sort: name, created_at"),
     sort_direction: str = Query("asc", description="Sort direction: asc, desc"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     payload: dict = Depends(get_jwt_token),
 ):
     # Verify if the user has access to this client's data
@@ -503,7 +503,7 @@ async def create_agent(
 async def read_agent(
     agent_id: uuid.UUID,
     x_client_id: uuid.UUID = Header(..., alias="x-client-id"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     payload: dict = Depends(get_jwt_token),
 ):
     db_agent = agent_service.get_agent(db, agent_id)
@@ -611,7 +611,7 @@ async def share_agent(
 async def get_shared_agent(
     agent_id: uuid.UUID,
     api_key: str = Header(..., alias="x-api-key"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Get agent details using only API key authentication"""
     # Verify if the agent exists
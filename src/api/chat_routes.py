@@ -39,8 +39,9 @@ from fastapi import (
     Header,
 )
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.config.settings import settings
-from src.config.database import get_db
+from src.config.database import get_db, get_async_db
 from src.core.jwt_middleware import (
     get_jwt_token,
     verify_user_client,
@@ -84,7 +85,7 @@ async def get_agent_by_api_key(
     agent_id: str,
     api_key: Optional[str] = Header(None, alias="x-api-key"),
     authorization: Optional[str] = Header(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Flexible authentication for chat routes, allowing JWT or API key"""
     if authorization:
@@ -97,7 +98,7 @@ async def get_agent_by_api_key(
                 else authorization
             )
             payload = await get_jwt_token(token)
-            agent = agent_service.get_agent(db, agent_id)
+            agent = await agent_service.get_agent_snapshot_async(db, agent_id)
             if not agent:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -118,7 +119,7 @@ async def get_agent_by_api_key(
             detail="Authentication required (JWT or API key)",
         )
 
-    agent = agent_service.get_agent(db, agent_id)
+    agent = await agent_service.get_agent_snapshot_async(db, agent_id)
     if not agent or not agent.config:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Agent not found"
@@ -313,6 +314,7 @@ async def chat(
             "message_history": final_response["message_history"],
             "status": "success",
             "timestamp": datetime.now().isoformat(),
+            "workflow_trace": final_response.get("workflow_trace"),
         }
 
     except AgentNotFoundError as e:
@@ -30,7 +30,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, EmailStr
 from sqlalchemy.orm import Session
-from src.config.database import get_db
+from src.config.database import get_db, get_read_db
 from typing import List
 import uuid
 from src.core.jwt_middleware import (
@@ -104,7 +104,7 @@ async def create_user(
 async def read_clients(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     payload: dict = Depends(get_jwt_token),
 ):
     # If admin, can see all clients
@@ -123,7 +123,7 @@ async def read_clients(
 @router.get("/{client_id}", response_model=Client)
 async def read_client(
     client_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     payload: dict = Depends(get_jwt_token),
 ):
     # Verify if the user has access to this client's data
@@ -30,7 +30,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from src.config.database import get_db
+from src.config.database import get_db, get_read_db
 from typing import List
 import uuid
 from src.core.jwt_middleware import (
@@ -72,7 +72,7 @@ async def create_mcp_server(
 async def read_mcp_servers(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     payload: dict = Depends(get_jwt_token),
 ):
     # All authenticated users can list MCP servers
@@ -82,7 +82,7 @@ async def read_mcp_servers(
 @router.get("/{server_id}", response_model=MCPServer)
 async def read_mcp_server(
     server_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     payload: dict = Depends(get_jwt_token),
 ):
     # All authenticated users can view MCP server details
@@ -27,12 +27,16 @@
 └──────────────────────────────────────────────────────────────────────────────┘
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from sqlalchemy.orm import Session
-from src.config.database import get_db
-from typing import List, Optional, Dict, Any
+from src.config.database import get_db, get_read_db
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Tuple
+from urllib.parse import quote
+import re
 import uuid
-import base64
 from src.core.jwt_middleware import (
     get_jwt_token,
     verify_user_client,
@@ -43,11 +47,16 @@ from src.services import (
 from google.adk.events import Event
 from google.adk.sessions import Session as Adk_Session
 from src.services.session_service import (
-    get_session_events,
     get_session_by_id,
     delete_session,
     get_sessions_by_agent,
     get_sessions_by_client,
+    get_session_record,
+    get_session_events_page,
+    serialize_session_event,
+    load_session_artifact,
+    load_event_part,
+    parse_session_id,
 )
 from src.services.service_providers import session_service, artifacts_service
 import logging
@@ -60,23 +69,121 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+async def _authorize_session(session_id: str, db: Session, payload: dict) -> None:
+    """Checks that the session exists and belongs to the user's client, without
+    loading its events.
+
+    Sessions whose agent cannot be resolved (app name not an agent id, or
+    agent deleted) have no owner to check against, so only admins may read
+    them.
+    """
+    if not get_session_record(db, session_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Session not found"
+        )
+
+    _, app_name = parse_session_id(session_id)
+    agent = None
+    try:
+        agent = agent_service.get_agent(db, uuid.UUID(app_name))
+    except ValueError:
+        pass
+
+    if agent is None:
+        if payload.get("is_admin", False):
+            return
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied to access resources of this client",
+        )
+    await verify_user_client(payload, db, agent.client_id)
+
+
+def _download_response(
+    file: Optional[Tuple[bytes, str]], filename: str, range_header: Optional[str]
+) -> Response:
+    """Streams a file, honoring a single HTTP Range (bytes=start-end)"""
+    if file is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+
+    data, mime_type = file
+    size = len(data)
+    start, end = 0, size - 1
+    status_code = status.HTTP_200_OK
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f"inline; filename*=UTF-8''{quote(filename)}",
+    }
+
+    if range_header:
+        match = re.fullmatch(r"bytes=(\d*)-(\d*)", range_header.strip())
+        if match and match.group(1):
+            start = int(match.group(1))
+            if match.group(2):
+                end = min(int(match.group(2)), size - 1)
+        elif match and match.group(2):
+            start = max(size - int(match.group(2)), 0)
+        if not match or not any(match.groups()) or start > end:
+            return Response(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={"Content-Range": f"bytes */{size}"},
+            )
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    headers["Content-Length"] = str(end - start + 1)
+    body = memoryview(data)[start : end + 1]
+
+    def chunks():
+        for offset in range(0, len(body), DOWNLOAD_CHUNK_SIZE):
+            yield bytes(body[offset : offset + DOWNLOAD_CHUNK_SIZE])
+
+    return StreamingResponse(
+        chunks(), status_code=status_code, media_type=mime_type, headers=headers
+    )
+
 
 # Session Routes
 @router.get("/client/{client_id}")
 async def get_client_sessions(
     client_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    agent_id: Optional[uuid.UUID] = None,
+    external_id: Optional[str] = None,
+    updated_after: Optional[datetime] = None,
+    updated_before: Optional[datetime] = None,
+    db: Session = Depends(get_read_db),
     payload: dict = Depends(get_jwt_token),
 ):
+    """Lists the sessions of a client, most recently updated first.
+
+    The total number of matching sessions is returned in X-Total-Count.
+    """
     # Verify if the user has access to this client's data
     await verify_user_client(payload, db, client_id)
-    return get_sessions_by_client(db, client_id)
+    sessions, total = get_sessions_by_client(
+        db,
+        client_id,
+        skip=skip,
+        limit=limit,
+        agent_id=agent_id,
+        external_id=external_id,
+        updated_after=updated_after,
+        updated_before=updated_before,
+    )
+    response.headers["X-Total-Count"] = str(total)
+    return sessions
 
 
 @router.get("/agent/{agent_id}")
 async def get_agent_sessions(
     agent_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     payload: dict = Depends(get_jwt_token),
     skip: int = 0,
     limit: int = 100,
@@ -97,7 +204,7 @@ async def get_agent_sessions(
 @router.get("/{session_id}", response_model=Adk_Session)
 async def get_session(
     session_id: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     payload: dict = Depends(get_jwt_token),
 ):
     # Get the session
@@ -122,183 +229,75 @@ async def get_session(
 )
 async def get_agent_messages(
     session_id: str,
-    db: Session = Depends(get_db),
+    before: Optional[str] = Query(None, description="Cursor: events older than it"),
+    after: Optional[str] = Query(None, description="Cursor: events newer than it"),
+    limit: Optional[int] = Query(None, ge=1),
+    inline_artifacts: bool = Query(
+        False, description="Inline small binary parts and artifacts as base64"
+    ),
+    db: Session = Depends(get_read_db),
     payload: dict = Depends(get_jwt_token),
 ):
     """
-    Gets messages from a session with embedded artifacts.
+    Gets a page of messages from a session.
 
-    This function loads all messages from a session and processes any references
-    to artifacts, loading them and converting them to base64 for direct use in the frontend.
+    Events are keyset-paginated: without cursors the most recent ones are
+    returned; the X-Next-Before header holds the cursor of the older page (if
+    any) and X-Next-After the cursor to fetch newer events. Binary parts and
+    artifacts are returned as download URLs unless inline_artifacts is set.
     """
-    # Get the session
-    session = await get_session_by_id(session_service, session_id)
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Session not found"
-        )
-
-    # Verify if the session's agent belongs to the user's client
-    agent_id = uuid.UUID(session.app_name) if session.app_name else None
-    if agent_id:
-        agent = agent_service.get_agent(db, agent_id)
-        if agent:
-            await verify_user_client(payload, db, agent.client_id)
+    await _authorize_session(session_id, db, payload)
+
+    events, next_before, next_after = get_session_events_page(
+        db, session_id, before=before, after=after, limit=limit
+    )
+    processed_events = [
+        serialize_session_event(event, artifacts_service, inline_artifacts)
+        for event in events
+    ]
+
+    headers = {}
+    if next_before:
+        headers["X-Next-Before"] = next_before
+    if next_after:
+        headers["X-Next-After"] = next_after
+    return JSONResponse(content=jsonable_encoder(processed_events), headers=headers)
+
+
+@router.get("/{session_id}/messages/{event_id}/parts/{part_index}")
+async def download_message_part(
+    session_id: str,
+    event_id: str,
+    part_index: int,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    db: Session = Depends(get_read_db),
+    payload: dict = Depends(get_jwt_token),
+):
+    """Downloads a binary part of a message, supporting HTTP Range requests."""
+    await _authorize_session(session_id, db, payload)
+    return _download_response(
+        load_event_part(db, session_id, event_id, part_index),
+        f"{event_id}-{part_index}",
+        range_header,
+    )
 
-    # Parse session ID para obter app_name e user_id
-    parts = session_id.split("_")
-    if len(parts) != 2:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid session ID format"
-        )
 
-    user_id, app_name = parts[0], parts[1]
-
-    events = await get_session_events(session_service, session_id)
-
-    processed_events = []
-    for event in events:
-        event_dict = event.dict()
-
-        def process_dict(d):
-            if isinstance(d, dict):
-                for key, value in list(d.items()):
-                    if isinstance(value, bytes):
-                        try:
-                            d[key] = base64.b64encode(value).decode("utf-8")
-                            logger.debug(f"Converted bytes field to base64: {key}")
-                        except Exception as e:
-                            logger.error(f"Error encoding bytes to base64: {str(e)}")
-                            d[key] = None
-                    elif isinstance(value, dict):
-                        process_dict(value)
-                    elif isinstance(value, list):
-                        for item in value:
-                            if isinstance(item, (dict, list)):
-                                process_dict(item)
-            elif isinstance(d, list):
-                for i, item in enumerate(d):
-                    if isinstance(item, bytes):
-                        try:
-                            d[i] = base64.b64encode(item).decode("utf-8")
-                        except Exception as e:
-                            logger.error(
-                                f"Error encoding bytes to base64 in list: {str(e)}"
-                            )
-                            d[i] = None
-                    elif isinstance(item, (dict, list)):
-                        process_dict(item)
-            return d
-
-        # Process all event dictionary
-        event_dict = process_dict(event_dict)
-
-        # Process the content parts specifically
-        if event_dict.get("content") and event_dict["content"].get("parts"):
-            for part in event_dict["content"]["parts"]:
-                # Process inlineData if present
-                if part and part.get("inlineData") and part["inlineData"].get("data"):
-                    # Check if it's already a string or if it's bytes
-                    if isinstance(part["inlineData"]["data"], bytes):
-                        # Convert bytes to base64 string
-                        part["inlineData"]["data"] = base64.b64encode(
-                            part["inlineData"]["data"]
-                        ).decode("utf-8")
-                        logger.debug(
-                            f"Converted binary data to base64 in message {event_dict.get('id')}"
-                        )
-
-                # Process fileData if present (reference to an artifact)
-                if part and part.get("fileData") and part["fileData"].get("fileId"):
-                    try:
-                        # Extract the file name from the fileId
-                        file_id = part["fileData"]["fileId"]
-
-                        # Load the artifact from the artifacts service
-                        artifact = artifacts_service.load_artifact(
-                            app_name=app_name,
-                            user_id=user_id,
-                            session_id=session_id,
-                            filename=file_id,
-                        )
-
-                        if artifact and hasattr(artifact, "inline_data"):
-                            # Extract the data and MIME type
-                            file_bytes = artifact.inline_data.data
-                            mime_type = artifact.inline_data.mime_type
-
-                            # Add inlineData with the artifact data
-                            if not part.get("inlineData"):
-                                part["inlineData"] = {}
-
-                            # Ensure we're sending a base64 string, not bytes
-                            if isinstance(file_bytes, bytes):
-                                try:
-                                    part["inlineData"]["data"] = base64.b64encode(
-                                        file_bytes
-                                    ).decode("utf-8")
-                                except Exception as e:
-                                    logger.error(
-                                        f"Error encoding artifact to base64: {str(e)}"
-                                    )
-                                    part["inlineData"]["data"] = None
-                            else:
-                                part["inlineData"]["data"] = str(file_bytes)
-
-                            part["inlineData"]["mimeType"] = mime_type
-
-                            logger.debug(
-                                f"Loaded artifact {file_id} for message {event_dict.get('id')}"
-                            )
-                    except Exception as e:
-                        logger.error(f"Error loading artifact: {str(e)}")
-                        # Don't interrupt the flow if an artifact fails
-
-        # Check artifact_delta in actions
-        if event_dict.get("actions") and event_dict["actions"].get("artifact_delta"):
-            artifact_deltas = event_dict["actions"]["artifact_delta"]
-            for filename, version in artifact_deltas.items():
-                try:
-                    # Load the artifact
-                    artifact = artifacts_service.load_artifact(
-                        app_name=app_name,
-                        user_id=user_id,
-                        session_id=session_id,
-                        filename=filename,
-                        version=version,
-                    )
-
-                    if artifact and hasattr(artifact, "inline_data"):
-                        # If the event doesn't have an artifacts section, create it
-                        if "artifacts" not in event_dict:
-                            event_dict["artifacts"] = {}
-
-                        # Add the artifact to the event's artifacts list
-                        file_bytes = artifact.inline_data.data
-                        mime_type = artifact.inline_data.mime_type
-
-                        # Ensure the bytes are converted to base64
-                        event_dict["artifacts"][filename] = {
-                            "data": (
-                                base64.b64encode(file_bytes).decode("utf-8")
-                                if isinstance(file_bytes, bytes)
-                                else str(file_bytes)
-                            ),
-                            "mimeType": mime_type,
-                            "version": version,
-                        }
-
-                        logger.debug(
-                            f"Added artifact {filename} (v{version}) to message {event_dict.get('id')}"
-                        )
-                except Exception as e:
-                    logger.error(
-                        f"Error processing artifact_delta {filename}: {str(e)}"
-                    )
-
-        processed_events.append(event_dict)
-
-    return processed_events
+@router.get("/{session_id}/artifacts/{filename:path}")
+async def download_session_artifact(
+    session_id: str,
+    filename: str,
+    version: Optional[int] = None,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    db: Session = Depends(get_read_db),
+    payload: dict = Depends(get_jwt_token),
+):
+    """Downloads an artifact of a session, supporting HTTP Range requests."""
+    await _authorize_session(session_id, db, payload)
+    return _download_response(
+        load_session_artifact(artifacts_service, session_id, filename, version),
+        filename,
+        range_header,
+    )
 
 
 @router.delete(
@@ -29,7 +29,7 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from src.config.database import get_db
+from src.config.database import get_db, get_read_db
 from typing import List
 import uuid
 from src.core.jwt_middleware import (
@@ -71,7 +71,7 @@ async def create_tool(
 async def read_tools(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     payload: dict = Depends(get_jwt_token),
 ):
     # All authenticated users can list tools
@@ -81,7 +81,7 @@ async def read_tools(
 @router.get("/{tool_id}", response_model=Tool)
 async def read_tool(
     tool_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     payload: dict = Depends(get_jwt_token),
 ):
     # All authenticated users can view tool details
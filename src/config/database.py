@@ -27,22 +27,193 @@
 └──────────────────────────────────────────────────────────────────────────────┘
 """
 
-from sqlalchemy import create_engine
+import asyncio
+import itertools
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from src.config.settings import settings
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
 
 POSTGRES_CONNECTION_STRING = settings.POSTGRES_CONNECTION_STRING
 
+
+def to_async_url(url: str) -> str:
+    """Returns the asyncpg version of a PostgreSQL connection string"""
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix) :]
+    return url
+
+
+# Sync engine, used by Alembic, the seeders and the services not yet ported
 engine = create_engine(POSTGRES_CONNECTION_STRING)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine, for queries made from the event loop
+async_engine = create_async_engine(
+    to_async_url(POSTGRES_CONNECTION_STRING), pool_pre_ping=True
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
+# Seconds since the last transaction replayed on the replica. NULL means the
+# replica has never replayed anything (or is not a standby), which counts as
+# unusable; a detached replica keeps aging and goes over the limit.
+REPLICA_LAG_QUERY = text(
+    "SELECT EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())"
+)
+
+
+class Replica:
+    """Read replica engine with its last measured replication lag"""
+
+    def __init__(self, url: str):
+        self.engine = create_engine(url, pool_pre_ping=True)
+        self.lag: Optional[float] = None
+        self.checked_at = 0.0
+        self.healthy = False
+
+    def probe(self):
+        """Measures the lag with a blocking query; run it off the event loop"""
+        try:
+            with self.engine.connect() as connection:
+                lag = connection.execute(REPLICA_LAG_QUERY).scalar()
+            self.lag = float(lag) if lag is not None else None
+            self.healthy = (
+                self.lag is not None and self.lag <= settings.DB_REPLICA_MAX_LAG_SECONDS
+            )
+            if not self.healthy:
+                logger.warning(
+                    f"Replica {self.engine.url.host} lag is {self.lag}s, "
+                    "reading from the primary"
+                )
+        except Exception as e:
+            self.lag = None
+            self.healthy = False
+            logger.warning(f"Replica {self.engine.url.host} unavailable: {str(e)}")
+        self.checked_at = time.monotonic()
+
+    def is_usable(self) -> bool:
+        """Returns the last probe result without touching the database.
+
+        A result older than three check intervals (monitor not running or
+        stuck) is not trusted.
+        """
+        stale_after = settings.DB_REPLICA_LAG_CHECK_INTERVAL * 3
+        return self.healthy and time.monotonic() - self.checked_at < stale_after
+
+
+replicas: List[Replica] = [
+    Replica(url.strip())
+    for url in (settings.POSTGRES_REPLICA_CONNECTION_STRING or "").split(",")
+    if url.strip()
+]
+_replica_cycle = itertools.cycle(replicas) if replicas else None
+
+
+class ReplicaMonitor:
+    """Background loop refreshing the lag of every replica"""
+
+    def __init__(self):
+        self._loop_task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Starts the probe loop in the current event loop"""
+        if replicas and (self._loop_task is None or self._loop_task.done()):
+            self._loop_task = asyncio.create_task(self._run())
+            logger.info(f"Replica monitor started for {len(replicas)} replicas")
+
+    async def stop(self):
+        if self._loop_task:
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except asyncio.CancelledError:
+                pass
+            self._loop_task = None
+            logger.info("Replica monitor stopped")
+
+    async def _run(self):
+        while True:
+            await asyncio.gather(
+                *(asyncio.to_thread(replica.probe) for replica in replicas)
+            )
+            await asyncio.sleep(settings.DB_REPLICA_LAG_CHECK_INTERVAL)
+
+
+replica_monitor = ReplicaMonitor()
+
 Base = declarative_base()
 
 
+def _read_engine() -> Engine:
+    """Next replica within the lag limit, or the primary"""
+    for _ in range(len(replicas)):
+        replica = next(_replica_cycle)
+        if replica.is_usable():
+            return replica.engine
+    return engine
+
+
+def read_session() -> Session:
+    """Session for read-only work, bound to a replica when one is usable.
+
+    Never write through it: replicas reject writes, and reads after a write
+    may not see it yet.
+    """
+    return SessionLocal(bind=_read_engine())
+
+
+def _pool_metrics(target: Engine) -> Dict[str, Any]:
+    pool = target.pool
+    metrics = {"pool": pool.status()}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        if hasattr(pool, name):
+            metrics[name] = getattr(pool, name)()
+    return metrics
+
+
+def database_pool_metrics() -> Dict[str, Any]:
+    """Connection pool usage of the primary and replica engines"""
+    return {
+        "primary": _pool_metrics(engine),
+        "replicas": [
+            {
+                "host": replica.engine.url.host,
+                "lag_seconds": replica.lag,
+                "healthy": replica.healthy,
+                **_pool_metrics(replica.engine),
+            }
+            for replica in replicas
+        ],
+    }
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    db = read_session()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -97,3 +97,22 @@ def create_redis_pool(config=None):
     except redis.RedisError as e:
         logger.error(f"Redis connection error: {e}")
         raise
+
+
+_redis_client = None
+
+
+def get_redis_client():
+    """
+    Return the shared Redis client, creating it on first use.
+
+    Returns:
+        redis.Redis: Redis client, or None if Redis is unreachable
+    """
+    global _redis_client
+    if _redis_client is None:
+        try:
+            _redis_client = redis.Redis(connection_pool=create_redis_pool())
+        except redis.RedisError:
+            return None
+    return _redis_client
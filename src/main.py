@@ -19,11 +19,20 @@ from pathlib import Path
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from src.config.database import engine, Base
+from src.config.database import engine, async_engine, Base, replica_monitor
 from src.config.settings import settings
 from src.utils.logger import setup_logger
 from src.utils.otel import init_otel
 from src.core.i18n_middleware import I18nMiddleware
+from src.services.workflow_timer_service import workflow_timer_worker
+from src.services.a2a_task_service import (
+    a2a_stream_worker_pool,
+    a2a_task_worker_pool,
+)
+from src.services.push_notification_service import push_notification_dispatcher
+from src.utils.a2a_enhanced_client import a2a_client_registry
+from src.services.session_compaction_service import session_compactor
+from src.services.retention_service import retention_sweeper
 
 # Necessary for other modules
 from src.services.service_providers import session_service  # noqa: F401
@@ -113,6 +122,31 @@ app.include_router(a2a_router, prefix=API_PREFIX)
 init_otel()
 
 
+@app.on_event("startup")
+async def start_background_workers():
+    """Start background workers that live for the whole process"""
+    replica_monitor.start()
+    if settings.WORKFLOW_DURABLE_DELAYS_ENABLED:
+        workflow_timer_worker.start()
+    push_notification_dispatcher.start()
+    if settings.SESSION_RETENTION_ENABLED:
+        retention_sweeper.start()
+
+
+@app.on_event("shutdown")
+async def stop_background_workers():
+    """Stop background workers started on startup"""
+    await workflow_timer_worker.stop()
+    await a2a_task_worker_pool.stop()
+    await a2a_stream_worker_pool.stop()
+    await push_notification_dispatcher.stop()
+    await session_compactor.stop()
+    await retention_sweeper.stop()
+    await replica_monitor.stop()
+    await a2a_client_registry.aclose()
+    await async_engine.dispose()
+
+
 @app.get("/")
 def read_root():
     return {
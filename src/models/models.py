@@ -38,6 +38,13 @@ from sqlalchemy import (
     Text,
     CheckConstraint,
     Boolean,
+    Integer,
+    Index,
+    BigInteger,
+    Float,
+    UniqueConstraint,
+    PickleType,
+    ForeignKeyConstraint,
 )
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship, backref
@@ -76,6 +83,19 @@ class User(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    __table_args__ = (
+        Index(
+            "idx_users_verification_token",
+            "verification_token",
+            postgresql_where=verification_token.isnot(None),
+        ),
+        Index(
+            "idx_users_password_reset_token",
+            "password_reset_token",
+            postgresql_where=password_reset_token.isnot(None),
+        ),
+    )
+
     client = relationship(
         "Client", backref=backref("user", uselist=False, cascade="all, delete-orphan")
     )
@@ -91,6 +111,8 @@ class AgentFolder(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    __table_args__ = (Index("idx_agent_folders_client_name", "client_id", "name"),)
+
     client = relationship("Client", backref="agent_folders")
 
     agents = relationship("Agent", back_populates="folder")
@@ -128,6 +150,9 @@ class Agent(Base):
             "type IN ('llm', 'sequential', 'parallel', 'loop', 'a2a', 'workflow', 'crew_ai', 'task')",
             name="check_agent_type",
         ),
+        Index("idx_agents_client_name", "client_id", "name"),
+        Index("idx_agents_client_created_at", "client_id", "created_at"),
+        Index("idx_agents_folder_id", "folder_id"),
     )
 
     folder = relationship("AgentFolder", back_populates="agents")
@@ -241,6 +266,34 @@ class Session(Base):
     update_time = Column(DateTime(timezone=True))
 
 
+class SessionEvent(Base):
+    """Event model matching Google ADK DatabaseSessionService schema.
+
+    This model is read-only - the ADK manages table creation and data. It is
+    used to page through the events of a session without loading the session.
+    """
+    __tablename__ = "events"
+    __table_args__ = {"extend_existing": True, "info": {"skip_autogenerate": True}}
+
+    id = Column(String, primary_key=True)
+    app_name = Column(String, primary_key=True)
+    user_id = Column(String, primary_key=True)
+    session_id = Column(String, primary_key=True)
+    invocation_id = Column(String)
+    author = Column(String)
+    branch = Column(String, nullable=True)
+    timestamp = Column(DateTime)
+    content = Column(JSON, nullable=True)
+    actions = Column(PickleType)
+    long_running_tool_ids_json = Column(Text, nullable=True)
+    grounding_metadata = Column(JSON, nullable=True)
+    partial = Column(Boolean, nullable=True)
+    turn_complete = Column(Boolean, nullable=True)
+    error_code = Column(String, nullable=True)
+    error_message = Column(String, nullable=True)
+    interrupted = Column(Boolean, nullable=True)
+
+
 class AuditLog(Base):
     __tablename__ = "audit_logs"
 
@@ -256,6 +309,12 @@ class AuditLog(Base):
     user_agent = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        Index("idx_audit_logs_created_at", "created_at"),
+        Index("idx_audit_logs_user_created_at", "user_id", "created_at"),
+        Index("idx_audit_logs_resource_created_at", "resource_type", "created_at"),
+    )
+
     user = relationship("User", backref="audit_logs")
 
 
@@ -271,4 +330,251 @@ class ApiKey(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     is_active = Column(Boolean, default=True)
 
+    __table_args__ = (Index("idx_api_keys_client_name", "client_id", "name"),)
+
     client = relationship("Client", backref="api_keys")
+
+
+class WorkflowTimer(Base):
+    """Durable timer registered when a workflow delay node suspends a run.
+
+    The checkpoint column stores the serialized workflow state so a background
+    worker can resume the flow at resume_node_id once fire_at is reached.
+    """
+
+    __tablename__ = "workflow_timers"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    agent_id = Column(
+        UUID(as_uuid=True), ForeignKey("agents.id", ondelete="CASCADE"), nullable=False
+    )
+    app_name = Column(String, nullable=False)
+    user_id = Column(String, nullable=False)
+    session_id = Column(String, nullable=False)
+    node_id = Column(String, nullable=False)
+    resume_node_id = Column(String, nullable=False)
+    checkpoint = Column(JSON, nullable=False, default={})
+    resume_message = Column(Text, nullable=True)
+    push_notification_config = Column(JSON, nullable=True)
+    status = Column(String, nullable=False, default="pending")
+    fire_at = Column(DateTime(timezone=True), nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        CheckConstraint(
+            "status IN ('pending', 'running', 'completed', 'failed')",
+            name="check_workflow_timer_status",
+        ),
+        Index("idx_workflow_timers_status_fire_at", "status", "fire_at"),
+    )
+
+
+class A2ATask(Base):
+    """A2A task created by message/send.
+
+    Tracks the task lifecycle (submitted -> working -> completed/failed/canceled)
+    so tasks/get, tasks/cancel and push notifications report the real state of
+    runs executed by the background worker pool.
+    """
+
+    __tablename__ = "a2a_tasks"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    agent_id = Column(
+        UUID(as_uuid=True), ForeignKey("agents.id", ondelete="CASCADE"), nullable=False
+    )
+    context_id = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="submitted")
+    message = Column(JSON, nullable=False, default={})
+    history = Column(JSON, nullable=True)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    push_notification_config = Column(JSON, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        CheckConstraint(
+            "status IN ('submitted', 'working', 'input-required', 'completed', 'canceled', 'failed')",
+            name="check_a2a_task_status",
+        ),
+        Index("idx_a2a_tasks_agent_context", "agent_id", "context_id"),
+    )
+
+
+class PushNotificationDelivery(Base):
+    """Outbound A2A push notification waiting for (or done with) delivery.
+
+    Deliveries are retried with exponential backoff; after the last attempt
+    they stay in the table with status 'dead' for inspection, until the
+    dispatcher purges them with the delivered ones.
+    """
+
+    __tablename__ = "push_notification_deliveries"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    task_id = Column(String, nullable=True)
+    url = Column(String, nullable=False)
+    push_notification_config = Column(JSON, nullable=False)
+    payload = Column(JSON, nullable=False)
+    status = Column(String, nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_status_code = Column(Integer, nullable=True)
+    last_error = Column(Text, nullable=True)
+    latency_ms = Column(Integer, nullable=True)
+    delivered_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        CheckConstraint(
+            "status IN ('pending', 'delivering', 'delivered', 'dead')",
+            name="check_push_notification_delivery_status",
+        ),
+        Index(
+            "idx_push_notification_deliveries_status_next_attempt",
+            "status",
+            "next_attempt_at",
+        ),
+        Index(
+            "idx_push_notification_deliveries_task_created_at",
+            "task_id",
+            "created_at",
+        ),
+    )
+
+
+class A2AStreamEvent(Base):
+    """Event streamed by message/stream, kept so clients can resubscribe.
+
+    The log is bounded per task and rows expire after expires_at.
+    """
+
+    __tablename__ = "a2a_stream_events"
+
+    task_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("a2a_tasks.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    seq = Column(Integer, primary_key=True)
+    event = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (Index("idx_a2a_stream_events_expires_at", "expires_at"),)
+
+
+class A2AHistoryMessage(Base):
+    """Text message of a session, projected from the ADK events as they are appended.
+
+    Lets A2A requests read the latest messages of a conversation without
+    loading and walking every event of the session.
+    """
+
+    __tablename__ = "a2a_history_messages"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    app_name = Column(String, nullable=False)
+    user_id = Column(String, nullable=False)
+    session_id = Column(String, nullable=False)
+    event_id = Column(String, nullable=False)
+    part_index = Column(Integer, nullable=False, default=0)
+    role = Column(String, nullable=False)
+    author = Column(String, nullable=True)
+    content = Column(Text, nullable=False)
+    content_hash = Column(String(64), nullable=False)
+    invocation_id = Column(String, nullable=True)
+    timestamp = Column(Float, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint(
+            "session_id", "event_id", "part_index", name="uq_a2a_history_messages_event"
+        ),
+        Index(
+            "idx_a2a_history_messages_session",
+            "app_name",
+            "user_id",
+            "session_id",
+            "id",
+        ),
+    )
+
+
+class ArchivedSessionEvent(Base):
+    """Event moved out of a session by compaction.
+
+    The live session keeps a summary event in its place; archived events are
+    kept for auditing and removed together with their session.
+    """
+
+    __tablename__ = "archived_session_events"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    app_name = Column(String, nullable=False)
+    user_id = Column(String, nullable=False)
+    session_id = Column(String, nullable=False)
+    event_id = Column(String, nullable=False)
+    invocation_id = Column(String, nullable=True)
+    author = Column(String, nullable=True)
+    timestamp = Column(DateTime, nullable=True)
+    content = Column(JSON, nullable=True)
+    actions = Column(JSON, nullable=True)
+    # Null when archived by the retention sweeper instead of compaction
+    summary_event_id = Column(String, nullable=True)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["app_name", "user_id", "session_id"],
+            ["sessions.app_name", "sessions.user_id", "sessions.id"],
+            ondelete="CASCADE",
+        ),
+        Index(
+            "idx_archived_session_events_session",
+            "app_name",
+            "user_id",
+            "session_id",
+            "timestamp",
+        ),
+    )
+
+
+class RetentionPolicy(Base):
+    """How long the sessions of a client or of an agent are kept.
+
+    Agent policies take precedence over the policy of the agent's client;
+    sessions without a policy use SESSION_RETENTION_DEFAULT_DAYS.
+    """
+
+    __tablename__ = "retention_policies"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    client_id = Column(
+        UUID(as_uuid=True), ForeignKey("clients.id", ondelete="CASCADE"), nullable=True
+    )
+    agent_id = Column(
+        UUID(as_uuid=True), ForeignKey("agents.id", ondelete="CASCADE"), nullable=True
+    )
+    ttl_days = Column(Integer, nullable=False)
+    action = Column(String, nullable=False, default="delete")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        CheckConstraint(
+            "(client_id IS NULL) <> (agent_id IS NULL)",
+            name="check_retention_policy_scope",
+        ),
+        CheckConstraint(
+            "action IN ('delete', 'archive')", name="check_retention_policy_action"
+        ),
+        CheckConstraint("ttl_days >= 0", name="check_retention_policy_ttl"),
+        UniqueConstraint("client_id", name="uq_retention_policies_client"),
+        UniqueConstraint("agent_id", name="uq_retention_policies_agent"),
+    )
@@ -233,6 +233,9 @@ class WorkflowConfig(BaseModel):
     api_key: Optional[str] = Field(
         default_factory=generate_api_key, description="API key for the workflow agent"
     )
+    workflow_trace: Optional[bool] = Field(
+        False, description="Attach the per-node workflow trace to the run result"
+    )
 
     class Config:
         from_attributes = True
@@ -249,6 +252,14 @@ class AgentTask(BaseModel):
     )
     description: str = Field(..., description="Description of the task to be performed")
     expected_output: str = Field(..., description="Expected output from this task")
+    id: Optional[str] = Field(
+        None,
+        description="Task identifier referenced by depends_on (defaults to task_<position>)",
+    )
+    depends_on: Optional[List[str]] = Field(
+        default_factory=list,
+        description="IDs of the tasks whose output this task needs before starting",
+    )
 
     @validator("agent_id")
     def validate_agent_id(cls, v):
@@ -275,6 +286,9 @@ class AgentConfig(BaseModel):
     sub_agents: Optional[List[UUID]] = Field(
         default_factory=list, description="List of IDs of sub-agents used in agent"
     )
+    max_parallel_tasks: Optional[int] = Field(
+        3, ge=1, description="Maximum number of independent tasks running concurrently"
+    )
 
     class Config:
         from_attributes = True
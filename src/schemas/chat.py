@@ -62,6 +62,9 @@ class ChatResponse(BaseModel):
     )
     status: str = Field(..., description="Response status (success/error)")
     timestamp: str = Field(..., description="Response timestamp")
+    workflow_trace: Optional[Dict[str, Any]] = Field(
+        None, description="Per-node trace of workflow agents with tracing enabled"
+    )
 
 
 class ErrorResponse(BaseModel):
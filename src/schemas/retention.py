@@ -0,0 +1,63 @@
+"""
+┌──────────────────────────────────────────────────────────────────────────────┐
+│ @author: Eduardo Oliveira                                                     │
+│ @file: retention.py                                                          │
+│ Developed by: Eduardo Oliveira                                                │
+│ Creation date: October 19, 2026                                              │
+│ Contact: contato@evolution-api.com                                           │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @copyright © Falai 2025. All rights reserved.                        │
+│ Licensed under the Apache License, Version 2.0                               │
+│                                                                              │
+│ You may not use this file except in compliance with the License.             │
+│ You may obtain a copy of the License at                                      │
+│                                                                              │
+│    http://www.apache.org/licenses/LICENSE-2.0                                │
+│                                                                              │
+│ Unless required by applicable law or agreed to in writing, software          │
+│ distributed under the License is distributed on an "AS IS" BASIS,            │
+│ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.     │
+│ See the License for the specific language governing permissions and          │
+│ limitations under the License.                                               │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @important                                                                   │
+│ For any future changes to the code in this file, it is recommended to        │
+│ include, together with the modification, the information of the developer    │
+│ who changed it and the date of modification.                                 │
+└──────────────────────────────────────────────────────────────────────────────┘
+"""
+
+from pydantic import BaseModel, Field, model_validator
+from typing import Literal, Optional
+from datetime import datetime
+from uuid import UUID
+
+
+class RetentionPolicyBase(BaseModel):
+    """Base schema for session retention policy"""
+
+    client_id: Optional[UUID] = None
+    agent_id: Optional[UUID] = None
+    ttl_days: int = Field(..., ge=0, description="Days since last update (0 keeps forever)")
+    action: Literal["delete", "archive"] = "delete"
+
+
+class RetentionPolicyCreate(RetentionPolicyBase):
+    """Schema for creating or replacing a retention policy"""
+
+    @model_validator(mode="after")
+    def validate_scope(self):
+        if (self.client_id is None) == (self.agent_id is None):
+            raise ValueError("Exactly one of client_id or agent_id is required")
+        return self
+
+
+class RetentionPolicyResponse(RetentionPolicyBase):
+    """Schema for retention policy response"""
+
+    id: UUID
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -34,6 +34,7 @@ from uuid import UUID
 import uuid
 import re
 from src.schemas.agent_config import LLMConfig, AgentConfig
+from src.utils.task_graph import has_dependency_cycle
 
 
 class ClientBase(BaseModel):
@@ -216,6 +217,31 @@ class AgentBase(BaseModel):
                     if field not in task:
                         raise ValueError(f"Task missing required field: {field}")
 
+            task_ids = [
+                task.get("id") or f"task_{index + 1}"
+                for index, task in enumerate(v["tasks"])
+            ]
+            if len(set(task_ids)) != len(task_ids):
+                raise ValueError("Task ids must be unique")
+            dependencies = {}
+            for task_id, task in zip(task_ids, v["tasks"]):
+                depends_on = task.get("depends_on") or []
+                if not isinstance(depends_on, list):
+                    raise ValueError("depends_on must be a list")
+                for dependency in depends_on:
+                    if dependency not in task_ids:
+                        raise ValueError(f"Task depends on unknown task: {dependency}")
+                dependencies[task_id] = depends_on
+            if has_dependency_cycle(dependencies):
+                raise ValueError("Task dependencies contain a cycle")
+
+            if "max_parallel_tasks" in v and v["max_parallel_tasks"] is not None:
+                if (
+                    not isinstance(v["max_parallel_tasks"], int)
+                    or v["max_parallel_tasks"] < 1
+                ):
+                    raise ValueError("max_parallel_tasks must be a positive integer")
+
             if "sub_agents" in v and v["sub_agents"] is not None:
                 if not isinstance(v["sub_agents"], list):
                     raise ValueError("sub_agents must be a list")
@@ -0,0 +1,301 @@
+"""
+┌──────────────────────────────────────────────────────────────────────────────┐
+│ @author: Eduardo Oliveira                                                     │
+│ @file: a2a_history_service.py                                                │
+│ Developed by: Eduardo Oliveira                                                │
+│ Creation date: October 19, 2026                                              │
+│ Contact: contato@evolution-api.com                                           │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @copyright © Falai 2025. All rights reserved.                        │
+│ Licensed under the Apache License, Version 2.0                               │
+│                                                                              │
+│ You may not use this file except in compliance with the License.             │
+│ You may obtain a copy of the License at                                      │
+│                                                                              │
+│    http://www.apache.org/licenses/LICENSE-2.0                                │
+│                                                                              │
+│ Unless required by applicable law or agreed to in writing, software          │
+│ distributed under the License is distributed on an "AS IS" BASIS,            │
+│ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.     │
+│ See the License for the specific language governing permissions and          │
+│ limitations under the License.                                               │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @important                                                                   │
+│ For any future changes to the code in this file, it is recommended to        │
+│ include, together with the modification, the information of the developer    │
+│ who changed it and the date of modification.                                 │
+└──────────────────────────────────────────────────────────────────────────────┘
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, List
+
+from google.adk.events import Event
+from google.adk.sessions import DatabaseSessionService
+from google.adk.sessions import Session as SessionADK
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from src.config.database import SessionLocal, read_session
+from src.models.models import A2AHistoryMessage
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def message_hash(role: str, content: str) -> str:
+    """Stable hash used to deduplicate messages that have no shared id"""
+    return hashlib.sha256(f"{role}\x00{content}".encode("utf-8")).hexdigest()
+
+
+def clean_message_content(content: str, role: str) -> str:
+    """Clean message content, extracting just the text if it contains JSON."""
+    if role == "agent" or role == "assistant":
+        # Check if content looks like JSON (starts with { and contains jsonrpc)
+        if content.strip().startswith("{") and "jsonrpc" in content:
+            try:
+                # Try to parse as JSON and extract the actual response text
+                json_data = json.loads(content)
+
+                # Look for the actual text in artifacts
+                if "result" in json_data and "artifacts" in json_data["result"]:
+                    for artifact in json_data["result"]["artifacts"]:
+                        if "parts" in artifact:
+                            for part in artifact["parts"]:
+                                if part.get("type") == "text" and "text" in part:
+                                    return part["text"]
+
+                # Fallback: if we can't extract, return a cleaned version
+                return "Previous assistant response"
+
+            except (json.JSONDecodeError, KeyError):
+                # If not valid JSON, return as-is but truncated
+                return content[:100] + "..." if len(content) > 100 else content
+
+    return content
+
+
+def _event_rows(
+    app_name: str, user_id: str, session_id: str, event: Event
+) -> List[Dict[str, Any]]:
+    """Projection rows for the text parts of an event"""
+    if event.partial or not event.content or not event.content.parts:
+        return []
+
+    role = "user" if event.author == "user" else "agent"
+    rows = []
+    for index, part in enumerate(event.content.parts):
+        if not part.text:
+            continue
+        content = clean_message_content(part.text, role)
+        rows.append(
+            {
+                "app_name": app_name,
+                "user_id": user_id,
+                "session_id": session_id,
+                "event_id": event.id,
+                "part_index": index,
+                "role": role,
+                "author": event.author,
+                "content": content,
+                "content_hash": message_hash(role, content),
+                "invocation_id": event.invocation_id,
+                "timestamp": event.timestamp,
+            }
+        )
+    return rows
+
+
+def project_events(
+    db: Session, app_name: str, user_id: str, session_id: str, events: List[Event]
+) -> int:
+    """Stores the text messages of events; already projected events are ignored"""
+    rows = []
+    for event in events:
+        rows.extend(_event_rows(app_name, user_id, session_id, event))
+    if not rows:
+        return 0
+
+    try:
+        db.execute(
+            insert(A2AHistoryMessage)
+            .values(rows)
+            .on_conflict_do_nothing(constraint="uq_a2a_history_messages_event")
+        )
+        db.commit()
+        return len(rows)
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Error projecting history of session {session_id}: {str(e)}")
+        raise
+
+
+def _to_history_entry(row: A2AHistoryMessage) -> Dict[str, Any]:
+    return {
+        "role": row.role,
+        "content": row.content,
+        "messageId": row.event_id,
+        "timestamp": row.timestamp,
+        "author": row.author,
+        "invocation_id": row.invocation_id,
+    }
+
+
+def get_history_messages(
+    db: Session, app_name: str, user_id: str, session_id: str, limit: int
+) -> List[Dict[str, Any]]:
+    """Latest messages of a session, oldest first"""
+    query = (
+        db.query(A2AHistoryMessage)
+        .filter(
+            A2AHistoryMessage.app_name == app_name,
+            A2AHistoryMessage.user_id == user_id,
+            A2AHistoryMessage.session_id == session_id,
+        )
+        .order_by(A2AHistoryMessage.id.desc())
+    )
+    if limit and limit > 0:
+        query = query.limit(limit)
+    return [_to_history_entry(row) for row in reversed(query.all())]
+
+
+def has_history_messages(
+    db: Session, app_name: str, user_id: str, session_id: str
+) -> bool:
+    return (
+        db.query(A2AHistoryMessage.id)
+        .filter(
+            A2AHistoryMessage.app_name == app_name,
+            A2AHistoryMessage.user_id == user_id,
+            A2AHistoryMessage.session_id == session_id,
+        )
+        .first()
+        is not None
+    )
+
+
+def count_history_messages(
+    db: Session, app_name: str, user_id: str, session_id: str
+) -> int:
+    return (
+        db.query(A2AHistoryMessage)
+        .filter(
+            A2AHistoryMessage.app_name == app_name,
+            A2AHistoryMessage.user_id == user_id,
+            A2AHistoryMessage.session_id == session_id,
+        )
+        .count()
+    )
+
+
+def delete_history_messages(
+    db: Session, app_name: str, user_id: str, session_id: str
+) -> None:
+    try:
+        db.query(A2AHistoryMessage).filter(
+            A2AHistoryMessage.app_name == app_name,
+            A2AHistoryMessage.user_id == user_id,
+            A2AHistoryMessage.session_id == session_id,
+        ).delete(synchronize_session=False)
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Error deleting history of session {session_id}: {str(e)}")
+
+
+async def load_conversation_history(
+    session_service: DatabaseSessionService,
+    app_name: str,
+    user_id: str,
+    session_id: str,
+    limit: int,
+) -> List[Dict[str, Any]]:
+    """Latest messages of a session, read from the projection.
+
+    Sessions created before the projection existed are backfilled once from
+    their events. Session services that do not maintain the projection
+    (e.g. the CrewAI one) are read from the events directly.
+    """
+    if not isinstance(session_service, HistoryProjectingSessionService):
+        session = await session_service.get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id
+        )
+        if not session or not session.events:
+            return []
+        history = []
+        for event in session.events:
+            history.extend(
+                _to_history_entry(A2AHistoryMessage(**row))
+                for row in _event_rows(app_name, user_id, session_id, event)
+            )
+        return history[-limit:] if limit and limit > 0 else history
+
+    read_db = read_session()
+    try:
+        history = get_history_messages(read_db, app_name, user_id, session_id, limit)
+    finally:
+        read_db.close()
+    if history:
+        return history
+
+    # Not projected yet (or not replicated yet): check and backfill on the primary
+    db = SessionLocal()
+    try:
+        history = get_history_messages(db, app_name, user_id, session_id, limit)
+        if history:
+            return history
+
+        session = await session_service.get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id
+        )
+        if not session or not session.events:
+            return []
+
+        if project_events(db, app_name, user_id, session_id, session.events):
+            logger.info(f"History of session {session_id} backfilled")
+        return get_history_messages(db, app_name, user_id, session_id, limit)
+    finally:
+        db.close()
+
+
+class HistoryProjectingSessionService(DatabaseSessionService):
+    """DatabaseSessionService that keeps a2a_history_messages up to date"""
+
+    async def append_event(self, session: SessionADK, event: Event) -> Event:
+        event = await super().append_event(session=session, event=event)
+
+        if _event_rows(session.app_name, session.user_id, session.id, event):
+            db = SessionLocal()
+            try:
+                events = [event]
+                # Sessions created before the projection existed are projected
+                # whole on their first new message
+                if not has_history_messages(
+                    db, session.app_name, session.user_id, session.id
+                ):
+                    events = list(session.events or []) or [event]
+                project_events(
+                    db, session.app_name, session.user_id, session.id, events
+                )
+            except Exception as e:
+                # A failed projection must not break the agent run
+                logger.error(f"Error updating history projection: {str(e)}")
+            finally:
+                db.close()
+
+        return event
+
+    async def delete_session(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> None:
+        await super().delete_session(
+            app_name=app_name, user_id=user_id, session_id=session_id
+        )
+
+        db = SessionLocal()
+        try:
+            delete_history_messages(db, app_name, user_id, session_id)
+        finally:
+            db.close()
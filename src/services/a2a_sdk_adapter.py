@@ -28,8 +28,10 @@
 """
 
 import logging
-import asyncio
-from typing import Dict, Any, Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
 from uuid import UUID, uuid4
 
 from sqlalchemy.orm import Session
@@ -59,23 +61,10 @@ except ImportError:
     SDK_AVAILABLE = False
     logging.warning("a2a-sdk not available for adapter")
 
+from src.config.database import SessionLocal, read_session
 from src.config.settings import settings
-from src.services.agent_service import get_agent
-from src.services.mcp_server_service import get_mcp_server
-from src.services.a2a_task_manager import A2ATaskManager, A2AService
-from src.schemas.a2a_types import (
-    SendTaskRequest,
-    SendTaskStreamingRequest,
-    CancelTaskRequest,
-    TaskSendParams,
-    TaskState as CustomTaskState,
-    TaskStatus as CustomTaskStatus,
-)
-from src.schemas.a2a_enhanced_types import (
-    A2ATypeConverter,
-    convert_to_sdk_format,
-    convert_from_sdk_format,
-)
+from src.services.agent_card_service import get_rendered_agent_card
+from src.schemas.a2a_enhanced_types import A2ATypeConverter
 
 logger = logging.getLogger(__name__)
 
@@ -85,11 +74,13 @@ class EvoAIAgentExecutor:
     Direct implementation of the Message API for the official SDK.
 
     Instead of trying to convert to Task API, it implements directly
-    the methods expected by the SDK: message/send and message/stream
+    the methods expected by the SDK: message/send and message/stream.
+
+    Executors live as long as their cached server, so they hold no database
+    session: every execution opens its own.
     """
 
-    def __init__(self, db: Session, agent_id: UUID):
-        self.db = db
+    def __init__(self, agent_id: UUID):
         self.agent_id = agent_id
 
     async def execute(
@@ -100,6 +91,7 @@ class EvoAIAgentExecutor:
 
         Does not use task manager - goes directly to execution logic.
         """
+        db = SessionLocal()
         try:
             logger.info("=" * 80)
             logger.info(f"🚀 EXECUTOR EXECUTE() CALLED! Agent: {self.agent_id}")
@@ -145,7 +137,7 @@ class EvoAIAgentExecutor:
                 session_service=session_service,
                 artifacts_service=artifacts_service,
                 memory_service=memory_service,
-                db=self.db,
+                db=db,
                 files=None,  # TODO: process files if needed
             )
 
@@ -166,6 +158,8 @@ class EvoAIAgentExecutor:
 
             logger.error(f"Traceback: {traceback.format_exc()}")
             await self._emit_error_event(event_queue, f"Execution error: {str(e)}")
+        finally:
+            db.close()
 
     def _extract_text_from_message(self, message) -> str:
         """Extract text from SDK message."""
@@ -227,112 +221,112 @@ class EvoAIAgentExecutor:
 
 class EvoAISDKService:
     """
-    Main service that creates and manages A2A servers using the official SDK.
+    Bounded LRU registry of A2A servers built with the official SDK.
+
+    Servers are created lazily on first use and evicted when the registry is
+    full, when they are older than A2A_SDK_SERVER_TTL or when their agent is
+    updated or deleted. They hold no request-scoped database session.
     """
 
-    def __init__(self, db: Session):
-        self.db = db
-        self.servers: Dict[str, Any] = {}
+    def __init__(self, max_size: Optional[int] = None, ttl: Optional[int] = None):
+        self.max_size = max_size or settings.A2A_SDK_SERVER_CACHE_SIZE
+        self.ttl = ttl if ttl is not None else settings.A2A_SDK_SERVER_TTL
+        self.servers: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
 
-    def create_a2a_server(self, agent_id: UUID) -> Optional[Any]:
+    def create_a2a_server(
+        self, agent_id: UUID, db: Optional[Session] = None
+    ) -> Optional[Any]:
         """
         Create an A2A server using the official SDK but with internal logic.
+
+        The session is only used to render the agent card; when none is given
+        a short-lived one is opened.
         """
         if not SDK_AVAILABLE:
             logger.error("❌ a2a-sdk not available, cannot create SDK server")
             return None
 
+        own_session = db is None
+        if own_session:
+            db = read_session()
+
         try:
-            logger.info("=" * 80)
-            logger.info(f"🏗️ CREATING A2A SDK SERVER FOR AGENT {agent_id}")
-            logger.info("=" * 80)
+            logger.info(f"🏗️ Creating A2A SDK server for agent {agent_id}")
 
-            # Search for agent in database
-            logger.info("🔍 Searching for agent in database...")
-            agent = get_agent(self.db, agent_id)
-            if not agent:
+            agent_card = self._create_agent_card(db, agent_id)
+            if agent_card is None:
                 logger.error(f"❌ Agent {agent_id} not found")
                 return None
 
-            logger.info(f"✅ Found agent: {agent.name}")
-
-            # Create agent card using existing logic
-            logger.info("🏗️ Creating agent card...")
-            agent_card = self._create_agent_card(agent)
-            logger.info(f"✅ Agent card created: {agent_card.name}")
-
-            # Create executor using adapter
-            logger.info("🏗️ Creating agent executor adapter...")
-            agent_executor = EvoAIAgentExecutor(self.db, agent_id)
-            logger.info("✅ Agent executor created")
-
-            # Create task store
-            logger.info("🏗️ Creating task store...")
-            task_store = InMemoryTaskStore()
-            logger.info("✅ Task store created")
-
-            # Create request handler
-            logger.info("🏗️ Creating request handler...")
             request_handler = DefaultRequestHandler(
-                agent_executor=agent_executor, task_store=task_store
+                agent_executor=EvoAIAgentExecutor(agent_id),
+                task_store=InMemoryTaskStore(),
             )
-            logger.info("✅ Request handler created")
-
-            # Create Starlette application
-            logger.info("🏗️ Creating Starlette application...")
             server = A2AStarletteApplication(
                 agent_card=agent_card, http_handler=request_handler
             )
-            logger.info("✅ Starlette application created")
 
-            # Store server
-            server_key = str(agent_id)
-            self.servers[server_key] = server
+            self._store(str(agent_id), server)
 
-            logger.info("=" * 80)
-            logger.info(f"🎉 SUCCESSFULLY CREATED A2A SDK SERVER FOR AGENT {agent_id}")
-            logger.info("=" * 80)
+            logger.info(f"🎉 Created A2A SDK server for agent {agent_id}")
             return server
 
         except Exception as e:
-            logger.error("=" * 80)
             logger.error(f"❌ ERROR CREATING A2A SDK SERVER: {e}")
             import traceback
 
             logger.error(f"Full traceback: {traceback.format_exc()}")
-            logger.error("=" * 80)
             return None
-
-    def get_server(self, agent_id: UUID) -> Optional[Any]:
+        finally:
+            if own_session:
+                db.close()
+
+    def _store(self, server_key: str, server: Any) -> None:
+        with self._lock:
+            self.servers[server_key] = (server, time.monotonic() + self.ttl)
+            self.servers.move_to_end(server_key)
+            while len(self.servers) > self.max_size:
+                evicted, _ = self.servers.popitem(last=False)
+                logger.debug(f"Evicted A2A SDK server for agent {evicted}")
+
+    def get_server(self, agent_id: UUID, db: Optional[Session] = None) -> Optional[Any]:
         """
         Returns existing server or creates a new one.
         """
         server_key = str(agent_id)
 
-        if server_key in self.servers:
-            return self.servers[server_key]
+        with self._lock:
+            cached = self.servers.get(server_key)
+            if cached is not None:
+                server, expires_at = cached
+                if expires_at > time.monotonic():
+                    self.servers.move_to_end(server_key)
+                    return server
+                del self.servers[server_key]
 
-        return self.create_a2a_server(agent_id)
+        return self.create_a2a_server(agent_id, db)
 
-    def _create_agent_card(self, agent) -> AgentCard:
+    def _create_agent_card(
+        self, db: Session, agent_id: UUID
+    ) -> Optional["AgentCard"]:
         """
-        Create AgentCard using existing logic but in SDK format.
+        Create AgentCard in SDK format from the cached A2A agent card.
         """
-        # Reuse existing A2AService logic
-        a2a_service = A2AService(self.db, A2ATaskManager(self.db))
-        custom_card = a2a_service.get_agent_card(agent.id)
-
-        # Convert to SDK format
-        sdk_card = convert_to_sdk_format(custom_card)
+        card = get_rendered_agent_card(db, agent_id)
+        if card is None:
+            return None
 
-        if sdk_card:
+        card_data = card.data
+        sdk_card = A2ATypeConverter.validate_agent_card(card_data)
+        if isinstance(sdk_card, AgentCard):
             return sdk_card
 
         # Fallback: create basic card
         return AgentCard(
-            name=agent.name,
-            description=agent.description or "",
-            url=f"{settings.API_URL}/api/v1/a2a-sdk/{agent.id}",
+            name=card_data["name"],
+            description=card_data.get("description") or "",
+            url=f"{settings.API_URL}/api/v1/a2a-sdk/{agent_id}",
             version=settings.API_VERSION,
             capabilities=AgentCapabilities(
                 streaming=True, pushNotifications=True, stateTransitionHistory=True
@@ -347,35 +341,38 @@ class EvoAISDKService:
 
     def remove_server(self, agent_id: UUID) -> bool:
         """
-        Remove server from cache.
+        Remove server from cache (call after updating or deleting the agent).
         """
-        server_key = str(agent_id)
-        if server_key in self.servers:
-            del self.servers[server_key]
-            return True
-        return False
+        with self._lock:
+            return self.servers.pop(str(agent_id), None) is not None
 
     def list_servers(self) -> Dict[str, Dict[str, Any]]:
         """
         List all active servers.
         """
+        now = time.monotonic()
+        with self._lock:
+            items = list(self.servers.items())
+
         result = {}
-        for agent_id, server in self.servers.items():
+        for agent_id, (server, expires_at) in items:
             result[agent_id] = {
                 "agent_id": agent_id,
                 "server_type": "a2a-sdk",
-                "active": True,
+                "active": expires_at > now,
             }
         return result
 
 
+a2a_sdk_service = EvoAISDKService()
+
+
 # Utility function to create SDK server easily
 def create_a2a_sdk_server(db: Session, agent_id: UUID) -> Optional[Any]:
     """
-    Utility function to create A2A server using SDK.
+    Utility function to get (or lazily create) the A2A server of an agent.
     """
-    service = EvoAISDKService(db)
-    return service.create_a2a_server(agent_id)
+    return a2a_sdk_service.get_server(agent_id, db)
 
 
 # Function to check compatibility
@@ -0,0 +1,314 @@
+"""
+┌──────────────────────────────────────────────────────────────────────────────┐
+│ @author: Eduardo Oliveira                                                     │
+│ @file: a2a_stream_service.py                                                 │
+│ Developed by: Eduardo Oliveira                                                │
+│ Creation date: October 19, 2026                                              │
+│ Contact: contato@evolution-api.com                                           │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @copyright © Falai 2025. All rights reserved.                        │
+│ Licensed under the Apache License, Version 2.0                               │
+│                                                                              │
+│ You may not use this file except in compliance with the License.             │
+│ You may obtain a copy of the License at                                      │
+│                                                                              │
+│    http://www.apache.org/licenses/LICENSE-2.0                                │
+│                                                                              │
+│ Unless required by applicable law or agreed to in writing, software          │
+│ distributed under the License is distributed on an "AS IS" BASIS,            │
+│ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.     │
+│ See the License for the specific language governing permissions and          │
+│ limitations under the License.                                               │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @important                                                                   │
+│ For any future changes to the code in this file, it is recommended to        │
+│ include, together with the modification, the information of the developer    │
+│ who changed it and the date of modification.                                 │
+└──────────────────────────────────────────────────────────────────────────────┘
+"""
+
+import asyncio
+import uuid
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncGenerator, Deque, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from src.config.database import SessionLocal
+from src.config.settings import settings
+from src.models.models import A2AStreamEvent
+from src.services.a2a_task_service import (
+    TERMINAL_TASK_STATES,
+    a2a_stream_worker_pool,
+    get_a2a_task,
+)
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# How often a live subscriber double-checks the task state in the database,
+# in case the producer died without closing the stream
+LIVE_STATE_CHECK_INTERVAL = 15
+
+
+def append_stream_events(
+    db: Session, task_id: uuid.UUID, events: List[Tuple[int, Dict[str, Any]]]
+) -> None:
+    """Appends a batch of events to the task log, dropping events beyond the bound"""
+    if not events:
+        return
+    expires_at = datetime.now(timezone.utc) + timedelta(
+        seconds=settings.A2A_STREAM_LOG_TTL
+    )
+    last_seq = events[-1][0]
+    try:
+        db.add_all(
+            [
+                A2AStreamEvent(
+                    task_id=task_id, seq=seq, event=event, expires_at=expires_at
+                )
+                for seq, event in events
+            ]
+        )
+        if last_seq > settings.A2A_STREAM_LOG_MAX_EVENTS:
+            db.query(A2AStreamEvent).filter(
+                A2AStreamEvent.task_id == task_id,
+                A2AStreamEvent.seq <= last_seq - settings.A2A_STREAM_LOG_MAX_EVENTS,
+            ).delete(synchronize_session=False)
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(
+            f"Error appending stream events {events[0][0]}-{last_seq} "
+            f"of task {task_id}: {str(e)}"
+        )
+        raise
+
+
+def _write_stream_events(
+    task_id: uuid.UUID, events: List[Tuple[int, Dict[str, Any]]]
+) -> None:
+    """Runs in a worker thread, with its own session"""
+    db = SessionLocal()
+    try:
+        append_stream_events(db, task_id, events)
+    finally:
+        db.close()
+
+
+def _purge_expired_stream_events() -> int:
+    db = SessionLocal()
+    try:
+        return purge_expired_stream_events(db)
+    finally:
+        db.close()
+
+
+def read_stream_events(
+    db: Session, task_id: uuid.UUID, after_seq: int = 0
+) -> List[Tuple[int, Dict[str, Any]]]:
+    """Returns the logged events of a task after after_seq, in order"""
+    rows = (
+        db.query(A2AStreamEvent.seq, A2AStreamEvent.event)
+        .filter(A2AStreamEvent.task_id == task_id, A2AStreamEvent.seq > after_seq)
+        .order_by(A2AStreamEvent.seq)
+        .all()
+    )
+    return [(row.seq, row.event) for row in rows]
+
+
+def purge_expired_stream_events(db: Session) -> int:
+    """Deletes expired events of every task"""
+    try:
+        deleted = (
+            db.query(A2AStreamEvent)
+            .filter(A2AStreamEvent.expires_at <= datetime.now(timezone.utc))
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        return deleted
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Error purging expired stream events: {str(e)}")
+        return 0
+
+
+class TaskStream:
+    """In-process fan-out of the events of one running task"""
+
+    def __init__(self):
+        self.events: Deque[Tuple[int, Dict[str, Any]]] = deque(
+            maxlen=settings.A2A_STREAM_LOG_MAX_EVENTS
+        )
+        self.condition = asyncio.Condition()
+        self.last_seq = 0
+        self.finished = False
+        self.subscribers = 0
+        # Published events not written to the log yet, and the task writing them
+        self.unlogged: List[Tuple[int, Dict[str, Any]]] = []
+        self.writer: Optional[asyncio.Task] = None
+
+
+class A2AStreamHub:
+    """Publishes task events to the replay log and to live subscribers.
+
+    Subscribers in the process running the task are woken through an
+    asyncio.Condition; subscribers in other processes poll the log until the
+    task reaches a terminal state.
+
+    Log writes run in a worker thread. While one is in flight, the events
+    published in the meantime accumulate and go out in the next batch, so a
+    fast token stream costs a few round trips instead of one per chunk.
+    """
+
+    def __init__(self):
+        self._streams: Dict[str, TaskStream] = {}
+        self._reapers: Set[asyncio.Task] = set()
+
+    def open(self, task_id: str) -> TaskStream:
+        """Registers a task whose events will be published by this process"""
+        stream = self._streams.get(task_id)
+        if stream is None:
+            stream = TaskStream()
+            self._streams[task_id] = stream
+        return stream
+
+    def get(self, task_id: str) -> Optional[TaskStream]:
+        return self._streams.get(task_id)
+
+    async def publish(self, task_id: str, seq: int, event: Dict[str, Any]) -> None:
+        """Queues the event for the log, then wakes the subscribers"""
+        stream = self.open(task_id)
+        stream.unlogged.append((seq, event))
+        if stream.writer is None or stream.writer.done():
+            stream.writer = asyncio.create_task(self._write_log(task_id, stream))
+        async with stream.condition:
+            stream.events.append((seq, event))
+            stream.last_seq = seq
+            stream.condition.notify_all()
+
+    async def _write_log(self, task_id: str, stream: TaskStream) -> None:
+        """Writes the queued events in batches until none is left"""
+        while stream.unlogged:
+            batch, stream.unlogged = stream.unlogged, []
+            try:
+                await asyncio.to_thread(_write_stream_events, uuid.UUID(task_id), batch)
+            except Exception as e:
+                logger.error(f"Error logging stream events of task {task_id}: {str(e)}")
+
+    async def close(self, task_id: str) -> None:
+        """Flushes the log, marks the stream as finished and drops it from memory"""
+        stream = self._streams.get(task_id)
+        if stream is not None:
+            if stream.writer is not None:
+                await stream.writer
+            await self._write_log(task_id, stream)
+            self._streams.pop(task_id, None)
+            async with stream.condition:
+                stream.finished = True
+                stream.condition.notify_all()
+        await asyncio.to_thread(_purge_expired_stream_events)
+
+    def release(self, task_id: str) -> None:
+        """Called when a subscriber leaves before the task finished.
+
+        The run is canceled if nobody subscribes again within
+        A2A_STREAM_DISCONNECT_GRACE seconds.
+        """
+        if not settings.A2A_STREAM_CANCEL_ON_DISCONNECT or task_id not in self._streams:
+            return
+        reaper = asyncio.get_running_loop().create_task(
+            self._cancel_if_abandoned(task_id)
+        )
+        self._reapers.add(reaper)
+        reaper.add_done_callback(self._reapers.discard)
+
+    async def _cancel_if_abandoned(self, task_id: str) -> None:
+        await asyncio.sleep(settings.A2A_STREAM_DISCONNECT_GRACE)
+        stream = self._streams.get(task_id)
+        if stream is None or stream.finished or stream.subscribers > 0:
+            return
+        if a2a_stream_worker_pool.cancel(task_id):
+            logger.info(f"Canceled stream task {task_id} abandoned by its subscribers")
+
+    async def subscribe(
+        self, task_id: str, last_event_id: int = 0
+    ) -> AsyncGenerator[Tuple[int, Dict[str, Any]], None]:
+        """Yields (seq, event) after last_event_id until the task finishes.
+
+        Uses its own database session: the request session may be closed
+        before a streaming response ends.
+        """
+        db = SessionLocal()
+        stream = self._streams.get(task_id)
+        if stream is not None:
+            stream.subscribers += 1
+        cursor = last_event_id
+        try:
+            while True:
+                # Replay what the subscriber missed from the log
+                for seq, event in read_stream_events(db, uuid.UUID(task_id), cursor):
+                    cursor = seq
+                    yield seq, event
+                db.commit()  # ends the read transaction so the next read sees new rows
+
+                if stream is None:
+                    # Running in another process (or finished): poll the log
+                    snapshot = get_a2a_task(db, task_id)
+                    if not snapshot or snapshot["status"] in TERMINAL_TASK_STATES:
+                        for seq, event in read_stream_events(
+                            db, uuid.UUID(task_id), cursor
+                        ):
+                            cursor = seq
+                            yield seq, event
+                        return
+                    await asyncio.sleep(settings.A2A_STREAM_POLL_INTERVAL)
+                    stream = self._streams.get(task_id)
+                    if stream is not None:
+                        stream.subscribers += 1
+                    continue
+
+                # Live events of a task running in this process
+                while True:
+                    async with stream.condition:
+                        try:
+                            await asyncio.wait_for(
+                                stream.condition.wait_for(
+                                    lambda: stream.last_seq > cursor or stream.finished
+                                ),
+                                LIVE_STATE_CHECK_INTERVAL,
+                            )
+                        except asyncio.TimeoutError:
+                            pass
+                        pending = [item for item in stream.events if item[0] > cursor]
+                        finished = stream.finished
+
+                    if not pending and not finished:
+                        snapshot = get_a2a_task(db, task_id)
+                        db.commit()
+                        if not snapshot or snapshot["status"] in TERMINAL_TASK_STATES:
+                            # Producer gone, finish from the log
+                            stream.subscribers -= 1
+                            stream = None
+                            break
+                        continue
+
+                    if pending and pending[0][0] > cursor + 1:
+                        # Fell behind the in-memory buffer, read the gap from the log
+                        break
+
+                    for seq, event in pending:
+                        cursor = seq
+                        yield seq, event
+
+                    if finished and stream.last_seq <= cursor:
+                        return
+        finally:
+            if stream is not None:
+                stream.subscribers -= 1
+            db.close()
+
+
+a2a_stream_hub = A2AStreamHub()
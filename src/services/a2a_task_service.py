@@ -0,0 +1,358 @@
+"""
+┌──────────────────────────────────────────────────────────────────────────────┐
+│ @author: Eduardo Oliveira                                                     │
+│ @file: a2a_task_service.py                                                   │
+│ Developed by: Eduardo Oliveira                                                │
+│ Creation date: October 19, 2026                                              │
+│ Contact: contato@evolution-api.com                                           │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @copyright © Falai 2025. All rights reserved.                        │
+│ Licensed under the Apache License, Version 2.0                               │
+│                                                                              │
+│ You may not use this file except in compliance with the License.             │
+│ You may obtain a copy of the License at                                      │
+│                                                                              │
+│    http://www.apache.org/licenses/LICENSE-2.0                                │
+│                                                                              │
+│ Unless required by applicable law or agreed to in writing, software          │
+│ distributed under the License is distributed on an "AS IS" BASIS,            │
+│ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.     │
+│ See the License for the specific language governing permissions and          │
+│ limitations under the License.                                               │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @important                                                                   │
+│ For any future changes to the code in this file, it is recommended to        │
+│ include, together with the modification, the information of the developer    │
+│ who changed it and the date of modification.                                 │
+└──────────────────────────────────────────────────────────────────────────────┘
+"""
+
+import asyncio
+import json
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from src.config.redis import get_redis_client
+from src.config.settings import settings
+from src.models.models import A2ATask
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+TERMINAL_TASK_STATES = {"completed", "canceled", "failed"}
+
+
+def _get_redis():
+    """Returns the Redis client used to cache task snapshots, if enabled"""
+    if not settings.A2A_TASK_REDIS_CACHE_ENABLED:
+        return None
+    return get_redis_client()
+
+
+def _cache_key(task_id: str) -> str:
+    return f"{settings.REDIS_KEY_PREFIX}a2a_task:{task_id}"
+
+
+def _timestamp(value: Optional[datetime]) -> str:
+    value = value or datetime.now(timezone.utc)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.isoformat()
+
+
+def a2a_task_snapshot(task: A2ATask) -> Dict[str, Any]:
+    """Serializable view of a task, shared by the database and Redis paths"""
+    return {
+        "id": str(task.id),
+        "agent_id": str(task.agent_id),
+        "context_id": task.context_id,
+        "status": task.status,
+        "result": task.result,
+        "error": task.error,
+        "push_notification_config": task.push_notification_config,
+        "updated_at": _timestamp(task.updated_at or task.created_at),
+    }
+
+
+def _cache_snapshot(snapshot: Dict[str, Any]):
+    client = _get_redis()
+    if client is None:
+        return
+    try:
+        client.setex(
+            _cache_key(snapshot["id"]), settings.REDIS_TTL, json.dumps(snapshot)
+        )
+    except Exception as e:
+        logger.warning(f"Error caching A2A task {snapshot['id']}: {str(e)}")
+
+
+def _cached_snapshot(task_id: str) -> Optional[Dict[str, Any]]:
+    client = _get_redis()
+    if client is None:
+        return None
+    try:
+        cached = client.get(_cache_key(task_id))
+        return json.loads(cached) if cached else None
+    except Exception as e:
+        logger.warning(f"Error reading cached A2A task {task_id}: {str(e)}")
+        return None
+
+
+def _parse_task_id(task_id: Any) -> Optional[uuid.UUID]:
+    try:
+        return task_id if isinstance(task_id, uuid.UUID) else uuid.UUID(str(task_id))
+    except (TypeError, ValueError):
+        return None
+
+
+def create_a2a_task(
+    db: Session,
+    agent_id: uuid.UUID,
+    context_id: str,
+    message: Dict[str, Any],
+    status: str = "submitted",
+    history: Optional[list] = None,
+    push_notification_config: Optional[Dict[str, Any]] = None,
+) -> A2ATask:
+    """Persists a new A2A task"""
+    try:
+        task = A2ATask(
+            agent_id=agent_id,
+            context_id=context_id,
+            status=status,
+            message=message,
+            history=history,
+            push_notification_config=push_notification_config,
+        )
+        db.add(task)
+        db.commit()
+        db.refresh(task)
+        _cache_snapshot(a2a_task_snapshot(task))
+        logger.info(f"A2A task {task.id} created with status {status}")
+        return task
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Error creating A2A task: {str(e)}")
+        raise
+
+
+def get_a2a_task(
+    db: Session, task_id: Any, agent_id: Optional[uuid.UUID] = None
+) -> Optional[Dict[str, Any]]:
+    """Returns the task snapshot, reading Redis before Postgres when enabled"""
+    parsed_id = _parse_task_id(task_id)
+    if parsed_id is None:
+        return None
+
+    snapshot = _cached_snapshot(str(parsed_id))
+    if snapshot is None:
+        task = db.query(A2ATask).filter(A2ATask.id == parsed_id).first()
+        if not task:
+            return None
+        snapshot = a2a_task_snapshot(task)
+        _cache_snapshot(snapshot)
+
+    if agent_id is not None and snapshot["agent_id"] != str(agent_id):
+        return None
+    return snapshot
+
+
+def get_open_a2a_task_push_config(
+    db: Session, agent_id: uuid.UUID, context_id: str
+) -> Optional[Dict[str, Any]]:
+    """Returns the id and push config of the newest open task of a context
+
+    Used by runs that outlive the request (durable workflow delays) to keep
+    delivering results to the webhook registered by the A2A caller.
+    """
+    try:
+        task = (
+            db.query(A2ATask)
+            .filter(
+                A2ATask.agent_id == agent_id,
+                A2ATask.context_id == context_id,
+                A2ATask.status.notin_(TERMINAL_TASK_STATES),
+                A2ATask.push_notification_config.isnot(None),
+            )
+            .order_by(A2ATask.created_at.desc())
+            .first()
+        )
+    except SQLAlchemyError as e:
+        logger.error(f"Error loading push config for context {context_id}: {str(e)}")
+        return None
+
+    if not task:
+        return None
+    return {
+        "task_id": str(task.id),
+        "push_notification_config": task.push_notification_config,
+    }
+
+
+def update_a2a_task_status(
+    db: Session,
+    task_id: Any,
+    status: str,
+    result: Optional[Dict[str, Any]] = None,
+    error: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """Moves a task to a new state.
+
+    Terminal states are final: the update is refused (None is returned) when
+    the task was already completed, failed or canceled, e.g. a run finishing
+    after tasks/cancel.
+    """
+    parsed_id = _parse_task_id(task_id)
+    if parsed_id is None:
+        return None
+
+    try:
+        task = (
+            db.query(A2ATask)
+            .filter(A2ATask.id == parsed_id)
+            .with_for_update()
+            .first()
+        )
+        if not task or task.status in TERMINAL_TASK_STATES:
+            db.rollback()
+            return None
+
+        task.status = status
+        if result is not None:
+            task.result = result
+        if error is not None:
+            task.error = error
+        task.updated_at = datetime.now(timezone.utc)
+        db.commit()
+        db.refresh(task)
+
+        snapshot = a2a_task_snapshot(task)
+        _cache_snapshot(snapshot)
+        logger.info(f"A2A task {task.id} moved to {status}")
+        return snapshot
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Error updating A2A task {task_id}: {str(e)}")
+        raise
+
+
+def set_a2a_task_push_config(
+    db: Session,
+    task_id: Any,
+    agent_id: uuid.UUID,
+    push_notification_config: Dict[str, Any],
+) -> Optional[Dict[str, Any]]:
+    """Stores the push notification config used for the next state transitions.
+
+    Returns None when the task does not exist or belongs to another agent.
+    """
+    parsed_id = _parse_task_id(task_id)
+    if parsed_id is None:
+        return None
+
+    try:
+        task = (
+            db.query(A2ATask)
+            .filter(A2ATask.id == parsed_id, A2ATask.agent_id == agent_id)
+            .first()
+        )
+        if not task:
+            return None
+        task.push_notification_config = push_notification_config
+        db.commit()
+        db.refresh(task)
+
+        snapshot = a2a_task_snapshot(task)
+        _cache_snapshot(snapshot)
+        return snapshot
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Error updating push config of A2A task {task_id}: {str(e)}")
+        raise
+
+
+def build_a2a_task_response(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    """Builds the A2A Task object for a snapshot"""
+    task_response = dict(snapshot.get("result") or {})
+    task_response.update(
+        {
+            "id": snapshot["id"],
+            "contextId": snapshot["context_id"],
+            "kind": "task",
+        }
+    )
+
+    status = {"state": snapshot["status"], "timestamp": snapshot["updated_at"]}
+    if snapshot.get("error"):
+        status["message"] = {
+            "role": "agent",
+            "parts": [{"type": "text", "text": snapshot["error"]}],
+            "messageId": str(uuid.uuid4()),
+            "taskId": snapshot["id"],
+            "contextId": snapshot["context_id"],
+            "kind": "message",
+        }
+    task_response["status"] = status
+    return task_response
+
+
+class A2ATaskWorkerPool:
+    """Runs asynchronous A2A tasks in the background with bounded concurrency"""
+
+    def __init__(self, name: str, workers: Callable[[], int]):
+        """
+        Args:
+            name: Pool name used in logs
+            workers: Returns the concurrency limit (0 means unbounded); read
+                on first use so tests and deployments can change the setting
+        """
+        self.name = name
+        self._workers = workers
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def submit(self, task_id: str, run: Callable[[], Awaitable[None]]):
+        """Schedules run(); it starts as soon as a worker slot is free"""
+        if self._semaphore is None and self._workers() > 0:
+            self._semaphore = asyncio.Semaphore(self._workers())
+
+        async def worker():
+            if self._semaphore is None:
+                await run()
+                return
+            async with self._semaphore:
+                await run()
+
+        task = asyncio.create_task(worker())
+        self._tasks[task_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(task_id, None))
+
+    def cancel(self, task_id: str) -> bool:
+        """Cancels the run of a task executed by this process"""
+        task = self._tasks.get(task_id)
+        if task is None or task.done():
+            return False
+        task.cancel()
+        return True
+
+    async def stop(self):
+        """Cancels every run in flight"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        logger.info(f"A2A {self.name} worker pool stopped")
+
+
+# Background message/send runs
+a2a_task_worker_pool = A2ATaskWorkerPool("task", lambda: settings.A2A_TASK_WORKERS)
+# Interactive message/stream runs, kept apart so a backlog of background sends
+# never delays a client waiting on its stream
+a2a_stream_worker_pool = A2ATaskWorkerPool(
+    "stream", lambda: settings.A2A_STREAM_WORKERS
+)
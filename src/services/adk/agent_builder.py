@@ -35,14 +35,21 @@ from google.adk.tools.agent_tool import AgentTool
 from src.schemas.schemas import Agent
 from src.utils.logger import setup_logger
 from src.core.exceptions import AgentNotFoundError
-from src.services.agent_service import get_agent
+from src.services.agent_service import (
+    get_agent_snapshot,
+    get_agent_snapshot_async,
+)
 from src.services.adk.custom_tools import CustomToolBuilder
 from src.services.adk.mcp_service import MCPService
 from src.services.adk.custom_agents.a2a_agent import A2ACustomAgent
 from src.services.adk.custom_agents.workflow_agent import WorkflowAgent
 from src.services.adk.custom_agents.task_agent import TaskAgent
-from src.services.apikey_service import get_decrypted_api_key
+from src.services.apikey_service import (
+    get_decrypted_api_key,
+    get_decrypted_api_key_async,
+)
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from contextlib import AsyncExitStack
 from google.adk.tools import load_memory
 
@@ -55,18 +62,31 @@ logger = setup_logger(__name__)
 
 
 class AgentBuilder:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, async_db: Optional[AsyncSession] = None):
+        # Agents and API keys are loaded through async_db when given; db is
+        # still passed to the MCP, workflow and task components
         self.db = db
+        self.async_db = async_db
         self.custom_tool_builder = CustomToolBuilder()
         self.mcp_service = MCPService()
 
+    async def _get_agent(self, agent_id):
+        if self.async_db is not None:
+            return await get_agent_snapshot_async(self.async_db, agent_id)
+        return get_agent_snapshot(self.db, agent_id)
+
+    async def _get_decrypted_api_key(self, key_id):
+        if self.async_db is not None:
+            return await get_decrypted_api_key_async(self.async_db, key_id)
+        return get_decrypted_api_key(self.db, key_id)
+
     async def _agent_tools_builder(self, agent) -> List[AgentTool]:
         """Build the tools for an agent."""
         agent_tools_ids = agent.config.get("agent_tools")
         agent_tools = []
         if agent_tools_ids and isinstance(agent_tools_ids, list):
             for agent_tool_id in agent_tools_ids:
-                sub_agent = get_agent(self.db, agent_tool_id)
+                sub_agent = await self._get_agent(agent_tool_id)
                 llm_agent, _ = await self.build_llm_agent(sub_agent)
                 if llm_agent:
                     agent_tools.append(AgentTool(agent=llm_agent))
@@ -137,7 +157,7 @@ class AgentBuilder:
 
         # Get API key from api_key_id
         if hasattr(agent, "api_key_id") and agent.api_key_id:
-            decrypted_key = get_decrypted_api_key(self.db, agent.api_key_id)
+            decrypted_key = await self._get_decrypted_api_key(agent.api_key_id)
             if decrypted_key:
                 logger.info(f"Using stored API key for agent {agent.name}")
                 api_key = decrypted_key
@@ -154,7 +174,7 @@ class AgentBuilder:
                 # Check if it is a UUID of a stored key
                 try:
                     key_id = uuid.UUID(config_api_key)
-                    decrypted_key = get_decrypted_api_key(self.db, key_id)
+                    decrypted_key = await self._get_decrypted_api_key(key_id)
                     if decrypted_key:
                         logger.info("Config API key is a valid reference")
                         api_key = decrypted_key
@@ -200,7 +220,7 @@ class AgentBuilder:
         for sub_agent_id in sub_agent_ids:
             sub_agent_id_str = str(sub_agent_id)
 
-            agent = get_agent(self.db, sub_agent_id_str)
+            agent = await self._get_agent(sub_agent_id_str)
 
             if agent is None:
                 logger.error(f"Sub-agent not found: {sub_agent_id_str}")
@@ -281,6 +301,8 @@ class AgentBuilder:
                 description=root_agent.description
                 or f"A2A Agent for {root_agent.name}",
                 sub_agents=sub_agents,
+                replica_urls=config.get("replica_urls") or [],
+                hedge_percentile=config.get("hedge_percentile"),
             )
 
             logger.info(
@@ -323,6 +345,8 @@ class AgentBuilder:
                 or f"Workflow Agent for {root_agent.name}",
                 sub_agents=sub_agents,
                 db=self.db,
+                agent_id=str(root_agent.id),
+                trace_enabled=config.get("workflow_trace", False),
             )
 
             logger.info(f"Workflow agent created successfully: {root_agent.name}")
@@ -364,6 +388,8 @@ class AgentBuilder:
                     description=task_config.get("description", ""),
                     expected_output=task_config.get("expected_output", ""),
                     enabled_tools=task_config.get("enabled_tools", []),
+                    id=task_config.get("id"),
+                    depends_on=task_config.get("depends_on", []),
                 )
                 tasks.append(task)
 
@@ -373,6 +399,7 @@ class AgentBuilder:
                 tasks=tasks,
                 db=self.db,
                 sub_agents=sub_agents,
+                max_parallel_tasks=config.get("max_parallel_tasks") or 3,
             )
 
             logger.info(f"Task agent created successfully: {root_agent.name}")
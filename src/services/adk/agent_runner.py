@@ -34,8 +34,10 @@ from google.adk.memory import InMemoryMemoryService
 from google.adk.artifacts.in_memory_artifact_service import InMemoryArtifactService
 from src.utils.logger import setup_logger
 from src.core.exceptions import AgentNotFoundError, InternalServerError
-from src.services.agent_service import get_agent
+from src.config.database import AsyncSessionLocal
+from src.services.agent_service import get_agent_snapshot_async
 from src.services.adk.agent_builder import AgentBuilder
+from src.services.session_compaction_service import session_compactor
 from sqlalchemy.orm import Session
 from typing import Optional, AsyncGenerator
 import asyncio
@@ -80,17 +82,20 @@ async def run_agent(
             if files and len(files) > 0:
                 logger.info(f"Received {len(files)} files with message")
 
-            get_root_agent = get_agent(db, agent_id)
-            logger.info(
-                f"Root agent found: {get_root_agent.name} (type: {get_root_agent.type})"
-            )
+            async with AsyncSessionLocal() as async_db:
+                get_root_agent = await get_agent_snapshot_async(async_db, agent_id)
+                if get_root_agent is None:
+                    raise AgentNotFoundError(f"Agent with ID {agent_id} not found")
 
-            if get_root_agent is None:
-                raise AgentNotFoundError(f"Agent with ID {agent_id} not found")
+                logger.info(
+                    f"Root agent found: {get_root_agent.name} (type: {get_root_agent.type})"
+                )
 
-            # Using the AgentBuilder to create the agent
-            agent_builder = AgentBuilder(db)
-            root_agent, exit_stack = await agent_builder.build_agent(get_root_agent)
+                # Using the AgentBuilder to create the agent
+                agent_builder = AgentBuilder(db, async_db)
+                root_agent, exit_stack = await agent_builder.build_agent(
+                    get_root_agent
+                )
 
             logger.info("Configuring Runner")
             agent_runner = Runner(
@@ -261,6 +266,7 @@ async def run_agent(
                 )
 
                 memory_service.add_session_to_memory(completed_session)
+                session_compactor.schedule(completed_session)
 
                 # Cancel the processing task if it is still running
                 if not task.done():
@@ -277,10 +283,15 @@ async def run_agent(
                 raise InternalServerError(str(e)) from e
 
             logger.info("Agent execution completed successfully")
-            return {
+            # Workflow agents expose their trace on the agent, not in the session
+            workflow_trace = getattr(root_agent, "last_trace", None)
+            result = {
                 "final_response": final_response_text,
                 "message_history": message_history,
             }
+            if workflow_trace is not None:
+                result["workflow_trace"] = workflow_trace
+            return result
         except AgentNotFoundError as e:
             logger.error(f"Error processing request: {str(e)}")
             raise e
@@ -343,50 +354,51 @@ async def run_agent_stream(
                 if files and len(files) > 0:
                     logger.info(f"Received {len(files)} files with message")
 
-                get_root_agent = get_agent(db, agent_id)
-                logger.info(
-                    f"Root agent found: {get_root_agent.name} (type: {get_root_agent.type})"
-                )
+                async with AsyncSessionLocal() as async_db:
+                    get_root_agent = await get_agent_snapshot_async(async_db, agent_id)
+                    if get_root_agent is None:
+                        raise AgentNotFoundError(f"Agent with ID {agent_id} not found")
 
-                if get_root_agent is None:
-                    raise AgentNotFoundError(f"Agent with ID {agent_id} not found")
+                    logger.info(
+                        f"Root agent found: {get_root_agent.name} (type: {get_root_agent.type})"
+                    )
 
-                # Using the AgentBuilder to create the agent
-                agent_builder = AgentBuilder(db)
-                try:
-                    root_agent, exit_stack = await agent_builder.build_agent(get_root_agent)
-                except ValueError as e:
-                    logger.error(f"Failed to build agent: {str(e)}", exc_info=True)
-                    error_message = {
-                        "type": "error",
-                        "content": {
-                            "role": "agent",
-                            "parts": [
-                                {
-                                    "type": "text",
-                                    "text": f"Error creating agent: {str(e)}. Please check your agent configuration (model name and API key)."
-                                }
-                            ]
+                    # Using the AgentBuilder to create the agent
+                    agent_builder = AgentBuilder(db, async_db)
+                    try:
+                        root_agent, exit_stack = await agent_builder.build_agent(get_root_agent)
+                    except ValueError as e:
+                        logger.error(f"Failed to build agent: {str(e)}", exc_info=True)
+                        error_message = {
+                            "type": "error",
+                            "content": {
+                                "role": "agent",
+                                "parts": [
+                                    {
+                                        "type": "text",
+                                        "text": f"Error creating agent: {str(e)}. Please check your agent configuration (model name and API key)."
+                                    }
+                                ]
+                            }
                         }
-                    }
-                    yield json.dumps(error_message)
-                    return
-                except Exception as e:
-                    logger.error(f"Unexpected error building agent: {str(e)}", exc_info=True)
-                    error_message = {
-                        "type": "error",
-                        "content": {
-                            "role": "agent",
-                            "parts": [
-                                {
-                                    "type": "text",
-                                    "text": f"Unexpected error creating agent: {str(e)}"
-                                }
-                            ]
+                        yield json.dumps(error_message)
+                        return
+                    except Exception as e:
+                        logger.error(f"Unexpected error building agent: {str(e)}", exc_info=True)
+                        error_message = {
+                            "type": "error",
+                            "content": {
+                                "role": "agent",
+                                "parts": [
+                                    {
+                                        "type": "text",
+                                        "text": f"Unexpected error creating agent: {str(e)}"
+                                    }
+                                ]
+                            }
                         }
-                    }
-                    yield json.dumps(error_message)
-                    return
+                        yield json.dumps(error_message)
+                        return
 
                 logger.info("Configuring Runner")
                 agent_runner = Runner(
@@ -544,6 +556,7 @@ async def run_agent_stream(
                     )
 
                     memory_service.add_session_to_memory(completed_session)
+                    session_compactor.schedule(completed_session)
 
                     logger.info("Agent streaming execution completed successfully")
                 except Exception as e:
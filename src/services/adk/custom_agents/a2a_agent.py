@@ -38,10 +38,13 @@ import os
 
 from src.schemas.a2a_types import AgentCard
 from src.utils.a2a_enhanced_client import (
-    EnhancedA2AClient,
     A2AClientConfig,
     A2AImplementation,
     A2AResponse,
+    A2ATarget,
+    get_shared_a2a_client,
+    send_message_hedged,
+    send_message_streaming_hedged,
 )
 
 from uuid import uuid4
@@ -62,6 +65,8 @@ class A2ACustomAgent(BaseAgent):
     base_url: str
     api_key: Optional[str]
     preferred_implementation: A2AImplementation
+    replica_urls: List[str]
+    hedge_percentile: Optional[float]
 
     def __init__(
         self,
@@ -71,6 +76,8 @@ class A2ACustomAgent(BaseAgent):
         api_key: Optional[str] = None,
         preferred_implementation: A2AImplementation = A2AImplementation.AUTO,
         sub_agents: List[BaseAgent] = [],
+        replica_urls: Optional[List[str]] = None,
+        hedge_percentile: Optional[float] = None,
         **kwargs,
     ):
         """
@@ -83,17 +90,12 @@ class A2ACustomAgent(BaseAgent):
             api_key: API key for authentication (if None, will try to get from env)
             preferred_implementation: Preferred A2A implementation (auto, custom, sdk)
             sub_agents: List of sub-agents to be executed after the A2A agent
+            replica_urls: Agent card URLs of replicas of the same agent, used for
+                hedged requests and failover
+            hedge_percentile: Latency percentile of a replica after which the
+                next one is called too (defaults to A2A_HEDGE_PERCENTILE)
         """
-        # Extract base_url from agent_card_url
-        base_url = agent_card_url
-        if "/.well-known/agent.json" in base_url:
-            base_url = base_url.split("/.well-known/agent.json")[0]
-
-        # Extract base URL for API calls (remove agent-specific parts)
-        if "/api/v1/a2a/" in base_url:
-            base_url = base_url.split("/api/v1/a2a/")[0]
-        elif "/api/v1/a2a-sdk/" in base_url:
-            base_url = base_url.split("/api/v1/a2a-sdk/")[0]
+        base_url = self._base_url(agent_card_url)
 
         # Get API key from parameter or environment
         if not api_key:
@@ -116,9 +118,46 @@ class A2ACustomAgent(BaseAgent):
             api_key=api_key,
             preferred_implementation=preferred_implementation,
             sub_agents=sub_agents,
+            replica_urls=replica_urls or [],
+            hedge_percentile=hedge_percentile,
             **kwargs,
         )
 
+    @staticmethod
+    def _base_url(agent_card_url: str) -> str:
+        """Base URL for API calls of an agent card URL."""
+        base_url = agent_card_url
+        if "/.well-known/agent.json" in base_url:
+            base_url = base_url.split("/.well-known/agent.json")[0]
+
+        # Remove agent-specific parts
+        if "/api/v1/a2a/" in base_url:
+            base_url = base_url.split("/api/v1/a2a/")[0]
+        elif "/api/v1/a2a-sdk/" in base_url:
+            base_url = base_url.split("/api/v1/a2a-sdk/")[0]
+        return base_url
+
+    def _client_config(self, base_url: Optional[str] = None) -> A2AClientConfig:
+        """Config of the pooled client shared by every agent calling this remote."""
+        return A2AClientConfig(
+            base_url=base_url or self.base_url,
+            api_key=self.api_key or "default-key",
+            implementation=self.preferred_implementation,
+            timeout=self.timeout,
+        )
+
+    async def _targets(self) -> List[A2ATarget]:
+        """The primary remote followed by its replicas."""
+        targets = []
+        for url in [self.agent_card_url, *self.replica_urls]:
+            client = await get_shared_a2a_client(
+                self._client_config(self._base_url(url))
+            )
+            targets.append(
+                A2ATarget(client=client, agent_id=self._extract_agent_id_from_url(url))
+            )
+        return targets
+
     async def fetch_agent_card(self) -> AgentCard:
         """Fetch the agent card using the enhanced client."""
         if self.agent_card:
@@ -130,25 +169,18 @@ class A2ACustomAgent(BaseAgent):
             # Extract agent ID from URL
             agent_id = self._extract_agent_id_from_url(self.agent_card_url)
 
-            # Create enhanced client
-            config = A2AClientConfig(
-                base_url=self.base_url,
-                api_key=self.api_key or "default-key",
-                implementation=self.preferred_implementation,
-                timeout=self.timeout,
-            )
-
-            async with EnhancedA2AClient(config) as client:
-                response = await client.get_agent_card(agent_id)
+            # Cards are cached (and ETag revalidated) by the shared client
+            client = await get_shared_a2a_client(self._client_config())
+            response = await client.get_agent_card(agent_id)
 
-                if response.success:
-                    print(
-                        f"Agent card fetched using {response.implementation_used.value} implementation"
-                    )
-                    self.agent_card = AgentCard(**response.data)
-                    return self.agent_card
-                else:
-                    raise ValueError(f"Failed to fetch agent card: {response.error}")
+            if response.success:
+                print(
+                    f"Agent card fetched using {response.implementation_used.value} implementation"
+                )
+                self.agent_card = AgentCard(**response.data)
+                return self.agent_card
+            else:
+                raise ValueError(f"Failed to fetch agent card: {response.error}")
 
         except Exception as e:
             print(f"Error fetching agent card: {e}")
@@ -232,40 +264,37 @@ class A2ACustomAgent(BaseAgent):
                 )
                 return
 
-            # 3. Extract agent ID and create enhanced client
-            agent_id = self._extract_agent_id_from_url(self.agent_card_url)
+            # 3. Get the pooled clients of the remote and its replicas
+            targets = await self._targets()
 
-            config = A2AClientConfig(
-                base_url=self.base_url,
-                api_key=self.api_key or "default-key",
-                implementation=self.preferred_implementation,
-                timeout=self.timeout,
+            print(
+                f"Sending message to A2A agent {targets[0].agent_id} "
+                f"({len(targets)} replicas): {user_message[:100]}..."
             )
 
-            print(f"Sending message to A2A agent {agent_id}: {user_message[:100]}...")
-
             # 4. Use enhanced client to communicate with the agent
-            async with EnhancedA2AClient(config) as client:
-                # Use session ID as a stable identifier
-                session_id = (
-                    str(ctx.session.id)
-                    if ctx.session and hasattr(ctx.session, "id")
-                    else str(uuid4())
-                )
+            # Use session ID as a stable identifier
+            session_id = (
+                str(ctx.session.id)
+                if ctx.session and hasattr(ctx.session, "id")
+                else str(uuid4())
+            )
 
-                # Check if the agent supports streaming
-                supports_streaming = self._agent_supports_streaming(agent_card)
+            # Check if the agent supports streaming
+            supports_streaming = self._agent_supports_streaming(agent_card)
 
-                if supports_streaming:
-                    print("Agent supports streaming, using streaming API")
-                    await self._process_streaming_response(
-                        client, agent_id, user_message, session_id
-                    )
-                else:
-                    print("Agent does not support streaming, using regular API")
-                    await self._process_regular_response(
-                        client, agent_id, user_message, session_id
-                    )
+            if supports_streaming:
+                print("Agent supports streaming, using streaming API")
+                async for event in self._process_streaming_response(
+                    targets, user_message, session_id
+                ):
+                    yield event
+            else:
+                print("Agent does not support streaming, using regular API")
+                async for event in self._process_regular_response(
+                    targets, user_message, session_id
+                ):
+                    yield event
 
             # 5. Run sub-agents
             for sub_agent in self.sub_agents:
@@ -319,12 +348,15 @@ class A2ACustomAgent(BaseAgent):
             return False
 
     async def _process_streaming_response(
-        self, client: EnhancedA2AClient, agent_id: str, message: str, session_id: str
+        self, targets: List[A2ATarget], message: str, session_id: str
     ) -> AsyncGenerator[Event, None]:
         """Process streaming response from the A2A agent."""
         try:
-            async for response_chunk in client.send_message_streaming(
-                agent_id=agent_id, message=message, session_id=session_id
+            async for response_chunk in send_message_streaming_hedged(
+                targets,
+                message,
+                session_id=session_id,
+                hedge_percentile=self.hedge_percentile,
             ):
                 if response_chunk.success:
                     print(
@@ -356,12 +388,15 @@ class A2ACustomAgent(BaseAgent):
             )
 
     async def _process_regular_response(
-        self, client: EnhancedA2AClient, agent_id: str, message: str, session_id: str
+        self, targets: List[A2ATarget], message: str, session_id: str
     ) -> AsyncGenerator[Event, None]:
         """Process regular (non-streaming) response from the A2A agent."""
         try:
-            response = await client.send_message(
-                agent_id=agent_id, message=message, session_id=session_id
+            response = await send_message_hedged(
+                targets,
+                message,
+                session_id=session_id,
+                hedge_percentile=self.hedge_percentile,
             )
 
             if response.success:
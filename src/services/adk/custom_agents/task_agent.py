@@ -27,30 +27,37 @@
 └──────────────────────────────────────────────────────────────────────────────┘
 """
 
-from attr import Factory
+import asyncio
+from typing import AsyncGenerator, Dict, List, Optional, Tuple
+
 from google.adk.agents import BaseAgent
 from google.adk.agents.invocation_context import InvocationContext
 from google.adk.events import Event
 from google.genai.types import Content, Part
-from src.services.agent_service import get_agent
-
 from sqlalchemy.orm import Session
 
-from typing import AsyncGenerator, List
-
 from src.schemas.agent_config import AgentTask
+from src.services.agent_service import get_agent
+from src.utils.logger import setup_logger
+from src.utils.task_graph import has_dependency_cycle
+
+logger = setup_logger(__name__)
 
 
 class TaskAgent(BaseAgent):
     """
     Custom agent that implements the Task function.
 
-    This agent implements the interaction with an external Task service.
+    Tasks are executed as a dependency graph: a task starts once every task
+    listed in its depends_on has finished, independent tasks run concurrently
+    (up to max_parallel_tasks) and the output of each dependency is passed to
+    the dependent task instructions.
     """
 
     # Field declarations for Pydantic
     tasks: List[AgentTask]
     db: Session
+    max_parallel_tasks: int = 3
 
     def __init__(
         self,
@@ -58,6 +65,7 @@ class TaskAgent(BaseAgent):
         tasks: List[AgentTask],
         db: Session,
         sub_agents: List[BaseAgent] = [],
+        max_parallel_tasks: int = 3,
         **kwargs,
     ):
         """
@@ -68,6 +76,7 @@ class TaskAgent(BaseAgent):
             tasks: List of tasks to be executed
             db: Database session
             sub_agents: List of sub-agents to be executed after the Task agent
+            max_parallel_tasks: Maximum number of tasks running at the same time
         """
         # Initialize base class
         super().__init__(
@@ -75,159 +84,297 @@ class TaskAgent(BaseAgent):
             tasks=tasks,
             db=db,
             sub_agents=sub_agents,
+            max_parallel_tasks=max(1, max_parallel_tasks),
             **kwargs,
         )
 
+    def _task_id(self, index: int, task: AgentTask) -> str:
+        """Returns the identifier used by depends_on to reference a task."""
+        return task.id or f"task_{index + 1}"
+
+    def _plan_tasks(self) -> Tuple[Dict[str, AgentTask], Dict[str, List[str]]]:
+        """Validates the task graph and returns tasks and dependencies by ID.
+
+        Raises:
+            ValueError: If a task ID is duplicated, a dependency does not exist
+                or the dependencies contain a cycle.
+        """
+        tasks: Dict[str, AgentTask] = {}
+        for index, task in enumerate(self.tasks):
+            task_id = self._task_id(index, task)
+            if task_id in tasks:
+                raise ValueError(f"Duplicated task id: {task_id}")
+            tasks[task_id] = task
+
+        dependencies: Dict[str, List[str]] = {}
+        for task_id, task in tasks.items():
+            depends_on = list(task.depends_on or [])
+            for dependency in depends_on:
+                if dependency not in tasks:
+                    raise ValueError(
+                        f"Task {task_id} depends on unknown task {dependency}"
+                    )
+            dependencies[task_id] = depends_on
+
+        if has_dependency_cycle(dependencies):
+            raise ValueError("Task dependencies contain a cycle")
+
+        return tasks, dependencies
+
+    def _build_task_instructions(
+        self, description: str, expected_output: str, previous_results: Dict[str, str]
+    ) -> str:
+        """Builds the instructions sent to the agent executing a task."""
+        results = ""
+        if previous_results:
+            results = "\n".join(
+                f'<result task="{task_id}">{output}</result>'
+                for task_id, output in previous_results.items()
+            )
+            results = f"\n    <previous_results>\n{results}\n    </previous_results>"
+
+        return f"""
+                <task>
+                    <instructions>
+                        Execute the following task:
+                    </instructions>
+                    <description>{description}</description>
+                    <expected_output>{expected_output}</expected_output>{results}
+                </task>
+                """
+
+    async def _run_task(
+        self,
+        ctx: InvocationContext,
+        task_id: str,
+        task: AgentTask,
+        user_message: str,
+        previous_results: Dict[str, str],
+        queue: asyncio.Queue,
+        semaphore: asyncio.Semaphore,
+    ):
+        """Runs a single task, forwarding its events to the queue."""
+        async with semaphore:
+            exit_stack = None
+            try:
+                agent = get_agent(self.db, task.agent_id)
+                if not agent:
+                    raise ValueError(f"Agent not found for task {task_id}")
+
+                # The shared AgentTask is never modified
+                description = task.description.replace("{content}", user_message)
+                instructions = self._build_task_instructions(
+                    description, task.expected_output, previous_results
+                )
+
+                # Concurrent tasks get their own branch so they do not see
+                # each other's events in the conversation history
+                task_ctx = ctx
+                if len(self.tasks) > 1:
+                    branch = f"{self.name}.{task_id}"
+                    if ctx.branch:
+                        branch = f"{ctx.branch}.{branch}"
+                    task_ctx = ctx.model_copy(update={"branch": branch})
+                else:
+                    # Store task instructions in context for reference by sub-agents
+                    ctx.session.state["task_instructions"] = instructions
+
+                await queue.put(
+                    (
+                        "event",
+                        task_id,
+                        Event(
+                            invocation_id=ctx.invocation_id,
+                            author=f"{self.name} - Task executor",
+                            branch=task_ctx.branch,
+                            content=Content(
+                                role="agent", parts=[Part(text=instructions)]
+                            ),
+                        ),
+                    )
+                )
+
+                # Import moved to inside the function to avoid circular import
+                from src.services.adk.agent_builder import AgentBuilder
+
+                logger.info(f"Building agent {agent.name} for task {task_id}")
+                root_agent, exit_stack = await AgentBuilder(self.db).build_agent(
+                    agent, list(task.enabled_tools or [])
+                )
+
+                output = ""
+                async for event in root_agent.run_async(task_ctx):
+                    await queue.put(("event", task_id, event))
+                    if event.partial or not event.content or not event.content.parts:
+                        continue
+                    text = "".join(
+                        part.text for part in event.content.parts if part.text
+                    )
+                    if text:
+                        output = text
+
+                await queue.put(("done", task_id, output))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error executing task {task_id}: {str(e)}")
+                await queue.put(("failed", task_id, str(e)))
+            finally:
+                # Close the exit_stack in the same task where it was created
+                if exit_stack:
+                    try:
+                        await exit_stack.aclose()
+                    except Exception as e:
+                        logger.error(f"Error closing exit_stack: {str(e)}")
+
+    def _extract_user_message(self, ctx: InvocationContext) -> Optional[str]:
+        """Extracts the user message from the session events or state."""
+        if ctx.session and hasattr(ctx.session, "events") and ctx.session.events:
+            for event in reversed(ctx.session.events):
+                if event.author == "user" and event.content and event.content.parts:
+                    return event.content.parts[0].text
+
+        if ctx.session and ctx.session.state:
+            if "user_message" in ctx.session.state:
+                return ctx.session.state["user_message"]
+            elif "message" in ctx.session.state:
+                return ctx.session.state["message"]
+
+        return None
+
     async def _run_async_impl(
         self, ctx: InvocationContext
     ) -> AsyncGenerator[Event, None]:
         """
         Implementation of the Task agent.
 
-        This method follows the pattern of implementing custom agents,
-        sending the user's message to the Task service and monitoring the response.
+        Schedules every task whose dependencies are satisfied, yields the
+        events of all running tasks as they are produced and runs the
+        sub-agents once every task has completed.
         """
-        exit_stack = None
+        user_message = self._extract_user_message(ctx)
+        if not user_message:
+            yield Event(
+                author=self.name,
+                content=Content(
+                    role="agent",
+                    parts=[Part(text="User message not found")],
+                ),
+            )
+            return
 
         try:
-            # Extract the user's message from the context
-            user_message = None
-
-            # Search for the user's message in the session events
-            if ctx.session and hasattr(ctx.session, "events") and ctx.session.events:
-                for event in reversed(ctx.session.events):
-                    if event.author == "user" and event.content and event.content.parts:
-                        user_message = event.content.parts[0].text
-                        print("Message found in session events")
-                        break
-
-            # Check in the session state if the message was not found in the events
-            if not user_message and ctx.session and ctx.session.state:
-                if "user_message" in ctx.session.state:
-                    user_message = ctx.session.state["user_message"]
-                elif "message" in ctx.session.state:
-                    user_message = ctx.session.state["message"]
-
-            if not user_message:
-                yield Event(
-                    author=self.name,
-                    content=Content(
-                        role="agent",
-                        parts=[Part(text="User message not found")],
-                    ),
-                )
-                return
-
-            # Start the agent status
+            tasks, dependencies = self._plan_tasks()
+        except ValueError as e:
             yield Event(
                 author=self.name,
                 content=Content(
                     role="agent",
-                    parts=[Part(text=f"Starting {self.name} task processing...")],
+                    parts=[Part(text=f"Invalid task configuration: {str(e)}")],
                 ),
             )
+            return
 
-            try:
-                # Replace any {content} in the task descriptions with the user's input
-                task = self.tasks[0]
-                task.description = task.description.replace("{content}", user_message)
-                task.enabled_tools = task.enabled_tools or []
-
-                agent = get_agent(self.db, task.agent_id)
+        # Start the agent status
+        yield Event(
+            author=self.name,
+            content=Content(
+                role="agent",
+                parts=[Part(text=f"Starting {self.name} task processing...")],
+            ),
+        )
 
-                if not agent:
-                    yield Event(
-                        author=self.name,
-                        content=Content(parts=[Part(text="Agent not found")]),
-                    )
-                    return
+        queue: asyncio.Queue = asyncio.Queue()
+        semaphore = asyncio.Semaphore(self.max_parallel_tasks)
+        results: Dict[str, str] = {}
+        failed: Dict[str, str] = {}
+        skipped: List[str] = []
+        pending = dict(tasks)
+        running: Dict[str, asyncio.Task] = {}
 
-                # Prepare task instructions
-                task_message_instructions = f"""
-                <task>
-                    <instructions>
-                        Execute the following task:
-                    </instructions>
-                    <description>{task.description}</description>
-                    <expected_output>{task.expected_output}</expected_output>
-                </task>
-                """
+        def schedule_ready_tasks():
+            # Skipping a task can skip tasks listed before it, so repeat
+            # until a pass changes nothing
+            changed = True
+            while changed:
+                changed = False
+                for task_id in list(pending):
+                    deps = dependencies[task_id]
+                    if any(dep in failed for dep in deps):
+                        failed[task_id] = "Skipped because a dependency failed"
+                        skipped.append(task_id)
+                        pending.pop(task_id)
+                        changed = True
 
-                # Send task instructions as an event
-                yield Event(
-                    author=f"{self.name} - Task executor",
-                    content=Content(
-                        role="agent",
-                        parts=[Part(text=task_message_instructions)],
-                    ),
-                )
+            for task_id in list(pending):
+                deps = dependencies[task_id]
+                if all(dep in results for dep in deps):
+                    task = pending.pop(task_id)
+                    running[task_id] = asyncio.create_task(
+                        self._run_task(
+                            ctx,
+                            task_id,
+                            task,
+                            user_message,
+                            {dep: results[dep] for dep in deps},
+                            queue,
+                            semaphore,
+                        )
+                    )
 
-                from src.services.adk.agent_builder import AgentBuilder
+        try:
+            schedule_ready_tasks()
+            while running:
+                message = await queue.get()
+                kind, task_id = message[0], message[1]
 
-                print(f"Building agent in Task agent: {agent.name}")
-                agent_builder = AgentBuilder(self.db)
-                root_agent, exit_stack = await agent_builder.build_agent(
-                    agent, task.enabled_tools
-                )
+                if kind == "event":
+                    yield message[2]
+                    continue
 
-                # Store task instructions in context for reference by sub-agents
-                ctx.session.state["task_instructions"] = task_message_instructions
-
-                # Process the agent responses
-                try:
-                    async for event in root_agent.run_async(ctx):
-                        yield event
-                except GeneratorExit:
-                    print("Generator was closed prematurely, handling cleanup...")
-                    # Allow the exception to propagate after cleanup
-                    raise
-                except Exception as e:
-                    error_msg = f"Error during agent execution: {str(e)}"
-                    print(error_msg)
+                running.pop(task_id, None)
+                if kind == "done":
+                    results[task_id] = message[2]
+                else:
+                    failed[task_id] = message[2]
                     yield Event(
                         author=self.name,
                         content=Content(
                             role="agent",
-                            parts=[Part(text=error_msg)],
+                            parts=[
+                                Part(text=f"Error executing task {task_id}: {message[2]}")
+                            ],
                         ),
                     )
 
-            except Exception as e:
-                error_msg = f"Error sending request: {str(e)}"
-                print(error_msg)
-                print(f"Error type: {type(e).__name__}")
-                print(f"Error details: {str(e)}")
-
-                yield Event(
-                    author=self.name,
-                    content=Content(role="agent", parts=[Part(text=error_msg)]),
-                )
+                schedule_ready_tasks()
+        finally:
+            # Cancel running tasks if the consumer stopped early
+            for running_task in running.values():
+                running_task.cancel()
+            if running:
+                await asyncio.gather(*running.values(), return_exceptions=True)
 
-        except Exception as e:
-            # Handle any uncaught error
-            print(f"Error executing Task agent: {str(e)}")
+        if skipped:
             yield Event(
                 author=self.name,
                 content=Content(
                     role="agent",
-                    parts=[Part(text=f"Error interacting with Task agent: {str(e)}")],
+                    parts=[
+                        Part(
+                            text=f"Tasks skipped because a dependency failed: {', '.join(skipped)}"
+                        )
+                    ],
                 ),
             )
-        finally:
-            # Ensure we close the exit_stack in the same task context where it was created
-            if exit_stack:
-                try:
-                    await exit_stack.aclose()
-                    print("Exit stack closed successfully")
-                except Exception as e:
-                    print(f"Error closing exit_stack: {str(e)}")
-
-            # Execute sub-agents only if no exception occurred
-            try:
-                if "e" not in locals():
-                    for sub_agent in self.sub_agents:
-                        async for event in sub_agent.run_async(ctx):
-                            yield event
-            except Exception as sub_e:
-                print(f"Error executing sub-agents: {str(sub_e)}")
-                # We don't yield a new event here to avoid raising during cleanup
+
+        # Execute sub-agents only if every task succeeded
+        if failed:
+            return
+
+        try:
+            for sub_agent in self.sub_agents:
+                async for event in sub_agent.run_async(ctx):
+                    yield event
+        except Exception as e:
+            logger.error(f"Error executing sub-agents: {str(e)}")
@@ -30,21 +30,31 @@
 └──────────────────────────────────────────────────────────────────────────────┘
 """
 
-from datetime import datetime
+import asyncio
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
 from google.adk.agents import BaseAgent
 from google.adk.agents.invocation_context import InvocationContext
 from google.adk.events import Event
 from google.genai.types import Content, Part
 
-from typing import AsyncGenerator, Dict, Any, List, TypedDict
+from typing import AsyncGenerator, Dict, Any, List, Optional, Tuple, TypedDict
 import uuid
 
+from src.config.settings import settings
+from src.services.a2a_task_service import get_open_a2a_task_push_config
 from src.services.agent_service import get_agent
+from src.services.workflow_timer_service import create_workflow_timer
+from src.utils.logger import setup_logger
+from src.utils.workflow_trace import WorkflowTraceRecorder
 
 from sqlalchemy.orm import Session
 
 from langgraph.graph import StateGraph, END
 
+logger = setup_logger(__name__)
+
 
 class State(TypedDict):
     content: List[Event]
@@ -57,6 +67,61 @@ class State(TypedDict):
     conversation_history: List[Event]
 
 
+@dataclass
+class WorkflowRun:
+    """Resources shared by the nodes of a single workflow run."""
+
+    # Built agents by agent ID, reused when a node is visited again (loops)
+    node_agents: Dict[str, Tuple[BaseAgent, Optional[AsyncExitStack]]] = field(
+        default_factory=dict
+    )
+    # Out-of-band channel used to forward node events while the graph runs
+    event_queue: Optional[asyncio.Queue] = None
+    trace: Optional[WorkflowTraceRecorder] = None
+    # Last status reported by the graph (e.g. "suspended")
+    status: Optional[str] = None
+
+    async def emit(self, event: Event):
+        """Forwards an event to the outer agent as soon as it is produced."""
+        if self.event_queue is not None:
+            await self.event_queue.put(("event", event))
+
+    async def close(self):
+        """Closes the exit stacks of every agent built during the run."""
+        for agent_id, (_, exit_stack) in self.node_agents.items():
+            if not exit_stack:
+                continue
+            try:
+                await exit_stack.aclose()
+            except Exception as e:
+                logger.error(
+                    f"Error closing resources of node agent {agent_id}: {str(e)}"
+                )
+        self.node_agents.clear()
+
+
+def serialize_workflow_value(value: Any) -> Any:
+    """Converts a workflow state value into JSON-safe data for checkpoints."""
+    if isinstance(value, Event):
+        return {"__event__": value.model_dump_json(exclude_none=True)}
+    if isinstance(value, dict):
+        return {key: serialize_workflow_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [serialize_workflow_value(item) for item in value]
+    return value
+
+
+def deserialize_workflow_value(value: Any) -> Any:
+    """Restores a value produced by serialize_workflow_value."""
+    if isinstance(value, dict):
+        if set(value.keys()) == {"__event__"}:
+            return Event.model_validate_json(value["__event__"])
+        return {key: deserialize_workflow_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [deserialize_workflow_value(item) for item in value]
+    return value
+
+
 class WorkflowAgent(BaseAgent):
     """
     Agent that implements workflow flows using LangGraph.
@@ -69,6 +134,12 @@ class WorkflowAgent(BaseAgent):
     flow_json: Dict[str, Any]
     timeout: int
     db: Session
+    agent_id: Optional[str] = None
+    resume_checkpoint: Optional[Dict[str, Any]] = None
+    trace_enabled: bool = False
+    # Trace of the last run when trace_enabled, read by the runner afterwards
+    # (kept out of the events so it is never persisted in the session state)
+    last_trace: Optional[Dict[str, Any]] = None
 
     def __init__(
         self,
@@ -77,6 +148,8 @@ class WorkflowAgent(BaseAgent):
         timeout: int = 300,
         sub_agents: List[BaseAgent] = [],
         db: Session = None,
+        agent_id: Optional[str] = None,
+        trace_enabled: bool = False,
         **kwargs,
     ):
         """
@@ -88,6 +161,8 @@ class WorkflowAgent(BaseAgent):
             timeout: Maximum execution time (seconds)
             sub_agents: List of sub-agents to be executed after the workflow agent
             db: Session
+            agent_id: ID of the workflow agent, required to register durable delays
+            trace_enabled: Record the workflow trace and expose it in last_trace
         """
         # Initialize base class
         super().__init__(
@@ -96,14 +171,12 @@ class WorkflowAgent(BaseAgent):
             timeout=timeout,
             sub_agents=sub_agents,
             db=db,
+            agent_id=agent_id,
+            trace_enabled=trace_enabled,
             **kwargs,
         )
 
-        print(
-            f"Workflow agent initialized with {len(flow_json.get('nodes', []))} nodes"
-        )
-
-    async def _create_node_functions(self, ctx: InvocationContext):
+    async def _create_node_functions(self, ctx: InvocationContext, run: WorkflowRun):
         """Creates functions for each type of node in the flow."""
 
         # Function for the initial node
@@ -112,8 +185,6 @@ class WorkflowAgent(BaseAgent):
             node_id: str,
             node_data: Dict[str, Any],
         ) -> AsyncGenerator[State, None]:
-            print("\n🏁 INITIAL NODE")
-
             content = state.get("content", [])
 
             if not content:
@@ -163,17 +234,16 @@ class WorkflowAgent(BaseAgent):
 
             # Increment cycle counter
             cycle_count = state.get("cycle_count", 0) + 1
-            print(f"\n👤 AGENT: {agent_name} (Cycle {cycle_count})")
-
             content = state.get("content", [])
             session_id = state.get("session_id", "")
 
             # Get conversation history
             conversation_history = state.get("conversation_history", [])
 
-            agent = get_agent(self.db, agent_id)
+            cached = run.node_agents.get(str(agent_id))
+            agent = None if cached else get_agent(self.db, agent_id)
 
-            if not agent:
+            if not cached and not agent:
                 yield {
                     "content": [
                         Event(
@@ -189,23 +259,37 @@ class WorkflowAgent(BaseAgent):
                 }
                 return
 
-            # Import moved to inside the function to avoid circular import
-            from src.services.adk.agent_builder import AgentBuilder
+            if cached:
+                root_agent, _ = cached
+            else:
+                # Import moved to inside the function to avoid circular import
+                from src.services.adk.agent_builder import AgentBuilder
 
-            agent_builder = AgentBuilder(self.db)
-            root_agent, exit_stack = await agent_builder.build_agent(agent)
+                agent_builder = AgentBuilder(self.db)
+                root_agent, exit_stack = await agent_builder.build_agent(agent)
+                # Exit stacks are closed once, when the run finishes
+                run.node_agents[str(agent_id)] = (root_agent, exit_stack)
 
             new_content = []
             async for event in root_agent.run_async(ctx):
-                conversation_history.append(event)
-                
+                if run.trace is not None:
+                    run.trace.record_inner_event(node_id, event)
+
                 modified_event = Event(
-                    author=f"workflow-node:{node_id}", content=event.content
+                    id=Event.new_id(),
+                    invocation_id=ctx.invocation_id,
+                    author=f"workflow-node:{node_id}",
+                    content=event.content,
+                    partial=event.partial,
                 )
-                new_content.append(modified_event)
+                await run.emit(modified_event)
 
+                # Partial chunks are only streamed, the final event holds the full text
+                if event.partial:
+                    continue
 
-            print(f"New content: {new_content}")
+                conversation_history.append(event)
+                new_content.append(modified_event)
 
             node_outputs = state.get("node_outputs", {})
             node_outputs[node_id] = {
@@ -225,9 +309,6 @@ class WorkflowAgent(BaseAgent):
                 "session_id": session_id,
             }
 
-            if exit_stack:
-                await exit_stack.aclose()
-
         # Function for condition nodes
         async def condition_node_function(
             state: State, node_id: str, node_data: Dict[str, Any]
@@ -236,8 +317,6 @@ class WorkflowAgent(BaseAgent):
             conditions = node_data.get("conditions", [])
             cycle_count = state.get("cycle_count", 0)
 
-            print(f"\n🔄 CONDITION: {label} (Cycle {cycle_count})")
-
             content = state.get("content", [])
             conversation_history = state.get("conversation_history", [])
 
@@ -251,10 +330,6 @@ class WorkflowAgent(BaseAgent):
                     ):
                         latest_event = event
                         break
-                if latest_event:
-                    print(
-                        f"Evaluating condition only for the most recent event: '{latest_event}'"
-                    )
 
             # Use only the most recent event for condition evaluation
             evaluation_state = state.copy()
@@ -273,15 +348,11 @@ class WorkflowAgent(BaseAgent):
                 operator = condition_data.get("operator")
                 expected_value = condition_data.get("value")
 
-                print(
-                    f"  Checking if {field} {operator} '{expected_value}' (current value: '{evaluation_state.get(field, '')}')"
-                )
                 if self._evaluate_condition(condition, evaluation_state):
                     conditions_met.append(condition_id)
                     condition_details.append(
                         f"{field} {operator} '{expected_value}' ✅"
                     )
-                    print(f"  ✅ Condition {condition_id} met!")
                 else:
                     condition_details.append(
                         f"{field} {operator} '{expected_value}' ❌"
@@ -289,8 +360,8 @@ class WorkflowAgent(BaseAgent):
 
             # Check if the cycle reached the limit (extra security)
             if cycle_count >= 10:
-                print(
-                    f"⚠️ ATTENTION: Cycle limit reached ({cycle_count}). Forcing termination."
+                logger.warning(
+                    f"Cycle limit reached ({cycle_count}) in workflow {self.name}. Forcing termination."
                 )
 
                 condition_content = [
@@ -353,8 +424,6 @@ class WorkflowAgent(BaseAgent):
             message_type = message_data.get("type", "text")
             message_content = message_data.get("content", "")
 
-            print(f"\n💬 MESSAGE-NODE: {message_content}")
-
             content = state.get("content", [])
             session_id = state.get("session_id", "")
             conversation_history = state.get("conversation_history", [])
@@ -387,7 +456,6 @@ class WorkflowAgent(BaseAgent):
             delay_data = node_data.get("delay", {})
             delay_value = delay_data.get("value", 0)
             delay_unit = delay_data.get("unit", "seconds")
-            delay_description = delay_data.get("description", "")
             
             # Convert to seconds based on unit
             delay_seconds = delay_value
@@ -397,7 +465,6 @@ class WorkflowAgent(BaseAgent):
                 delay_seconds = delay_value * 3600
             
             label = node_data.get("label", "delay_node")
-            print(f"\n⏱️ DELAY-NODE: {delay_value} {delay_unit} - {delay_description}")
             
             content = state.get("content", [])
             session_id = state.get("session_id", "")
@@ -412,10 +479,88 @@ class WorkflowAgent(BaseAgent):
                 "delay_start_time": datetime.now().isoformat(),
             }
             
-            # Actually perform the delay
-            import asyncio
-            await asyncio.sleep(delay_seconds)
-            
+            if self._should_suspend_delay(delay_seconds):
+                # Follow the outgoing edge as if the delay had already completed
+                resume_node_id = self._create_flow_router(self.flow_json)(node_id)(
+                    {**state, "status": "delay_completed", "node_outputs": node_outputs}
+                )
+
+                if resume_node_id == END:
+                    # Nothing runs after the delay, so there is nothing to wait for
+                    delay_seconds = 0
+                else:
+                    fire_at = datetime.now(timezone.utc) + timedelta(
+                        seconds=delay_seconds
+                    )
+                    user_message = next(
+                        (
+                            event.content.parts[0].text
+                            for event in content
+                            if event.author == "user"
+                            and event.content
+                            and event.content.parts
+                        ),
+                        "",
+                    )
+                    # The A2A caller's webhook receives the result once the run resumes
+                    push_target = get_open_a2a_task_push_config(
+                        self.db, uuid.UUID(str(self.agent_id)), ctx.session.user_id
+                    ) or {}
+                    checkpoint = serialize_workflow_value(
+                        {
+                            "content": content,
+                            "node_outputs": node_outputs,
+                            "cycle_count": state.get("cycle_count", 0),
+                            "session_id": session_id,
+                            "a2a_task_id": push_target.get("task_id"),
+                        }
+                    )
+                    timer = create_workflow_timer(
+                        self.db,
+                        agent_id=uuid.UUID(str(self.agent_id)),
+                        app_name=ctx.session.app_name,
+                        user_id=ctx.session.user_id,
+                        session_id=ctx.session.id,
+                        node_id=node_id,
+                        resume_node_id=resume_node_id,
+                        checkpoint=checkpoint,
+                        fire_at=fire_at,
+                        resume_message=user_message,
+                        push_notification_config=push_target.get(
+                            "push_notification_config"
+                        ),
+                    )
+                    node_outputs[node_id]["timer_id"] = str(timer.id)
+                    node_outputs[node_id]["resume_at"] = fire_at.isoformat()
+
+                    logger.info(
+                        f"Workflow {self.name} suspended at node {node_id} until {fire_at.isoformat()} (timer {timer.id})"
+                    )
+
+                    suspended_event = Event(
+                        author=f"workflow-node:{node_id}",
+                        content=Content(
+                            parts=[
+                                Part(
+                                    text=f"Workflow paused, it will resume at {fire_at.isoformat()}"
+                                )
+                            ]
+                        ),
+                    )
+
+                    yield {
+                        "content": content + [suspended_event],
+                        "status": "suspended",
+                        "node_outputs": node_outputs,
+                        "cycle_count": state.get("cycle_count", 0),
+                        "conversation_history": conversation_history,
+                        "session_id": session_id,
+                    }
+                    return
+
+            # Short delays are awaited inline
+            if delay_seconds > 0:
+                await asyncio.sleep(delay_seconds)
             
             # Update node outputs with completion information
             node_outputs[node_id]["delay_end_time"] = datetime.now().isoformat()
@@ -437,6 +582,15 @@ class WorkflowAgent(BaseAgent):
             "delay-node": delay_node_function,
         }
 
+    def _should_suspend_delay(self, delay_seconds: float) -> bool:
+        """Checks whether a delay should suspend the run instead of sleeping inline."""
+        return (
+            settings.WORKFLOW_DURABLE_DELAYS_ENABLED
+            and delay_seconds >= settings.WORKFLOW_DURABLE_DELAY_MIN_SECONDS
+            and bool(self.agent_id)
+            and self.db is not None
+        )
+
     def _evaluate_condition(self, condition: Dict[str, Any], state: State) -> bool:
         """Evaluates a condition against the current state."""
         condition_type = condition.get("type")
@@ -450,10 +604,7 @@ class WorkflowAgent(BaseAgent):
             if field == "content" and isinstance(actual_value, list) and actual_value:
                 actual_value = self._extract_text_from_events(actual_value)
 
-            result = self._process_condition(operator, actual_value, expected_value)
-
-            print(f"  Check '{operator}': {result}")
-            return result
+            return self._process_condition(operator, actual_value, expected_value)
 
         return False
 
@@ -487,9 +638,7 @@ class WorkflowAgent(BaseAgent):
                 )
 
         if extracted_texts:
-            joined_text = " ".join(extracted_texts)
-            print(f"  Extracted text from events: '{joined_text[:100]}...'")
-            return joined_text
+            return " ".join(extracted_texts)
 
         return ""
 
@@ -563,8 +712,8 @@ class WorkflowAgent(BaseAgent):
             else:  # less_than_or_equal
                 return actual_num <= expected_num
         except (ValueError, TypeError):
-            print(
-                f"  Error converting values for numeric comparison: '{actual_str[:100]}...' and '{expected_str}'"
+            logger.debug(
+                f"Error converting values for numeric comparison: '{actual_str[:100]}' and '{expected_str}'"
             )
             return False
 
@@ -579,7 +728,7 @@ class WorkflowAgent(BaseAgent):
             else:  # not_matches
                 return not bool(pattern.search(actual_str))
         except re.error:
-            print(f"  Error in regular expression: '{expected_str}'")
+            logger.warning(f"Error in regular expression: '{expected_str}'")
             return (
                 operator == "not_matches"
             )  # Return True for not_matches, False for matches
@@ -589,10 +738,6 @@ class WorkflowAgent(BaseAgent):
         expected_lower = expected_str.lower()
         actual_lower = actual_str.lower()
 
-        print(
-            f"  Comparison '{operator}' without case distinction: '{expected_lower}' in '{actual_lower[:100]}...'"
-        )
-
         if operator == "contains":
             return expected_lower in actual_lower
         elif operator == "not_contains":
@@ -600,7 +745,9 @@ class WorkflowAgent(BaseAgent):
 
         return False
 
-    def _create_flow_router(self, flow_data: Dict[str, Any]):
+    def _create_flow_router(
+        self, flow_data: Dict[str, Any], run: Optional[WorkflowRun] = None
+    ):
         """Creates a router based on the connections in flow.json."""
         # Map connections to understand how nodes are connected
         edges_map = {}
@@ -626,16 +773,19 @@ class WorkflowAgent(BaseAgent):
 
         # Routing function for each specific node
         def create_router_for_node(node_id: str):
-            def router(state: State) -> str:
-                print(f"Routing from node: {node_id}")
+            def route(state: State) -> Tuple[str, str]:
+                """Returns the next node and the reason for the decision."""
+                # A suspended workflow is resumed later by the timer worker
+                if state.get("status") == "suspended":
+                    return END, "suspended"
 
                 # Check if the cycle limit has been reached
                 cycle_count = state.get("cycle_count", 0)
                 if cycle_count >= 10:
-                    print(
-                        f"⚠️ Cycle limit ({cycle_count}) reached. Finalizing the flow."
+                    logger.warning(
+                        f"Cycle limit ({cycle_count}) reached in workflow {self.name}. Finalizing the flow."
                     )
-                    return END
+                    return END, "cycle_limit_reached"
 
                 # If it's a condition node, evaluate the conditions
                 if node_id in condition_nodes:
@@ -644,22 +794,19 @@ class WorkflowAgent(BaseAgent):
 
                     node_outputs = state.get("node_outputs", {})
                     if node_id in node_outputs:
+                        # Use the result stored by the condition node
                         conditions_met = node_outputs[node_id].get("conditions_met", [])
                         if conditions_met:
                             any_condition_met = True
                             condition_id = conditions_met[0]
-                            print(
-                                f"Using stored condition evaluation result: Condition {condition_id} met."
-                            )
                             if (
                                 node_id in edges_map
                                 and condition_id in edges_map[node_id]
                             ):
-                                return edges_map[node_id][condition_id]
-                        else:
-                            print(
-                                "Using stored condition evaluation result: No conditions met."
-                            )
+                                return (
+                                    edges_map[node_id][condition_id],
+                                    f"condition_met:{condition_id}",
+                                )
                     else:
                         for condition in conditions:
                             condition_id = condition.get("id")
@@ -687,20 +834,16 @@ class WorkflowAgent(BaseAgent):
 
                             if is_condition_met:
                                 any_condition_met = True
-                                print(
-                                    f"Condition {condition_id} met. Moving to the next node."
-                                )
 
                                 # Find the connection that uses this condition_id as a handle
                                 if (
                                     node_id in edges_map
                                     and condition_id in edges_map[node_id]
                                 ):
-                                    return edges_map[node_id][condition_id]
-                            else:
-                                print(
-                                    f"Condition {condition_id} not met. Continuing evaluation or using default path."
-                                )
+                                    return (
+                                        edges_map[node_id][condition_id],
+                                        f"condition_met:{condition_id}",
+                                    )
 
                     # If no condition is met, use the bottom-handle if available
                     if not any_condition_met:
@@ -708,48 +851,56 @@ class WorkflowAgent(BaseAgent):
                             node_id in edges_map
                             and "bottom-handle" in edges_map[node_id]
                         ):
-                            print(
-                                "No condition met. Using default path (bottom-handle)."
-                            )
-                            return edges_map[node_id]["bottom-handle"]
+                            return edges_map[node_id]["bottom-handle"], "default_path"
                         else:
-                            print(
-                                "No condition met and no default path. Closing the flow."
-                            )
-                            return END
+                            return END, "no_condition_met"
 
                 # For regular nodes, simply follow the first available connection
                 if node_id in edges_map:
                     # Try to use the default handle or bottom-handle first
                     for handle in ["default", "bottom-handle"]:
                         if handle in edges_map[node_id]:
-                            return edges_map[node_id][handle]
+                            return edges_map[node_id][handle], f"edge:{handle}"
 
                     # If no specific handle is found, use the first available
                     if edges_map[node_id]:
                         first_handle = list(edges_map[node_id].keys())[0]
-                        return edges_map[node_id][first_handle]
+                        return (
+                            edges_map[node_id][first_handle],
+                            f"edge:{first_handle}",
+                        )
 
                 # If there is no output connection, close the flow
-                print(f"No output connection from node {node_id}. Closing the flow.")
-                return END
+                return END, "no_output_connection"
+
+            def router(state: State) -> str:
+                target, reason = route(state)
+                if run is not None and run.trace is not None:
+                    run.trace.record_route(node_id, target, reason)
+                logger.debug(f"Routing from node {node_id} to {target} ({reason})")
+                return target
 
             return router
 
         return create_router_for_node
 
     async def _create_graph(
-        self, ctx: InvocationContext, flow_data: Dict[str, Any]
+        self,
+        ctx: InvocationContext,
+        flow_data: Dict[str, Any],
+        entry_point: Optional[str] = None,
+        run: Optional[WorkflowRun] = None,
     ) -> StateGraph:
         """Creates a StateGraph from the flow data."""
         # Extract nodes from the flow
         nodes = flow_data.get("nodes", [])
+        run = run or WorkflowRun()
 
         # Initialize StateGraph
         graph_builder = StateGraph(State)
 
         # Create functions for each node type
-        node_functions = await self._create_node_functions(ctx)
+        node_functions = await self._create_node_functions(ctx, run)
 
         # Dictionary to store specific functions for each node
         node_specific_functions = {}
@@ -764,12 +915,26 @@ class WorkflowAgent(BaseAgent):
                 # Create a specific function for this node
                 def create_node_function(node_type, node_id, node_data):
                     async def node_function(state):
+                        node_trace = (
+                            run.trace.start_node(node_id, node_type, state)
+                            if run.trace is not None
+                            else None
+                        )
+
                         # Consume the asynchronous generator and return the last result
                         result = None
-                        async for item in node_functions[node_type](
-                            state, node_id, node_data
-                        ):
-                            result = item
+                        try:
+                            async for item in node_functions[node_type](
+                                state, node_id, node_data
+                            ):
+                                result = item
+                        except Exception as e:
+                            if node_trace is not None:
+                                run.trace.finish_node(node_trace, state, error=e)
+                            raise
+
+                        if node_trace is not None:
+                            run.trace.finish_node(node_trace, result)
                         return result
 
                     return node_function
@@ -780,11 +945,10 @@ class WorkflowAgent(BaseAgent):
                 )
 
                 # Add node to the graph
-                print(f"Adding node {node_id} of type {node_type}")
                 graph_builder.add_node(node_id, node_specific_functions[node_id])
 
         # Create function to generate specific routers
-        create_router = self._create_flow_router(flow_data)
+        create_router = self._create_flow_router(flow_data, run)
 
         # Add conditional connections for each node
         for node in nodes:
@@ -808,19 +972,17 @@ class WorkflowAgent(BaseAgent):
                 node_router = create_router(node_id)
 
                 # Add conditional connections
-                print(f"Adding conditional connections for node {node_id}")
-                print(f"Possible destinations: {edge_destinations}")
-
                 graph_builder.add_conditional_edges(
                     node_id, node_router, edge_destinations
                 )
 
-        # Find the initial node (usually the start-node)
-        entry_point = None
-        for node in nodes:
-            if node.get("type") == "start-node":
-                entry_point = node.get("id")
-                break
+        # Find the initial node (usually the start-node), unless resuming
+        if entry_point not in node_specific_functions:
+            entry_point = None
+            for node in nodes:
+                if node.get("type") == "start-node":
+                    entry_point = node.get("id")
+                    break
 
         # If there is no start-node, use the first node found
         if not entry_point and nodes:
@@ -828,7 +990,6 @@ class WorkflowAgent(BaseAgent):
 
         # Define the entry point
         if entry_point:
-            print(f"Defining entry point: {entry_point}")
             graph_builder.set_entry_point(entry_point)
 
         # Compile the graph
@@ -838,23 +999,63 @@ class WorkflowAgent(BaseAgent):
         self, ctx: InvocationContext
     ) -> AsyncGenerator[Event, None]:
         """Implementation of the workflow agent executing the defined workflow and returning results."""
-        try:
-            user_message = await self._extract_user_message(ctx)
-            session_id = self._get_session_id(ctx)
-            graph = await self._create_graph(ctx, self.flow_json)
-            initial_state = await self._prepare_initial_state(
-                ctx, user_message, session_id
+        run = WorkflowRun(
+            trace=WorkflowTraceRecorder(
+                self.name,
+                attributes={
+                    "workflow.session_id": self._get_session_id(ctx),
+                    "workflow.resumed": bool(self.resume_checkpoint),
+                },
             )
+            if self.trace_enabled
+            else None
+        )
+        self.last_trace = None
+        error = None
+        try:
+            if self.resume_checkpoint:
+                initial_state = self._restore_checkpoint_state(
+                    ctx, self.resume_checkpoint
+                )
+                graph = await self._create_graph(
+                    ctx,
+                    self.flow_json,
+                    self.resume_checkpoint.get("resume_node_id"),
+                    run,
+                )
+
+                logger.info(
+                    f"Resuming workflow {self.name} at node {self.resume_checkpoint.get('resume_node_id')}"
+                )
+            else:
+                user_message = await self._extract_user_message(ctx)
+                session_id = self._get_session_id(ctx)
+                graph = await self._create_graph(ctx, self.flow_json, run=run)
+                initial_state = await self._prepare_initial_state(
+                    ctx, user_message, session_id
+                )
 
-            print("\n🚀 Starting workflow execution:")
-            print(f"Initial content: {user_message[:100]}...")
+                logger.info(f"Starting workflow {self.name}")
 
             # Iterar sobre o AsyncGenerator em vez de usar await
-            async for event in self._execute_workflow(ctx, graph, initial_state):
+            async for event in self._execute_workflow(
+                ctx, graph, initial_state, run
+            ):
                 yield event
 
         except Exception as e:
+            error = e
             yield await self._handle_workflow_error(e)
+        finally:
+            await run.close()
+            if run.trace is not None:
+                if error is not None:
+                    run.trace.finish("error", error)
+                elif run.status == "suspended":
+                    run.trace.finish("suspended")
+                else:
+                    run.trace.finish("completed")
+                self.last_trace = run.trace.to_dict()
 
     async def _extract_user_message(self, ctx: InvocationContext) -> str:
         """Extracts the user message from context session events or state."""
@@ -862,7 +1063,6 @@ class WorkflowAgent(BaseAgent):
         if ctx.session and hasattr(ctx.session, "events") and ctx.session.events:
             for event in reversed(ctx.session.events):
                 if event.author == "user" and event.content and event.content.parts:
-                    print("Message found in session events")
                     return event.content.parts[0].text
 
         # Try to find message in session state
@@ -900,19 +1100,95 @@ class WorkflowAgent(BaseAgent):
             conversation_history=conversation_history,
         )
 
+    def _restore_checkpoint_state(
+        self, ctx: InvocationContext, checkpoint: Dict[str, Any]
+    ) -> State:
+        """Rebuilds the workflow state saved by a suspended delay node."""
+        node_id = checkpoint.get("node_id")
+        node_outputs = deserialize_workflow_value(checkpoint.get("node_outputs", {}))
+
+        if node_id in node_outputs:
+            node_outputs[node_id]["delay_end_time"] = datetime.now().isoformat()
+            node_outputs[node_id]["delay_completed"] = True
+
+        return State(
+            content=deserialize_workflow_value(checkpoint.get("content", [])),
+            status="delay_completed",
+            session_id=checkpoint.get("session_id") or self._get_session_id(ctx),
+            cycle_count=checkpoint.get("cycle_count", 0),
+            node_outputs=node_outputs,
+            conversation_history=ctx.session.events,
+        )
+
     async def _execute_workflow(
-        self, ctx: InvocationContext, graph: StateGraph, initial_state: State
+        self,
+        ctx: InvocationContext,
+        graph: StateGraph,
+        initial_state: State,
+        run: WorkflowRun,
     ) -> AsyncGenerator[Event, None]:
-        """Executes the workflow graph and yields events."""
-        sent_events = 0
+        """Executes the workflow graph and yields events.
+
+        The graph runs in a background task; agent nodes forward their events
+        through run.event_queue as they are produced, and the remaining node
+        events are yielded when each LangGraph step completes.
+        """
+        # Content restored from a checkpoint was already delivered before suspending
+        sent_events = len(initial_state.get("content", []))
+        status = initial_state.get("status")
+        streamed_event_ids = set()
+
+        run.event_queue = asyncio.Queue()
+
+        async def run_graph():
+            try:
+                async for state in graph.astream(
+                    initial_state, {"recursion_limit": 100}
+                ):
+                    await run.event_queue.put(("state", state))
+            except Exception as e:
+                await run.event_queue.put(("error", e))
+            finally:
+                # Node agents were built in this task, so release them here
+                await run.close()
+                await run.event_queue.put(("done", None))
+
+        graph_task = asyncio.create_task(run_graph())
+        try:
+            while True:
+                kind, payload = await run.event_queue.get()
+
+                if kind == "event":
+                    streamed_event_ids.add(payload.id)
+                    yield payload
+                elif kind == "state":
+                    for node_state in payload.values():
+                        content = node_state.get("content", [])
+                        for event in content[sent_events:]:
+                            if (
+                                event.author != "user"
+                                and event.id not in streamed_event_ids
+                            ):
+                                yield event
+                        sent_events = len(content)
+                        status = node_state.get("status", status)
+                elif kind == "error":
+                    raise payload
+                else:
+                    break
+        finally:
+            if not graph_task.done():
+                graph_task.cancel()
+                try:
+                    await graph_task
+                except asyncio.CancelledError:
+                    pass
+
+        run.status = status
 
-        async for state in graph.astream(initial_state, {"recursion_limit": 100}):
-            for node_state in state.values():
-                content = node_state.get("content", [])
-                for event in content[sent_events:]:
-                    if event.author != "user":
-                        yield event
-                sent_events = len(content)
+        # Sub-agents run once the suspended workflow is resumed
+        if status == "suspended":
+            return
 
         # Execute sub-agents if any
         for sub_agent in self.sub_agents:
@@ -922,7 +1198,7 @@ class WorkflowAgent(BaseAgent):
     async def _handle_workflow_error(self, error: Exception) -> Event:
         """Creates an error event for workflow execution errors."""
         error_msg = f"Error executing the workflow agent: {str(error)}"
-        print(error_msg)
+        logger.error(error_msg)
         return Event(
             author=f"workflow-error:{self.name}",
             content=Content(
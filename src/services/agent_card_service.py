@@ -0,0 +1,217 @@
+"""
+┌──────────────────────────────────────────────────────────────────────────────┐
+│ @author: Eduardo Oliveira                                                     │
+│ @file: agent_card_service.py                                                 │
+│ Developed by: Eduardo Oliveira                                                │
+│ Creation date: October 19, 2026                                              │
+│ Contact: contato@evolution-api.com                                           │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @copyright © Falai 2025. All rights reserved.                        │
+│ Licensed under the Apache License, Version 2.0                               │
+│                                                                              │
+│ You may not use this file except in compliance with the License.             │
+│ You may obtain a copy of the License at                                      │
+│                                                                              │
+│    http://www.apache.org/licenses/LICENSE-2.0                                │
+│                                                                              │
+│ Unless required by applicable law or agreed to in writing, software          │
+│ distributed under the License is distributed on an "AS IS" BASIS,            │
+│ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.     │
+│ See the License for the specific language governing permissions and          │
+│ limitations under the License.                                               │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @important                                                                   │
+│ For any future changes to the code in this file, it is recommended to        │
+│ include, together with the modification, the information of the developer    │
+│ who changed it and the date of modification.                                 │
+└──────────────────────────────────────────────────────────────────────────────┘
+"""
+
+import hashlib
+import json
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple, Union
+
+from sqlalchemy.orm import Session
+
+from src.config.redis import get_redis_client
+from src.config.settings import settings
+from src.models.models import Agent
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+@dataclass(frozen=True)
+class RenderedAgentCard:
+    """Agent card serialized once, with the strong ETag of its body"""
+
+    body: bytes
+    etag: str
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        return json.loads(self.body)
+
+
+_cards: Dict[Tuple[str, bool], Tuple[RenderedAgentCard, float]] = {}
+
+
+def build_agent_card(agent: Agent, extended: bool = False) -> Dict[str, Any]:
+    """Build agent card following A2A specification."""
+    agent_id = str(agent.id)
+    capabilities = {
+        "streaming": True,
+        "pushNotifications": True,
+        "stateTransitionHistory": False,
+    }
+    if extended:
+        capabilities.update({"multiTurnConversations": True, "fileProcessing": True})
+
+    agent_card = {
+        "name": agent.name,
+        "description": agent.description or f"AI Agent {agent.name}",
+        "url": f"{settings.API_URL}/api/v1/a2a/{agent_id}",
+        "provider": {
+            "organization": "Evo AI Platform",
+            "url": settings.API_URL,
+        },
+        "version": "1.0.0",
+        "documentationUrl": f"{settings.API_URL}/docs",
+        "capabilities": capabilities,
+        "securitySchemes": {
+            "apiKey": {
+                "type": "apiKey",
+                "in": "header",
+                "name": "x-api-key",
+            }
+        },
+        "security": [{"apiKey": []}],
+        "defaultInputModes": ["text/plain", "application/json"],
+        "defaultOutputModes": ["text/plain", "application/json"],
+        "skills": [
+            {
+                "id": "general-assistance",
+                "name": "General AI Assistant",
+                "description": "Provides general AI assistance and task completion",
+                "tags": ["assistant", "general", "ai", "help"],
+                "examples": ["Help me with a task", "Answer my question"],
+                "inputModes": ["text"],
+                "outputModes": ["text"],
+            }
+        ],
+    }
+
+    if extended:
+        # Extended information available after authentication
+        agent_card["extended"] = {
+            "agent_id": agent_id,
+            "creation_date": agent.created_at.isoformat() if agent.created_at else None,
+            "available_endpoints": [
+                "message/send",
+                "message/stream",
+                "tasks/get",
+                "tasks/cancel",
+                "tasks/pushNotificationConfig/set",
+                "tasks/pushNotificationConfig/get",
+                "tasks/resubscribe",
+                "agent/authenticatedExtendedCard",
+            ],
+            "rate_limits": {"requests_per_minute": 100, "concurrent_tasks": 10},
+        }
+
+    return agent_card
+
+
+def render_agent_card(agent: Agent, extended: bool = False) -> RenderedAgentCard:
+    body = json.dumps(
+        build_agent_card(agent, extended), separators=(",", ":"), sort_keys=True
+    ).encode("utf-8")
+    return RenderedAgentCard(
+        body=body, etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    )
+
+
+def _redis_key(agent_id: str, extended: bool) -> str:
+    kind = "extended" if extended else "public"
+    return f"{settings.REDIS_KEY_PREFIX}agent_card:{kind}:{agent_id}"
+
+
+def _redis():
+    if not settings.A2A_AGENT_CARD_REDIS_CACHE_ENABLED:
+        return None
+    return get_redis_client()
+
+
+def get_rendered_agent_card(
+    db: Session, agent_id: Union[uuid.UUID, str], extended: bool = False
+) -> Optional[RenderedAgentCard]:
+    """Returns the cached card of an agent, rendering it on a miss.
+
+    Cards live in Redis when A2A_AGENT_CARD_REDIS_CACHE_ENABLED is set (so
+    invalidations reach every instance), otherwise in process memory.
+    """
+    key = (str(agent_id), extended)
+    client = _redis()
+
+    if client is not None:
+        try:
+            cached = client.hgetall(_redis_key(*key))
+            if cached:
+                return RenderedAgentCard(
+                    body=cached["body"].encode("utf-8"), etag=cached["etag"]
+                )
+        except Exception as e:
+            logger.warning(f"Error reading cached agent card {agent_id}: {str(e)}")
+    else:
+        cached = _cards.get(key)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+
+    # Import moved to inside the function to avoid circular import
+    from src.services.agent_service import get_agent
+
+    agent = get_agent(db, agent_id)
+    if not agent:
+        return None
+
+    card = render_agent_card(agent, extended)
+    if client is not None:
+        try:
+            redis_key = _redis_key(*key)
+            pipeline = client.pipeline()
+            pipeline.hset(
+                redis_key, mapping={"body": card.body.decode("utf-8"), "etag": card.etag}
+            )
+            pipeline.expire(redis_key, settings.A2A_AGENT_CARD_CACHE_TTL)
+            pipeline.execute()
+        except Exception as e:
+            logger.warning(f"Error caching agent card {agent_id}: {str(e)}")
+    else:
+        _cards[key] = (card, time.monotonic() + settings.A2A_AGENT_CARD_CACHE_TTL)
+
+    return card
+
+
+def invalidate_agent_card(agent_id: Union[uuid.UUID, str]) -> None:
+    """Drops the cached cards of an agent (call after updating or deleting it)"""
+    agent_id = str(agent_id)
+    for extended in (False, True):
+        _cards.pop((agent_id, extended), None)
+
+    client = _redis()
+    if client is not None:
+        try:
+            client.delete(_redis_key(agent_id, False), _redis_key(agent_id, True))
+        except Exception as e:
+            logger.warning(f"Error invalidating agent card {agent_id}: {str(e)}")
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Checks an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
@@ -27,13 +27,22 @@
 └──────────────────────────────────────────────────────────────────────────────┘
 """
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi import HTTPException, status
 from src.models.models import Agent, AgentFolder, ApiKey
 from src.schemas.schemas import AgentCreate
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Tuple, Union
+from src.config.settings import settings
 from src.services.mcp_server_service import get_mcp_server
+from src.services.agent_card_service import invalidate_agent_card
+from src.services.a2a_sdk_adapter import a2a_sdk_service
+from dataclasses import dataclass
+from datetime import datetime
+import json
+import time
 import uuid
 import logging
 import httpx
@@ -87,29 +96,105 @@ def validate_sub_agents(db: Session, sub_agents: List[Union[uuid.UUID, str]]) ->
     return True
 
 
+def _parse_agent_id(agent_id: Union[uuid.UUID, str]) -> Optional[uuid.UUID]:
+    # Convert to UUID if it's a string
+    if isinstance(agent_id, str):
+        try:
+            return uuid.UUID(agent_id)
+        except ValueError:
+            logger.warning(f"Invalid agent ID: {agent_id}")
+            return None
+    return agent_id
+
+
+def sanitize_agent_name(name: str) -> str:
+    """Replaces spaces and special characters in an agent name"""
+    return "".join(c if c.isalnum() or c == "_" else "_" for c in name)
+
+
+@dataclass(frozen=True)
+class AgentSnapshot:
+    """Read-only copy of an agent, safe to cache and share between requests.
+
+    The config is kept serialized; each access returns a fresh copy.
+    """
+
+    id: uuid.UUID
+    client_id: Optional[uuid.UUID]
+    name: str
+    role: Optional[str]
+    goal: Optional[str]
+    description: Optional[str]
+    type: str
+    model: Optional[str]
+    api_key_id: Optional[uuid.UUID]
+    instruction: Optional[str]
+    agent_card_url: Optional[str]
+    folder_id: Optional[uuid.UUID]
+    config_json: str
+    updated_at: Optional[datetime]
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        return json.loads(self.config_json)
+
+    @classmethod
+    def from_agent(cls, agent: Agent) -> "AgentSnapshot":
+        return cls(
+            id=agent.id,
+            client_id=agent.client_id,
+            name=agent.name,
+            role=agent.role,
+            goal=agent.goal,
+            description=agent.description,
+            type=agent.type,
+            model=agent.model,
+            api_key_id=agent.api_key_id,
+            instruction=agent.instruction,
+            agent_card_url=agent.agent_card_url,
+            folder_id=agent.folder_id,
+            config_json=json.dumps(agent.config or {}),
+            updated_at=agent.updated_at,
+        )
+
+
+_snapshots: Dict[str, Tuple[AgentSnapshot, float]] = {}
+
+
 def get_agent(db: Session, agent_id: Union[uuid.UUID, str]) -> Optional[Agent]:
     """Search for an agent by ID"""
     try:
-        # Convert to UUID if it's a string
-        if isinstance(agent_id, str):
-            try:
-                agent_id = uuid.UUID(agent_id)
-            except ValueError:
-                logger.warning(f"Invalid agent ID: {agent_id}")
-                return None
+        agent_id = _parse_agent_id(agent_id)
+        if agent_id is None:
+            return None
 
         agent = db.query(Agent).filter(Agent.id == agent_id).first()
         if not agent:
             logger.warning(f"Agent not found: {agent_id}")
             return None
 
-        # Sanitize agent name if it contains spaces or special characters
-        if agent.name and any(c for c in agent.name if not (c.isalnum() or c == "_")):
-            agent.name = "".join(
-                c if c.isalnum() or c == "_" else "_" for c in agent.name
-            )
-            # Update in database
-            db.commit()
+        return agent
+    except SQLAlchemyError as e:
+        logger.error(f"Error searching for agent {agent_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error searching for agent",
+        )
+
+
+async def get_agent_async(
+    db: AsyncSession, agent_id: Union[uuid.UUID, str]
+) -> Optional[Agent]:
+    """Search for an agent by ID without blocking the event loop"""
+    try:
+        agent_id = _parse_agent_id(agent_id)
+        if agent_id is None:
+            return None
+
+        agent = await db.scalar(select(Agent).where(Agent.id == agent_id))
+        if not agent:
+            logger.warning(f"Agent not found: {agent_id}")
+            return None
 
         return agent
     except SQLAlchemyError as e:
@@ -120,6 +205,86 @@ def get_agent(db: Session, agent_id: Union[uuid.UUID, str]) -> Optional[Agent]:
         )
 
 
+def _cached_snapshot(agent_id: str) -> Optional[AgentSnapshot]:
+    cached = _snapshots.get(agent_id)
+    if cached and cached[1] > time.monotonic():
+        return cached[0]
+    return None
+
+
+def _cache_snapshot(agent: Agent) -> AgentSnapshot:
+    snapshot = AgentSnapshot.from_agent(agent)
+    if settings.AGENT_SNAPSHOT_CACHE_TTL > 0:
+        _snapshots[str(agent.id)] = (
+            snapshot,
+            time.monotonic() + settings.AGENT_SNAPSHOT_CACHE_TTL,
+        )
+    return snapshot
+
+
+def _snapshot_version_query(snapshot: AgentSnapshot):
+    return select(Agent.id, Agent.updated_at).where(Agent.id == snapshot.id)
+
+
+def _is_current(snapshot: AgentSnapshot, row) -> bool:
+    """Whether the agent still exists and was not updated since the snapshot.
+
+    The cache is per process, so changes made through another instance are
+    only visible in the database.
+    """
+    if row is None:
+        invalidate_agent_snapshot(snapshot.id)
+        return False
+    return row.updated_at == snapshot.updated_at
+
+
+def get_agent_snapshot(
+    db: Session, agent_id: Union[uuid.UUID, str]
+) -> Optional[AgentSnapshot]:
+    """Returns the cached snapshot of an agent, loading it on a miss.
+
+    Cached snapshots are re-validated with a primary key lookup of the
+    agent's updated_at, so updates and deletions made by other instances are
+    seen immediately.
+    """
+    snapshot = _cached_snapshot(str(agent_id))
+    try:
+        if snapshot is not None and _is_current(
+            snapshot, db.execute(_snapshot_version_query(snapshot)).first()
+        ):
+            return snapshot
+    except SQLAlchemyError as e:
+        logger.error(f"Error validating cached agent {agent_id}: {str(e)}")
+
+    agent = get_agent(db, agent_id)
+    return _cache_snapshot(agent) if agent else None
+
+
+async def get_agent_snapshot_async(
+    db: AsyncSession, agent_id: Union[uuid.UUID, str]
+) -> Optional[AgentSnapshot]:
+    """Returns the cached snapshot of an agent, loading it on a miss.
+
+    Re-validated like get_agent_snapshot.
+    """
+    snapshot = _cached_snapshot(str(agent_id))
+    try:
+        if snapshot is not None and _is_current(
+            snapshot, (await db.execute(_snapshot_version_query(snapshot))).first()
+        ):
+            return snapshot
+    except SQLAlchemyError as e:
+        logger.error(f"Error validating cached agent {agent_id}: {str(e)}")
+
+    agent = await get_agent_async(db, agent_id)
+    return _cache_snapshot(agent) if agent else None
+
+
+def invalidate_agent_snapshot(agent_id: Union[uuid.UUID, str]) -> None:
+    """Drops the cached snapshot of an agent (call after updating or deleting it)"""
+    _snapshots.pop(str(agent_id), None)
+
+
 def get_agents_by_client(
     db: Session,
     client_id: uuid.UUID,
@@ -150,20 +315,7 @@ def get_agents_by_client(
             else:
                 query = query.order_by(Agent.created_at)
 
-        agents = query.offset(skip).limit(limit).all()
-
-        # Sanitize agent names if they contain spaces or special characters
-        for agent in agents:
-            if agent.name and any(
-                c for c in agent.name if not (c.isalnum() or c == "_")
-            ):
-                agent.name = "".join(
-                    c if c.isalnum() or c == "_" else "_" for c in agent.name
-                )
-                # Update in database
-                db.commit()
-
-        return agents
+        return query.offset(skip).limit(limit).all()
     except SQLAlchemyError as e:
         logger.error(f"Error searching for client agents {client_id}: {str(e)}")
         raise HTTPException(
@@ -199,9 +351,7 @@ async def create_agent(db: Session, agent: AgentCreate) -> Agent:
                 if not agent.name or agent.name.strip() == "":
                     # Sanitize name: remove spaces and special characters
                     card_name = agent_card.get("name", "Unknown Agent")
-                    sanitized_name = "".join(
-                        c if c.isalnum() or c == "_" else "_" for c in card_name
-                    )
+                    sanitized_name = sanitize_agent_name(card_name)
                     agent.name = sanitized_name
 
                 agent.description = agent_card.get("description", "")
@@ -440,6 +590,8 @@ async def create_agent(db: Session, agent: AgentCreate) -> Agent:
 
         # Create agent from the processed dictionary
         db_agent = Agent(**agent_dict)
+        if db_agent.name:
+            db_agent.name = sanitize_agent_name(db_agent.name)
 
         # Make one final check to ensure all nested objects are serializable
         # (especially nested UUIDs in config)
@@ -530,9 +682,7 @@ async def update_agent(
                 if "name" not in agent_data or not agent_data["name"].strip():
                     # Sanitize name: remove spaces and special characters
                     card_name = agent_card.get("name", "Unknown Agent")
-                    sanitized_name = "".join(
-                        c if c.isalnum() or c == "_" else "_" for c in card_name
-                    )
+                    sanitized_name = sanitize_agent_name(card_name)
                     agent_data["name"] = sanitized_name
                 agent_data["description"] = agent_card.get("description", "")
 
@@ -575,9 +725,7 @@ async def update_agent(
                 if "name" not in agent_data or not agent_data["name"].strip():
                     # Sanitize name: remove spaces and special characters
                     card_name = agent_card.get("name", "Unknown Agent")
-                    sanitized_name = "".join(
-                        c if c.isalnum() or c == "_" else "_" for c in card_name
-                    )
+                    sanitized_name = sanitize_agent_name(card_name)
                     agent_data["name"] = sanitized_name
                 agent_data["description"] = agent_card.get("description", "")
 
@@ -770,11 +918,17 @@ async def update_agent(
                 agent_data["config"] = {}
             agent_data["config"]["api_key"] = generate_api_key()
 
+        if agent_data.get("name"):
+            agent_data["name"] = sanitize_agent_name(agent_data["name"])
+
         for key, value in agent_data.items():
             setattr(agent, key, value)
 
         db.commit()
         db.refresh(agent)
+        invalidate_agent_snapshot(agent_id)
+        invalidate_agent_card(agent_id)
+        a2a_sdk_service.remove_server(agent_id)
         return agent
     except Exception as e:
         db.rollback()
@@ -791,6 +945,9 @@ def delete_agent(db: Session, agent_id: uuid.UUID) -> bool:
         # Actually delete the agent from the database
         db.delete(db_agent)
         db.commit()
+        invalidate_agent_snapshot(agent_id)
+        invalidate_agent_card(agent_id)
+        a2a_sdk_service.remove_server(agent_id)
         logger.info(f"Agent deleted successfully: {agent_id}")
         return True
     except SQLAlchemyError as e:
@@ -944,6 +1101,7 @@ def assign_agent_to_folder(
             agent.folder_id = None
             db.commit()
             db.refresh(agent)
+            invalidate_agent_snapshot(agent_id)
             logger.info(f"Agent removed from folder: {agent_id}")
             return agent
 
@@ -966,6 +1124,7 @@ def assign_agent_to_folder(
         agent.folder_id = folder_id
         db.commit()
         db.refresh(agent)
+        invalidate_agent_snapshot(agent_id)
         logger.info(f"Agent assigned to folder: {folder_id}")
         return agent
     except SQLAlchemyError as e:
@@ -29,7 +29,9 @@
 
 from src.models.models import ApiKey
 from src.utils.crypto import encrypt_api_key, decrypt_api_key
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi import HTTPException, status
 import uuid
@@ -138,6 +140,21 @@ def get_decrypted_api_key(db: Session, key_id: uuid.UUID) -> Optional[str]:
         return None
 
 
+async def get_decrypted_api_key_async(
+    db: AsyncSession, key_id: uuid.UUID
+) -> Optional[str]:
+    """Get the decrypted value of an API key without blocking the event loop"""
+    try:
+        key = await db.scalar(select(ApiKey).where(ApiKey.id == key_id))
+        if not key or not key.is_active:
+            logger.warning(f"API key {key_id} not found or inactive")
+            return None
+        return decrypt_api_key(key.encrypted_key)
+    except Exception as e:
+        logger.error(f"Error decrypting API key {key_id}: {str(e)}")
+        return None
+
+
 def update_api_key(
     db: Session,
     key_id: uuid.UUID,
@@ -34,7 +34,15 @@ import base64
 import copy
 from typing import Any, Dict, List, Optional, Union, Set
 
-from sqlalchemy import create_engine, Boolean, Text, ForeignKeyConstraint
+from sqlalchemy import (
+    create_engine,
+    or_,
+    select,
+    Boolean,
+    Text,
+    ForeignKeyConstraint,
+    Index,
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.ext.mutable import MutableDict
 from sqlalchemy.orm import (
@@ -49,8 +57,10 @@ from sqlalchemy.types import DateTime, PickleType, String
 from sqlalchemy.dialects import postgresql
 from sqlalchemy.types import TypeDecorator
 
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 
+from src.config.settings import settings
+from src.services.session_compaction_service import SUMMARY_AUTHOR
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -160,6 +170,13 @@ class StorageEvent(Base):
             ["sessions.app_name", "sessions.user_id", "sessions.id"],
             ondelete="CASCADE",
         ),
+        Index(
+            "idx_events_session_timestamp",
+            "app_name",
+            "user_id",
+            "session_id",
+            "timestamp",
+        ),
     )
 
     @property
@@ -257,6 +274,9 @@ class Session(BaseModel):
     events: List[Event] = []
     last_update_time: float
 
+    # Id of the last event known to be stored, so saves only insert the rest
+    _last_persisted_event_id: Optional[str] = PrivateAttr(default=None)
+
     class Config:
         arbitrary_types_allowed = True
 
@@ -349,15 +369,24 @@ class CrewSessionService:
         return session
 
     def get_session(
-        self, agent_id: str, external_id: str, session_id: str
+        self,
+        agent_id: str,
+        external_id: str,
+        session_id: str,
+        max_events: Optional[int] = None,
     ) -> Optional[Session]:
         """
         Retrieves a session from the database.
 
+        Only the events since the last compaction summary are loaded, at most
+        the last max_events of them.
+
         Args:
             agent_id: Agent ID
             external_id: User ID
             session_id: Session ID
+            max_events: Event window, CREW_SESSION_EVENT_WINDOW by default
+                (0 loads every event since the last summary)
 
         Returns:
             Optional[Session]: The retrieved session or None if not found
@@ -370,14 +399,33 @@ class CrewSessionService:
             if storage_session is None:
                 return None
 
-            # Fetch session events
-            storage_events = (
+            # Fetch the latest session events, newest first
+            if max_events is None:
+                max_events = settings.CREW_SESSION_EVENT_WINDOW
+            session_filter = (
+                StorageEvent.session_id == storage_session.id,
+                StorageEvent.app_name == agent_id,
+                StorageEvent.user_id == external_id,
+            )
+            last_summary_time = (
+                select(func.max(StorageEvent.timestamp))
+                .where(*session_filter, StorageEvent.author == SUMMARY_AUTHOR)
+                .scalar_subquery()
+            )
+            query = (
                 db_session.query(StorageEvent)
-                .filter(StorageEvent.session_id == storage_session.id)
-                .filter(StorageEvent.app_name == agent_id)
-                .filter(StorageEvent.user_id == external_id)
-                .all()
+                .filter(*session_filter)
+                .filter(
+                    or_(
+                        last_summary_time.is_(None),
+                        StorageEvent.timestamp >= last_summary_time,
+                    )
+                )
+                .order_by(StorageEvent.timestamp.desc(), StorageEvent.id.desc())
             )
+            if max_events > 0:
+                query = query.limit(max_events)
+            storage_events = list(reversed(query.all()))
 
             # Fetch states
             storage_app_state = db_session.get(StorageAppState, (agent_id))
@@ -421,6 +469,8 @@ class CrewSessionService:
                 )
                 for e in storage_events
             ]
+            if session.events:
+                session._last_persisted_event_id = session.events[-1].id
 
             return session
 
@@ -428,9 +478,15 @@ class CrewSessionService:
         """
         Saves a session to the database.
 
+        Only events after the last persisted one are written, in a single
+        INSERT ... ON CONFLICT DO NOTHING, and their state deltas are applied
+        in the same transaction.
+
         Args:
             session: The session to save
         """
+        new_events = _unsaved_events(session)
+
         with self.Session() as db_session:
             storage_session = db_session.get(
                 StorageSession, (session.app_name, session.user_id, session.id)
@@ -440,87 +496,40 @@ class CrewSessionService:
                 logger.error(f"Session not found: {session.id}")
                 return
 
-            # Check states
-            storage_app_state = db_session.get(StorageAppState, (session.app_name))
-            storage_user_state = db_session.get(
-                StorageUserState, (session.app_name, session.user_id)
-            )
-
-            # Extract state deltas
-            app_state_delta = {}
-            user_state_delta = {}
-            session_state_delta = {}
-
-            # Apply state deltas
-            if storage_app_state and app_state_delta:
-                storage_app_state.state.update(app_state_delta)
-
-            if storage_user_state and user_state_delta:
-                storage_user_state.state.update(user_state_delta)
-
-            storage_session.state.update(session_state_delta)
-
-            # Save new events
-            for event in session.events:
-                # Check if event already exists
-                existing_event = (
-                    (
-                        db_session.query(StorageEvent)
-                        .filter(StorageEvent.id == event.id)
-                        .filter(StorageEvent.app_name == session.app_name)
-                        .filter(StorageEvent.user_id == session.user_id)
-                        .filter(StorageEvent.session_id == session.id)
-                        .first()
+            if new_events:
+                rows = [_event_row(session, event) for event in new_events]
+                db_session.execute(
+                    postgresql.insert(StorageEvent)
+                    .values(rows)
+                    .on_conflict_do_nothing(
+                        index_elements=["id", "app_name", "user_id", "session_id"]
                     )
-                    if event.id
-                    else None
                 )
 
-                if existing_event:
-                    continue
-
-                # Generate ID for the event if it doesn't exist
-                if not event.id:
-                    event.id = str(uuid.uuid4())
-
-                # Create timestamp if it doesn't exist
-                if not event.timestamp:
-                    event.timestamp = datetime.now().timestamp()
-
-                # Create StorageEvent object
-                storage_event = StorageEvent(
-                    id=event.id,
-                    app_name=session.app_name,
-                    user_id=session.user_id,
-                    session_id=session.id,
-                    invocation_id=event.invocation_id or str(uuid.uuid4()),
-                    author=event.author,
-                    branch=event.branch,
-                    timestamp=datetime.fromtimestamp(event.timestamp),
-                    actions=event.actions or {},
-                    long_running_tool_ids=event.long_running_tool_ids or set(),
-                    grounding_metadata=event.grounding_metadata,
-                    partial=event.partial,
-                    turn_complete=event.turn_complete,
-                    error_code=event.error_code,
-                    error_message=event.error_message,
-                    interrupted=event.interrupted,
+                # Apply state deltas
+                state = {}
+                for event in new_events:
+                    state.update((event.actions or {}).get("state_delta") or {})
+                app_state_delta, user_state_delta, session_state_delta = (
+                    _extract_state_delta(state)
                 )
 
-                # Encode content, if it exists
-                if event.content:
-                    encoded_content = event.content.model_dump(exclude_none=True)
-                    # Solution for serialization issues with multimedia content
-                    for p in encoded_content.get("parts", []):
-                        if "inline_data" in p:
-                            p["inline_data"]["data"] = (
-                                base64.b64encode(p["inline_data"]["data"]).decode(
-                                    "utf-8"
-                                ),
-                            )
-                    storage_event.content = encoded_content
-
-                db_session.add(storage_event)
+                if app_state_delta:
+                    storage_app_state = db_session.get(
+                        StorageAppState, (session.app_name)
+                    )
+                    if storage_app_state:
+                        storage_app_state.state.update(app_state_delta)
+
+                if user_state_delta:
+                    storage_user_state = db_session.get(
+                        StorageUserState, (session.app_name, session.user_id)
+                    )
+                    if storage_user_state:
+                        storage_user_state.state.update(user_state_delta)
+
+                storage_session.state.update(session_state_delta)
+                storage_session.update_time = func.now()
 
             # Commit changes
             db_session.commit()
@@ -529,7 +538,10 @@ class CrewSessionService:
             db_session.refresh(storage_session)
             session.last_update_time = storage_session.update_time.timestamp()
 
-        logger.info(f"Session saved: {session.id} with {len(session.events)} events")
+        if new_events:
+            session._last_persisted_event_id = new_events[-1].id
+
+        logger.info(f"Session saved: {session.id} with {len(new_events)} new events")
 
     def list_sessions(self, agent_id: str, external_id: str) -> List[Dict[str, Any]]:
         """
@@ -625,6 +637,60 @@ def _merge_state(app_state, user_state, session_state):
     return merged_state
 
 
+def _unsaved_events(session: Session) -> List[Event]:
+    """Returns the events after the last persisted one, filling ids and timestamps."""
+    events = session.events
+    marker = session._last_persisted_event_id
+    if marker:
+        for index in range(len(events) - 1, -1, -1):
+            if events[index].id == marker:
+                events = events[index + 1 :]
+                break
+
+    for event in events:
+        if not event.id:
+            event.id = str(uuid.uuid4())
+        if not event.timestamp:
+            event.timestamp = datetime.now().timestamp()
+
+    return events
+
+
+def _event_row(session: Session, event: Event) -> Dict[str, Any]:
+    """Builds the events table row of an event."""
+    content = None
+    if event.content:
+        content = event.content.model_dump(exclude_none=True)
+        # Solution for serialization issues with multimedia content
+        for p in content.get("parts", []):
+            if "inline_data" in p:
+                p["inline_data"]["data"] = (
+                    base64.b64encode(p["inline_data"]["data"]).decode("utf-8"),
+                )
+
+    return {
+        "id": event.id,
+        "app_name": session.app_name,
+        "user_id": session.user_id,
+        "session_id": session.id,
+        "invocation_id": event.invocation_id or str(uuid.uuid4()),
+        "author": event.author,
+        "branch": event.branch,
+        "timestamp": datetime.fromtimestamp(event.timestamp),
+        "content": content,
+        "actions": event.actions or {},
+        "long_running_tool_ids_json": json.dumps(
+            list(event.long_running_tool_ids or set())
+        ),
+        "grounding_metadata": event.grounding_metadata,
+        "partial": event.partial,
+        "turn_complete": event.turn_complete,
+        "error_code": event.error_code,
+        "error_message": event.error_message,
+        "interrupted": event.interrupted,
+    }
+
+
 def _decode_content(content: Optional[dict[str, Any]]) -> Optional[Content]:
     """Decodes event content potentially with binary data."""
     if not content:
@@ -0,0 +1,569 @@
+"""
+┌──────────────────────────────────────────────────────────────────────────────┐
+│ @author: Eduardo Oliveira                                                     │
+│ @file: push_notification_service.py                                          │
+│ Developed by: Eduardo Oliveira                                                │
+│ Creation date: October 19, 2026                                              │
+│ Contact: contato@evolution-api.com                                           │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @copyright © Falai 2025. All rights reserved.                        │
+│ Licensed under the Apache License, Version 2.0                               │
+│                                                                              │
+│ You may not use this file except in compliance with the License.             │
+│ You may obtain a copy of the License at                                      │
+│                                                                              │
+│    http://www.apache.org/licenses/LICENSE-2.0                                │
+│                                                                              │
+│ Unless required by applicable law or agreed to in writing, software          │
+│ distributed under the License is distributed on an "AS IS" BASIS,            │
+│ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.     │
+│ See the License for the specific language governing permissions and          │
+│ limitations under the License.                                               │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @important                                                                   │
+│ For any future changes to the code in this file, it is recommended to        │
+│ include, together with the modification, the information of the developer    │
+│ who changed it and the date of modification.                                 │
+└──────────────────────────────────────────────────────────────────────────────┘
+"""
+
+import asyncio
+import json
+import random
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+import httpx
+from sqlalchemy import and_, exists, or_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, aliased
+
+from src.config.database import SessionLocal
+from src.config.settings import settings
+from src.models.models import PushNotificationDelivery
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+RETRYABLE_STATUS_CODES = {408, 425, 429}
+
+
+def build_push_notification_request(
+    push_notification_config: Dict[str, Any],
+) -> Tuple[str, Dict[str, str]]:
+    """Returns the webhook URL and headers for a push notification config.
+
+    A2A spec PushNotificationConfig object (section 9.5):
+    - url: The absolute HTTPS webhook URL where the A2A Server should POST task updates
+    - token (optional): Client-generated opaque token for validation
+    - authentication (optional): PushNotificationAuthenticationInfo for authenticating to client's webhook
+
+    Alternative formats supported for compatibility:
+    - webhookUrl instead of url
+    - webhookAuthenticationInfo instead of authentication
+
+    Raises:
+        ValueError: If the URL is missing or does not use HTTPS.
+    """
+    # Support both official spec format and common variations
+    webhook_url = push_notification_config.get("url") or push_notification_config.get(
+        "webhookUrl"
+    )
+    webhook_token = push_notification_config.get("token")
+
+    # Support both official and alternative authentication field names
+    authentication = push_notification_config.get(
+        "authentication"
+    ) or push_notification_config.get("webhookAuthenticationInfo")
+
+    if not webhook_url:
+        raise ValueError("pushNotificationConfig.url (or webhookUrl) is required")
+
+    # Validate HTTPS requirement (A2A spec: url MUST be HTTPS for security to prevent SSRF)
+    if not webhook_url.startswith("https://"):
+        raise ValueError(
+            "pushNotificationConfig.url MUST use HTTPS to prevent SSRF attacks"
+        )
+
+    headers = {
+        "Content-Type": "application/json",
+        "User-Agent": f"A2A-Server/{getattr(settings, 'API_VERSION', '1.0.0')}",
+    }
+
+    # Add client token if provided (A2A spec: server SHOULD include in X-A2A-Notification-Token header)
+    if webhook_token:
+        headers["X-A2A-Notification-Token"] = webhook_token
+
+    if not authentication:
+        return webhook_url, headers
+
+    # Handle authentication according to A2A spec PushNotificationAuthenticationInfo
+    auth_type = authentication.get("type")
+
+    # Handle "none" type (no authentication)
+    if auth_type == "none":
+        pass
+
+    # Handle schemes-based authentication (official A2A spec format)
+    elif "schemes" in authentication:
+        auth_schemes = authentication.get("schemes", [])
+        auth_credentials = authentication.get("credentials")
+
+        for scheme in auth_schemes:
+            if scheme.lower() == "bearer":
+                if auth_credentials:
+                    headers["Authorization"] = f"Bearer {auth_credentials}"
+                else:
+                    logger.warning("Bearer scheme specified but no credentials provided")
+
+            elif scheme.lower() == "apikey":
+                if not auth_credentials:
+                    logger.warning("ApiKey scheme specified but no credentials provided")
+                    continue
+                try:
+                    # A2A spec example: JSON like {"in": "header", "name": "X-Client-Webhook-Key", "value": "actual_key"}
+                    if isinstance(auth_credentials, str):
+                        cred_data = json.loads(auth_credentials)
+                    else:
+                        cred_data = auth_credentials
+
+                    if cred_data.get("in") == "header":
+                        header_name = cred_data.get("name", "X-API-Key")
+                        header_value = cred_data.get("value")
+                        if header_value:
+                            headers[header_name] = header_value
+                except (json.JSONDecodeError, TypeError, AttributeError):
+                    # Fallback: treat credentials as direct API key value
+                    headers["X-API-Key"] = str(auth_credentials)
+
+            else:
+                logger.warning(f"Unsupported authentication scheme: {scheme}")
+
+    # Handle basic authentication types
+    elif auth_type == "bearer":
+        token = authentication.get("token") or authentication.get("credentials")
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+
+    elif auth_type == "apikey":
+        api_key = (
+            authentication.get("apiKey")
+            or authentication.get("key")
+            or authentication.get("credentials")
+        )
+        header_name = authentication.get("headerName", "X-API-Key")
+        if api_key:
+            headers[header_name] = api_key
+
+    else:
+        logger.warning(f"Unsupported authentication type: {auth_type}")
+
+    return webhook_url, headers
+
+
+def enqueue_push_notification(
+    db: Session,
+    payload: Dict[str, Any],
+    push_notification_config: Dict[str, Any],
+    task_id: Optional[str] = None,
+) -> PushNotificationDelivery:
+    """Stores a notification for delivery by the dispatcher and wakes it up.
+
+    Raises:
+        ValueError: If the push notification config is invalid.
+    """
+    url, _ = build_push_notification_request(push_notification_config)
+
+    try:
+        delivery = PushNotificationDelivery(
+            task_id=task_id,
+            url=url,
+            push_notification_config=push_notification_config,
+            payload=payload,
+            status="pending",
+            attempts=0,
+            next_attempt_at=datetime.now(timezone.utc),
+        )
+        db.add(delivery)
+        db.commit()
+        db.refresh(delivery)
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Error enqueuing push notification: {str(e)}")
+        raise
+
+    push_notification_dispatcher.wake()
+    return delivery
+
+
+def claim_due_deliveries(db: Session, limit: int) -> List[uuid.UUID]:
+    """Marks due deliveries as delivering and returns their ids.
+
+    Deliveries stuck in delivering after the lease (the process died while
+    sending) are claimed again. Notifications of the same task go out in the
+    order they were queued: a delivery waits while an earlier one of its task
+    is still pending or delivering, so a retried "working" update never lands
+    after the "completed" one.
+    """
+    if limit <= 0:
+        return []
+
+    now = datetime.now(timezone.utc)
+    lease_expired = now - timedelta(seconds=settings.PUSH_NOTIFICATION_LEASE_SECONDS)
+    earlier = aliased(PushNotificationDelivery)
+    has_earlier_undelivered = exists().where(
+        earlier.task_id == PushNotificationDelivery.task_id,
+        earlier.created_at < PushNotificationDelivery.created_at,
+        earlier.status.in_(("pending", "delivering")),
+    )
+
+    try:
+        deliveries = (
+            db.query(PushNotificationDelivery)
+            .filter(
+                or_(
+                    and_(
+                        PushNotificationDelivery.status == "pending",
+                        PushNotificationDelivery.next_attempt_at <= now,
+                    ),
+                    and_(
+                        PushNotificationDelivery.status == "delivering",
+                        PushNotificationDelivery.updated_at <= lease_expired,
+                    ),
+                ),
+                ~has_earlier_undelivered,
+            )
+            .order_by(PushNotificationDelivery.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+        for delivery in deliveries:
+            delivery.status = "delivering"
+            delivery.attempts = (delivery.attempts or 0) + 1
+            delivery.updated_at = now
+
+        db.commit()
+        return [delivery.id for delivery in deliveries]
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Error claiming push notifications: {str(e)}")
+        return []
+
+
+def purge_finished_deliveries(db: Session) -> int:
+    """Deletes delivered and dead deliveries older than the retention period"""
+    if settings.PUSH_NOTIFICATION_RETENTION_DAYS <= 0:
+        return 0
+
+    cutoff = datetime.now(timezone.utc) - timedelta(
+        days=settings.PUSH_NOTIFICATION_RETENTION_DAYS
+    )
+    try:
+        deleted = (
+            db.query(PushNotificationDelivery)
+            .filter(
+                PushNotificationDelivery.status.in_(("delivered", "dead")),
+                PushNotificationDelivery.updated_at <= cutoff,
+            )
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        return deleted
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Error purging push notifications: {str(e)}")
+        return 0
+
+
+def _purge_finished_deliveries() -> int:
+    db = SessionLocal()
+    try:
+        return purge_finished_deliveries(db)
+    finally:
+        db.close()
+
+
+def _claim_due_deliveries(limit: int) -> List[uuid.UUID]:
+    db = SessionLocal()
+    try:
+        return claim_due_deliveries(db, limit)
+    finally:
+        db.close()
+
+
+def _load_delivery(delivery_id: uuid.UUID) -> Optional[PushNotificationDelivery]:
+    """Loads a delivery detached from its session, to be sent from the loop"""
+    db = SessionLocal()
+    try:
+        return (
+            db.query(PushNotificationDelivery)
+            .filter(PushNotificationDelivery.id == delivery_id)
+            .first()
+        )
+    finally:
+        db.close()
+
+
+def record_delivery_attempt(
+    db: Session,
+    delivery_id: uuid.UUID,
+    status_code: Optional[int],
+    error: Optional[str],
+    latency_ms: Optional[float],
+    retry_after: Optional[str],
+) -> Optional[str]:
+    """Stores the outcome of an attempt and returns the new delivery status"""
+    delivery = (
+        db.query(PushNotificationDelivery)
+        .filter(PushNotificationDelivery.id == delivery_id)
+        .first()
+    )
+    if not delivery:
+        return None
+
+    now = datetime.now(timezone.utc)
+    delivery.last_status_code = status_code
+    delivery.latency_ms = int(latency_ms) if latency_ms is not None else None
+    delivery.updated_at = now
+
+    retryable = status_code is None or (
+        status_code in RETRYABLE_STATUS_CODES or status_code >= 500
+    )
+
+    if error is None:
+        delivery.status = "delivered"
+        delivery.delivered_at = now
+        delivery.last_error = None
+    elif retryable and delivery.attempts < settings.PUSH_NOTIFICATION_MAX_ATTEMPTS:
+        delivery.status = "pending"
+        delivery.last_error = error
+        delivery.next_attempt_at = now + timedelta(
+            seconds=_retry_delay(delivery.attempts, retry_after)
+        )
+        logger.warning(
+            f"Push notification {delivery.id} to {delivery.url} failed (attempt {delivery.attempts}), retrying: {error}"
+        )
+    else:
+        delivery.status = "dead"
+        delivery.last_error = error
+        logger.error(
+            f"Push notification {delivery.id} to {delivery.url} moved to dead letters after {delivery.attempts} attempts: {error}"
+        )
+
+    new_status = delivery.status
+    try:
+        db.commit()
+        return new_status
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Error updating push notification {delivery_id}: {str(e)}")
+        return None
+
+
+def _record_delivery_attempt(*args) -> Optional[str]:
+    db = SessionLocal()
+    try:
+        return record_delivery_attempt(db, *args)
+    finally:
+        db.close()
+
+
+def _retry_delay(attempts: int, retry_after: Optional[str] = None) -> float:
+    """Exponential backoff with jitter, honoring Retry-After when it is longer"""
+    delay = min(
+        settings.PUSH_NOTIFICATION_BACKOFF_BASE * (2 ** max(attempts - 1, 0)),
+        settings.PUSH_NOTIFICATION_BACKOFF_MAX,
+    )
+    delay = delay * (0.5 + random.random() / 2)
+    if retry_after and retry_after.isdigit():
+        delay = max(delay, min(float(retry_after), settings.PUSH_NOTIFICATION_BACKOFF_MAX))
+    return delay
+
+
+class PushNotificationDispatcher:
+    """Background loop delivering queued push notifications.
+
+    Each destination host gets its own pooled HTTP client and a concurrency
+    limit, so a slow webhook only delays its own notifications.
+    """
+
+    def __init__(self):
+        self._loop_task: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._counters = {"delivered": 0, "retried": 0, "dead": 0, "purged": 0}
+        self._purged_at = 0.0
+        self._latencies: Deque[float] = deque(maxlen=1000)
+
+    def start(self):
+        """Starts the dispatch loop in the current event loop"""
+        if self._loop_task is None or self._loop_task.done():
+            self._wakeup = asyncio.Event()
+            self._loop_task = asyncio.create_task(self._run())
+            logger.info("Push notification dispatcher started")
+
+    async def stop(self):
+        """Stops the loop; deliveries in flight are retried after their lease"""
+        if self._loop_task:
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except asyncio.CancelledError:
+                pass
+            self._loop_task = None
+
+        for task in list(self._running):
+            task.cancel()
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+        logger.info("Push notification dispatcher stopped")
+
+    def wake(self):
+        """Signals the loop that a new notification was queued"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Delivery counters and latency of the recent deliveries (in ms)"""
+        latencies = sorted(self._latencies)
+        latency = {"count": len(latencies)}
+        if latencies:
+            latency.update(
+                {
+                    "p50": round(latencies[len(latencies) // 2], 1),
+                    "p95": round(latencies[int(len(latencies) * 0.95) - 1], 1)
+                    if len(latencies) >= 20
+                    else round(latencies[-1], 1),
+                    "max": round(latencies[-1], 1),
+                }
+            )
+        return {
+            **self._counters,
+            "in_flight": len(self._running),
+            "latency_ms": latency,
+        }
+
+    def _client_for(self, host: str) -> httpx.AsyncClient:
+        client = self._clients.get(host)
+        if client is None:
+            client = httpx.AsyncClient(
+                timeout=settings.PUSH_NOTIFICATION_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=settings.PUSH_NOTIFICATION_MAX_PER_HOST,
+                    max_keepalive_connections=settings.PUSH_NOTIFICATION_MAX_PER_HOST,
+                ),
+            )
+            self._clients[host] = client
+        return client
+
+    def _host_limit(self, host: str) -> asyncio.Semaphore:
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(
+                settings.PUSH_NOTIFICATION_MAX_PER_HOST
+            )
+        return self._host_limits[host]
+
+    async def _run(self):
+        while True:
+            try:
+                available = settings.PUSH_NOTIFICATION_MAX_CONCURRENCY - len(
+                    self._running
+                )
+                if available > 0:
+                    delivery_ids = await asyncio.to_thread(
+                        _claim_due_deliveries, available
+                    )
+
+                    for delivery_id in delivery_ids:
+                        task = asyncio.create_task(self._deliver(delivery_id))
+                        self._running.add(task)
+                        task.add_done_callback(self._running.discard)
+
+                if (
+                    time.monotonic() - self._purged_at
+                    >= settings.PUSH_NOTIFICATION_PURGE_INTERVAL
+                ):
+                    self._purged_at = time.monotonic()
+                    self._counters["purged"] += await asyncio.to_thread(
+                        _purge_finished_deliveries
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error polling push notifications: {str(e)}")
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), settings.PUSH_NOTIFICATION_POLL_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    async def _deliver(self, delivery_id: uuid.UUID):
+        """Sends one delivery; its database reads and writes run in a thread"""
+        try:
+            delivery = await asyncio.to_thread(_load_delivery, delivery_id)
+            if not delivery:
+                return
+
+            status_code = None
+            retry_after = None
+            error = None
+            latency_ms = None
+            try:
+                url, headers = build_push_notification_request(
+                    delivery.push_notification_config
+                )
+                host = urlparse(url).netloc
+                async with self._host_limit(host):
+                    started = time.monotonic()
+                    response = await self._client_for(host).post(
+                        url, headers=headers, json=delivery.payload
+                    )
+                    latency_ms = (time.monotonic() - started) * 1000
+                status_code = response.status_code
+                retry_after = response.headers.get("retry-after")
+                if not 200 <= status_code < 300:
+                    error = f"Webhook responded with status {status_code}: {response.text[:200]}"
+            except ValueError as e:
+                # Invalid config, retrying will not help
+                error = str(e)
+                status_code = 0
+            except httpx.HTTPError as e:
+                error = f"{type(e).__name__}: {str(e)}"
+
+            new_status = await asyncio.to_thread(
+                _record_delivery_attempt,
+                delivery_id,
+                status_code,
+                error,
+                latency_ms,
+                retry_after,
+            )
+            if new_status == "delivered":
+                self._counters["delivered"] += 1
+                self._latencies.append(latency_ms)
+            elif new_status == "pending":
+                self._counters["retried"] += 1
+            elif new_status == "dead":
+                self._counters["dead"] += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error delivering push notification {delivery_id}: {str(e)}")
+
+
+push_notification_dispatcher = PushNotificationDispatcher()
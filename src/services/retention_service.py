@@ -0,0 +1,315 @@
+"""
+┌──────────────────────────────────────────────────────────────────────────────┐
+│ @author: Eduardo Oliveira                                                     │
+│ @file: retention_service.py                                                  │
+│ Developed by: Eduardo Oliveira                                                │
+│ Creation date: October 19, 2026                                              │
+│ Contact: contato@evolution-api.com                                           │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @copyright © Falai 2025. All rights reserved.                        │
+│ Licensed under the Apache License, Version 2.0                               │
+│                                                                              │
+│ You may not use this file except in compliance with the License.             │
+│ You may obtain a copy of the License at                                      │
+│                                                                              │
+│    http://www.apache.org/licenses/LICENSE-2.0                                │
+│                                                                              │
+│ Unless required by applicable law or agreed to in writing, software          │
+│ distributed under the License is distributed on an "AS IS" BASIS,            │
+│ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.     │
+│ See the License for the specific language governing permissions and          │
+│ limitations under the License.                                               │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @important                                                                   │
+│ For any future changes to the code in this file, it is recommended to        │
+│ include, together with the modification, the information of the developer    │
+│ who changed it and the date of modification.                                 │
+└──────────────────────────────────────────────────────────────────────────────┘
+"""
+
+import asyncio
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import String, and_, cast, exists, func, or_, tuple_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, aliased
+
+from src.config.database import SessionLocal
+from src.config.settings import settings
+from src.models.models import (
+    A2AHistoryMessage,
+    Agent,
+    ArchivedSessionEvent,
+    RetentionPolicy,
+    Session as SessionModel,
+    SessionEvent,
+)
+from src.schemas.retention import RetentionPolicyCreate
+from src.services.session_compaction_service import serialize_event_actions
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+SessionKey = Tuple[str, str, str]
+
+
+def get_retention_policies(
+    db: Session, skip: int = 0, limit: int = 100
+) -> List[RetentionPolicy]:
+    return (
+        db.query(RetentionPolicy)
+        .order_by(RetentionPolicy.created_at)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+
+def upsert_retention_policy(
+    db: Session, policy_data: RetentionPolicyCreate
+) -> RetentionPolicy:
+    """Creates the policy of a client or agent, replacing the existing one"""
+    try:
+        scope = (
+            RetentionPolicy.agent_id == policy_data.agent_id
+            if policy_data.agent_id
+            else RetentionPolicy.client_id == policy_data.client_id
+        )
+        policy = db.query(RetentionPolicy).filter(scope).first()
+        if policy is None:
+            policy = RetentionPolicy(
+                client_id=policy_data.client_id, agent_id=policy_data.agent_id
+            )
+            db.add(policy)
+        policy.ttl_days = policy_data.ttl_days
+        policy.action = policy_data.action
+        db.commit()
+        db.refresh(policy)
+        return policy
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Error saving retention policy: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error saving retention policy",
+        )
+
+
+def delete_retention_policy(db: Session, policy_id: uuid.UUID) -> bool:
+    try:
+        deleted = (
+            db.query(RetentionPolicy).filter(RetentionPolicy.id == policy_id).delete()
+        )
+        db.commit()
+        return deleted > 0
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Error deleting retention policy {policy_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error deleting retention policy",
+        )
+
+
+def claim_expired_sessions(db: Session, limit: int) -> List[Tuple[SessionKey, str]]:
+    """Locks a batch of expired sessions and returns their keys and action.
+
+    The policy of a session's agent wins over the policy of its client, which
+    wins over the default. Sessions already archived are skipped.
+    """
+    agent_policy = aliased(RetentionPolicy)
+    client_policy = aliased(RetentionPolicy)
+    ttl_days = func.coalesce(
+        agent_policy.ttl_days,
+        client_policy.ttl_days,
+        settings.SESSION_RETENTION_DEFAULT_DAYS,
+    )
+    action = func.coalesce(
+        agent_policy.action,
+        client_policy.action,
+        settings.SESSION_RETENTION_DEFAULT_ACTION,
+    )
+    has_events = exists().where(
+        SessionEvent.app_name == SessionModel.app_name,
+        SessionEvent.user_id == SessionModel.user_id,
+        SessionEvent.session_id == SessionModel.id,
+    )
+
+    rows = (
+        db.query(SessionModel.app_name, SessionModel.user_id, SessionModel.id, action)
+        .outerjoin(Agent, SessionModel.app_name == cast(Agent.id, String))
+        .outerjoin(agent_policy, agent_policy.agent_id == Agent.id)
+        .outerjoin(
+            client_policy,
+            and_(
+                client_policy.client_id == Agent.client_id,
+                client_policy.agent_id.is_(None),
+            ),
+        )
+        .filter(
+            ttl_days > 0,
+            SessionModel.update_time
+            < func.now() - func.make_interval(0, 0, 0, ttl_days),
+            or_(action == "delete", has_events),
+        )
+        .order_by(SessionModel.update_time)
+        .limit(limit)
+        .with_for_update(of=SessionModel, skip_locked=True)
+        .all()
+    )
+    return [((row[0], row[1], row[2]), row[3]) for row in rows]
+
+
+def _delete_sessions(db: Session, keys: List[SessionKey]) -> int:
+    # Events and archived events are removed by their foreign keys
+    db.query(A2AHistoryMessage).filter(
+        tuple_(
+            A2AHistoryMessage.app_name,
+            A2AHistoryMessage.user_id,
+            A2AHistoryMessage.session_id,
+        ).in_(keys)
+    ).delete(synchronize_session=False)
+    return (
+        db.query(SessionModel)
+        .filter(
+            tuple_(SessionModel.app_name, SessionModel.user_id, SessionModel.id).in_(
+                keys
+            )
+        )
+        .delete(synchronize_session=False)
+    )
+
+
+def _archive_sessions(db: Session, keys: List[SessionKey]) -> int:
+    """Moves the events of sessions to archived_session_events"""
+    session_key = tuple_(
+        SessionEvent.app_name, SessionEvent.user_id, SessionEvent.session_id
+    )
+    events = db.query(SessionEvent).filter(session_key.in_(keys)).all()
+    db.add_all(
+        [
+            ArchivedSessionEvent(
+                app_name=event.app_name,
+                user_id=event.user_id,
+                session_id=event.session_id,
+                event_id=event.id,
+                invocation_id=event.invocation_id,
+                author=event.author,
+                timestamp=event.timestamp,
+                content=event.content,
+                actions=serialize_event_actions(event.actions),
+            )
+            for event in events
+        ]
+    )
+    db.query(SessionEvent).filter(session_key.in_(keys)).delete(
+        synchronize_session=False
+    )
+    return len(events)
+
+
+def sweep_expired_sessions(db: Session) -> Dict[str, int]:
+    """Deletes or archives expired sessions in batches of
+    SESSION_RETENTION_BATCH_SIZE, one transaction per batch"""
+    totals = {"sessions_deleted": 0, "sessions_archived": 0, "events_archived": 0}
+
+    for _ in range(settings.SESSION_RETENTION_MAX_BATCHES):
+        try:
+            batch = claim_expired_sessions(db, settings.SESSION_RETENTION_BATCH_SIZE)
+            if not batch:
+                db.rollback()
+                break
+
+            to_delete = [key for key, action in batch if action == "delete"]
+            to_archive = [key for key, action in batch if action == "archive"]
+            if to_delete:
+                totals["sessions_deleted"] += _delete_sessions(db, to_delete)
+            if to_archive:
+                totals["events_archived"] += _archive_sessions(db, to_archive)
+                totals["sessions_archived"] += len(to_archive)
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error(f"Error sweeping expired sessions: {str(e)}")
+            break
+
+        if len(batch) < settings.SESSION_RETENTION_BATCH_SIZE:
+            break
+
+    return totals
+
+
+def _run_sweep() -> Dict[str, int]:
+    db = SessionLocal()
+    try:
+        return sweep_expired_sessions(db)
+    finally:
+        db.close()
+
+
+class RetentionSweeper:
+    """Background loop applying the session retention policies"""
+
+    def __init__(self):
+        self._loop_task: Optional[asyncio.Task] = None
+        self._metrics: Dict[str, Any] = {
+            "sweeps": 0,
+            "sessions_deleted": 0,
+            "sessions_archived": 0,
+            "events_archived": 0,
+            "last_sweep_at": None,
+            "last_sweep_duration_seconds": None,
+            "last_sweep": None,
+        }
+
+    def start(self):
+        """Starts the sweep loop in the current event loop"""
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(self._run())
+            logger.info("Session retention sweeper started")
+
+    async def stop(self):
+        if self._loop_task:
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except asyncio.CancelledError:
+                pass
+            self._loop_task = None
+            logger.info("Session retention sweeper stopped")
+
+    async def sweep(self) -> Dict[str, int]:
+        """Runs one sweep off the event loop and records its metrics"""
+        started = time.monotonic()
+        result = await asyncio.to_thread(_run_sweep)
+        duration = time.monotonic() - started
+
+        self._metrics["sweeps"] += 1
+        for key, value in result.items():
+            self._metrics[key] += value
+        self._metrics["last_sweep_at"] = datetime.now(timezone.utc).isoformat()
+        self._metrics["last_sweep_duration_seconds"] = round(duration, 3)
+        self._metrics["last_sweep"] = result
+        logger.info(f"Session retention sweep finished in {duration:.2f}s: {result}")
+        return result
+
+    def metrics(self) -> Dict[str, Any]:
+        return dict(self._metrics)
+
+    async def _run(self):
+        while True:
+            try:
+                await self.sweep()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error running session retention sweep: {str(e)}")
+
+            await asyncio.sleep(settings.SESSION_RETENTION_SWEEP_INTERVAL)
+
+
+retention_sweeper = RetentionSweeper()
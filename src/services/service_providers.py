@@ -29,10 +29,11 @@
 
 import os
 from google.adk.artifacts.in_memory_artifact_service import InMemoryArtifactService
-from google.adk.sessions import DatabaseSessionService
 from google.adk.memory import InMemoryMemoryService
 from dotenv import load_dotenv
 
+from src.services.a2a_history_service import HistoryProjectingSessionService
+
 load_dotenv()
 
 # Import condicional para crewai (dependência opcional)
@@ -50,7 +51,8 @@ else:
     db_url = os.getenv("POSTGRES_CONNECTION_STRING", "")
     if db_url.startswith("postgresql://"):
         db_url = db_url.replace("postgresql://", "postgresql+asyncpg://")
-    session_service = DatabaseSessionService(
+    # Keeps the A2A conversation history projection in sync with the events
+    session_service = HistoryProjectingSessionService(
         db_url=db_url
     )
 
@@ -0,0 +1,361 @@
+"""
+┌──────────────────────────────────────────────────────────────────────────────┐
+│ @author: Eduardo Oliveira                                                     │
+│ @file: session_compaction_service.py                                         │
+│ Developed by: Eduardo Oliveira                                                │
+│ Creation date: October 19, 2026                                              │
+│ Contact: contato@evolution-api.com                                           │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @copyright © Falai 2025. All rights reserved.                        │
+│ Licensed under the Apache License, Version 2.0                               │
+│                                                                              │
+│ You may not use this file except in compliance with the License.             │
+│ You may obtain a copy of the License at                                      │
+│                                                                              │
+│    http://www.apache.org/licenses/LICENSE-2.0                                │
+│                                                                              │
+│ Unless required by applicable law or agreed to in writing, software          │
+│ distributed under the License is distributed on an "AS IS" BASIS,            │
+│ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.     │
+│ See the License for the specific language governing permissions and          │
+│ limitations under the License.                                               │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @important                                                                   │
+│ For any future changes to the code in this file, it is recommended to        │
+│ include, together with the modification, the information of the developer    │
+│ who changed it and the date of modification.                                 │
+└──────────────────────────────────────────────────────────────────────────────┘
+"""
+
+import asyncio
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from google.adk.events.event_actions import EventActions
+from google.adk.sessions import Session as SessionADK
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from src.config.database import SessionLocal
+from src.config.settings import settings
+from src.models.models import ArchivedSessionEvent, SessionEvent
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+SUMMARY_AUTHOR = "session_summary"
+
+SUMMARY_PROMPT = (
+    "You maintain the memory of a long conversation between a user and an AI "
+    "agent. Write a concise summary of the conversation below, keeping facts, "
+    "names, decisions, open questions and anything the agent promised to do. "
+    "If it starts with a previous summary, merge it into the new one. Answer "
+    "with the summary only."
+)
+
+
+def _part_text(part: Dict) -> str:
+    if part.get("text"):
+        return part["text"]
+    if part.get("function_call"):
+        return f"[called tool {part['function_call'].get('name')}]"
+    if part.get("function_response"):
+        return f"[result of tool {part['function_response'].get('name')}]"
+    if part.get("inline_data") or part.get("file_data"):
+        return "[attachment]"
+    return ""
+
+
+def event_text(content: Optional[Dict]) -> str:
+    """Plain text of a stored event content"""
+    if not content:
+        return ""
+    texts = [_part_text(part) for part in content.get("parts") or []]
+    return "\n".join(value for value in texts if value)
+
+
+def estimate_tokens(session: SessionADK) -> int:
+    """Rough token count of a session (4 characters per token)"""
+    characters = 0
+    for event in session.events or []:
+        if event.content and event.content.parts:
+            characters += sum(len(part.text or "") for part in event.content.parts)
+    return characters // 4
+
+
+def needs_compaction(session: SessionADK) -> bool:
+    events = session.events or []
+    if len(events) <= settings.SESSION_COMPACTION_KEEP_EVENTS:
+        return False
+    return (
+        len(events) > settings.SESSION_COMPACTION_MAX_EVENTS
+        or estimate_tokens(session) > settings.SESSION_COMPACTION_MAX_TOKENS
+    )
+
+
+def _compaction_split(events: List[SessionEvent]) -> int:
+    """Index of the first event to keep.
+
+    Keeps the last SESSION_COMPACTION_KEEP_EVENTS events, moved back to the
+    start of a user turn so tool calls are never separated from their results.
+    Returns 0 when there is nothing to compact.
+    """
+    keep = max(settings.SESSION_COMPACTION_KEEP_EVENTS, 1)
+    split = max(len(events) - keep, 0)
+    while split > 0 and events[split].author != "user":
+        split -= 1
+    return split
+
+
+def _transcript(events: List[SessionEvent]) -> List[str]:
+    lines = []
+    for event in events:
+        content = event_text(event.content)
+        if not content:
+            continue
+        if event.author == SUMMARY_AUTHOR:
+            lines.append(f"Previous summary:\n{content}")
+        else:
+            lines.append(f"{event.author}: {content}")
+    return lines
+
+
+def truncate_summary(events: List[SessionEvent]) -> str:
+    """Deterministic summary: the latest messages that fit in the size limit"""
+    max_chars = settings.SESSION_COMPACTION_SUMMARY_MAX_CHARS
+    kept: List[str] = []
+    size = 0
+    for line in reversed(_transcript(events)):
+        if size + len(line) > max_chars:
+            if not kept:
+                kept.append(line[-max_chars:])
+            break
+        kept.append(line)
+        size += len(line) + 1
+    return "\n".join(reversed(kept))
+
+
+async def llm_summary(events: List[SessionEvent]) -> str:
+    """Summary written by SESSION_COMPACTION_MODEL"""
+    import litellm
+
+    response = await litellm.acompletion(
+        model=settings.SESSION_COMPACTION_MODEL,
+        api_key=settings.SESSION_COMPACTION_API_KEY or None,
+        messages=[
+            {"role": "system", "content": SUMMARY_PROMPT},
+            {"role": "user", "content": "\n\n".join(_transcript(events))},
+        ],
+        max_tokens=max(settings.SESSION_COMPACTION_SUMMARY_MAX_CHARS // 4, 64),
+    )
+    return (response.choices[0].message.content or "").strip()
+
+
+async def summarize_events(events: List[SessionEvent]) -> str:
+    if settings.SESSION_COMPACTION_STRATEGY == "llm":
+        try:
+            summary = await llm_summary(events)
+            if summary:
+                return summary
+        except Exception as e:
+            logger.warning(f"LLM summary failed, truncating instead: {str(e)}")
+    return truncate_summary(events)
+
+
+def serialize_event_actions(actions) -> Optional[Dict]:
+    if hasattr(actions, "model_dump"):
+        return actions.model_dump(mode="json", exclude_none=True)
+    return actions
+
+
+def _try_lock(db: Session, session_id: str) -> bool:
+    """Transaction-scoped lock so one instance compacts a session at a time"""
+    return bool(
+        db.execute(
+            text("SELECT pg_try_advisory_xact_lock(hashtext(:key))"),
+            {"key": f"session_compaction:{session_id}"},
+        ).scalar()
+    )
+
+
+def _load_events(app_name: str, user_id: str, session_id: str) -> List[SessionEvent]:
+    """Reads the events of a session, in order, with a short-lived session"""
+    db = SessionLocal()
+    try:
+        return (
+            db.query(SessionEvent)
+            .filter(
+                SessionEvent.app_name == app_name,
+                SessionEvent.user_id == user_id,
+                SessionEvent.session_id == session_id,
+            )
+            .order_by(SessionEvent.timestamp, SessionEvent.id)
+            .all()
+        )
+    finally:
+        db.close()
+
+
+def _write_compaction(
+    app_name: str,
+    user_id: str,
+    session_id: str,
+    archived: List[SessionEvent],
+    summary: str,
+) -> Optional[str]:
+    """Archives the events and inserts the summary in one short transaction.
+
+    Returns the summary event id, or None when another instance holds the
+    lock or already compacted some of the events.
+    """
+    db = SessionLocal()
+    try:
+        if not _try_lock(db, session_id):
+            db.rollback()
+            return None
+
+        archived_ids = [event.id for event in archived]
+        still_there = (
+            db.query(SessionEvent.id)
+            .filter(
+                SessionEvent.app_name == app_name,
+                SessionEvent.user_id == user_id,
+                SessionEvent.session_id == session_id,
+                SessionEvent.id.in_(archived_ids),
+            )
+            .count()
+        )
+        if still_there != len(archived_ids):
+            db.rollback()
+            return None
+
+        summary_event_id = str(uuid.uuid4())
+        db.add_all(
+            [
+                ArchivedSessionEvent(
+                    app_name=app_name,
+                    user_id=user_id,
+                    session_id=session_id,
+                    event_id=event.id,
+                    invocation_id=event.invocation_id,
+                    author=event.author,
+                    timestamp=event.timestamp,
+                    content=event.content,
+                    actions=serialize_event_actions(event.actions),
+                    summary_event_id=summary_event_id,
+                )
+                for event in archived
+            ]
+        )
+        db.query(SessionEvent).filter(
+            SessionEvent.app_name == app_name,
+            SessionEvent.user_id == user_id,
+            SessionEvent.session_id == session_id,
+            SessionEvent.id.in_(archived_ids),
+        ).delete(synchronize_session=False)
+
+        # Takes the place of the archived events, so the ADK replays it first
+        db.add(
+            SessionEvent(
+                id=summary_event_id,
+                app_name=app_name,
+                user_id=user_id,
+                session_id=session_id,
+                invocation_id=f"compaction-{summary_event_id}",
+                author=SUMMARY_AUTHOR,
+                timestamp=archived[-1].timestamp,
+                content={
+                    "role": "model",
+                    "parts": [
+                        {"text": f"Summary of the earlier conversation:\n{summary}"}
+                    ],
+                },
+                actions=EventActions(),
+            )
+        )
+        db.commit()
+        return summary_event_id
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Error compacting session {session_id}: {str(e)}")
+        return None
+    finally:
+        db.close()
+
+
+async def compact_session(
+    app_name: str, user_id: str, session_id: str
+) -> Optional[Tuple[str, int]]:
+    """Replaces the older events of a session by a summary event.
+
+    The events are read and summarized without holding a connection; only
+    the final write takes the compaction lock, in a short transaction run in
+    a worker thread. The replaced events are moved to
+    archived_session_events. Returns the summary event id and the number of
+    archived events, or None if nothing was compacted.
+    """
+    try:
+        events = await asyncio.to_thread(_load_events, app_name, user_id, session_id)
+    except SQLAlchemyError as e:
+        logger.error(f"Error loading session {session_id} for compaction: {str(e)}")
+        return None
+
+    split = _compaction_split(events)
+    if split == 0:
+        return None
+
+    archived = events[:split]
+    summary = await summarize_events(archived)
+
+    summary_event_id = await asyncio.to_thread(
+        _write_compaction, app_name, user_id, session_id, archived, summary
+    )
+    if summary_event_id is None:
+        return None
+
+    logger.info(f"Compacted session {session_id}: {len(archived)} events archived")
+    return summary_event_id, len(archived)
+
+
+class SessionCompactor:
+    """Compacts sessions in the background after the runs that grow them"""
+
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def schedule(self, session: Optional[SessionADK]) -> bool:
+        """Schedules the compaction of a session if it is over the limits"""
+        if (
+            not settings.SESSION_COMPACTION_ENABLED
+            or session is None
+            or session.id in self._tasks
+            or not needs_compaction(session)
+        ):
+            return False
+
+        task = asyncio.get_running_loop().create_task(
+            self._compact(session.app_name, session.user_id, session.id)
+        )
+        self._tasks[session.id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(session.id, None))
+        return True
+
+    async def _compact(self, app_name: str, user_id: str, session_id: str):
+        try:
+            await compact_session(app_name, user_id, session_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error compacting session {session_id}: {str(e)}")
+
+    async def stop(self):
+        """Cancels the compactions in flight"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+session_compactor = SessionCompactor()
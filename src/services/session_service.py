@@ -28,16 +28,22 @@
 """
 
 from google.adk.sessions import DatabaseSessionService
+from google.adk.artifacts import BaseArtifactService
+from sqlalchemy import String, cast, tuple_
 from sqlalchemy.orm import Session
-from src.models.models import Session as SessionModel
+from src.config.settings import settings
+from src.models.models import Agent, Session as SessionModel, SessionEvent
 from google.adk.events import Event
 from google.adk.sessions import Session as SessionADK
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Tuple
 from fastapi import HTTPException, status
 from sqlalchemy.exc import SQLAlchemyError
+from urllib.parse import quote
 
-from src.services.agent_service import get_agents_by_client
-
+from datetime import datetime
+import base64
+import binascii
+import json
 import uuid
 import logging
 
@@ -61,16 +67,41 @@ def _session_to_dict(session: SessionModel):
 def get_sessions_by_client(
     db: Session,
     client_id: uuid.UUID,
-) -> List[dict]:
-    """Search for sessions of a client with pagination"""
+    skip: int = 0,
+    limit: int = 100,
+    agent_id: Optional[uuid.UUID] = None,
+    external_id: Optional[str] = None,
+    updated_after: Optional[datetime] = None,
+    updated_before: Optional[datetime] = None,
+) -> Tuple[List[dict], int]:
+    """Search for sessions of all agents of a client with pagination.
+
+    Returns the page (most recently updated first) and the total number of
+    sessions matching the filters.
+    """
     try:
-        agents_by_client = get_agents_by_client(db, client_id)
-        sessions = []
-        for agent in agents_by_client:
-            db_sessions = get_sessions_by_agent(db, agent.id)
-            sessions.extend(db_sessions)
+        query = (
+            db.query(SessionModel)
+            .join(Agent, SessionModel.app_name == cast(Agent.id, String))
+            .filter(Agent.client_id == client_id)
+        )
+        if agent_id is not None:
+            query = query.filter(SessionModel.app_name == str(agent_id))
+        if external_id:
+            query = query.filter(SessionModel.user_id == external_id)
+        if updated_after is not None:
+            query = query.filter(SessionModel.update_time >= updated_after)
+        if updated_before is not None:
+            query = query.filter(SessionModel.update_time < updated_before)
 
-        return sessions
+        total = query.count()
+        db_sessions = (
+            query.order_by(SessionModel.update_time.desc(), SessionModel.id)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+        return [_session_to_dict(session) for session in db_sessions], total
     except SQLAlchemyError as e:
         logger.error(f"Error searching for sessions of client {client_id}: {str(e)}")
         raise HTTPException(
@@ -90,7 +121,12 @@ def get_sessions_by_agent(
         agent_id_str = str(agent_id)
         query = db.query(SessionModel).filter(SessionModel.app_name == agent_id_str)
 
-        db_sessions = query.offset(skip).limit(limit).all()
+        db_sessions = (
+            query.order_by(SessionModel.update_time.desc(), SessionModel.id)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
         # Convert each session to dictionary with created_at field
         return [_session_to_dict(session) for session in db_sessions]
     except SQLAlchemyError as e:
@@ -197,3 +233,249 @@ async def get_session_events(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error searching for events of session: {str(e)}",
         )
+
+
+def parse_session_id(session_id: str) -> Tuple[str, str]:
+    """Splits a session ID into (user_id, app_name)"""
+    parts = session_id.split("_", 1) if session_id else []
+    if len(parts) != 2 or not all(parts):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid session ID format. Expected format: app_name_user_id",
+        )
+    return parts[0], parts[1]
+
+
+def get_session_record(db: Session, session_id: str) -> Optional[SessionModel]:
+    """Search for a session row by ID, without loading its events"""
+    user_id, app_name = parse_session_id(session_id)
+    return (
+        db.query(SessionModel)
+        .filter(
+            SessionModel.app_name == app_name,
+            SessionModel.user_id == user_id,
+            SessionModel.id == session_id,
+        )
+        .first()
+    )
+
+
+def encode_event_cursor(event: SessionEvent) -> str:
+    """Opaque keyset cursor (timestamp, id) of an event"""
+    raw = f"{event.timestamp.isoformat()}|{event.id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_event_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, event_id = raw.decode("utf-8").split("|", 1)
+        return datetime.fromisoformat(timestamp), event_id
+    except (ValueError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid cursor: {cursor}"
+        )
+
+
+def get_session_events_page(
+    db: Session,
+    session_id: str,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> Tuple[List[SessionEvent], Optional[str], Optional[str]]:
+    """Keyset page of the events of a session, in chronological order.
+
+    Without cursors the most recent events are returned. Returns the events,
+    the cursor of the previous (older) page if there is one and the cursor to
+    poll for newer events.
+    """
+    user_id, app_name = parse_session_id(session_id)
+    limit = min(
+        max(limit or settings.SESSION_MESSAGES_PAGE_SIZE, 1),
+        settings.SESSION_MESSAGES_MAX_PAGE_SIZE,
+    )
+    key = tuple_(SessionEvent.timestamp, SessionEvent.id)
+
+    try:
+        query = db.query(SessionEvent).filter(
+            SessionEvent.app_name == app_name,
+            SessionEvent.user_id == user_id,
+            SessionEvent.session_id == session_id,
+        )
+        if before:
+            query = query.filter(key < tuple_(*decode_event_cursor(before)))
+        if after:
+            query = query.filter(key > tuple_(*decode_event_cursor(after)))
+
+        if after:
+            events = (
+                query.order_by(SessionEvent.timestamp.asc(), SessionEvent.id.asc())
+                .limit(limit)
+                .all()
+            )
+            next_before = encode_event_cursor(events[0]) if events else None
+        else:
+            events = (
+                query.order_by(SessionEvent.timestamp.desc(), SessionEvent.id.desc())
+                .limit(limit + 1)
+                .all()
+            )
+            has_older = len(events) > limit
+            events = list(reversed(events[:limit]))
+            next_before = encode_event_cursor(events[0]) if has_older else None
+
+        next_after = encode_event_cursor(events[-1]) if events else after
+        return events, next_before, next_after
+    except SQLAlchemyError as e:
+        logger.error(f"Error searching for events of session {session_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error searching for events of session",
+        )
+
+
+def _inline_part_data(inline_data: Dict[str, Any]) -> str:
+    # Older ADK versions store the base64 string wrapped in a list
+    data = inline_data.get("data") or ""
+    if isinstance(data, list):
+        data = data[0] if data else ""
+    return data
+
+
+def _base64_size(data: str) -> int:
+    return len(data) * 3 // 4 - data.count("=", -2)
+
+
+def serialize_session_event(
+    event: SessionEvent,
+    artifacts_service: BaseArtifactService,
+    inline_artifacts: bool = False,
+) -> Dict[str, Any]:
+    """Converts a stored event to the dict returned by the messages API.
+
+    Binary parts and artifacts are replaced by download URLs; with
+    inline_artifacts, those up to SESSION_ARTIFACT_INLINE_MAX_BYTES are
+    returned as base64 instead.
+    """
+    session_url = (
+        f"{settings.API_URL}/api/v1/sessions/{quote(event.session_id, safe='')}"
+    )
+    max_inline = settings.SESSION_ARTIFACT_INLINE_MAX_BYTES
+
+    content = event.content
+    if isinstance(content, str):
+        content = json.loads(content)
+    for index, part in enumerate((content or {}).get("parts") or []):
+        inline_data = part.get("inline_data") if isinstance(part, dict) else None
+        if not inline_data or "data" not in inline_data:
+            continue
+        data = _inline_part_data(inline_data)
+        inline_data["size"] = _base64_size(data)
+        if inline_artifacts and inline_data["size"] <= max_inline:
+            inline_data["data"] = data
+        else:
+            del inline_data["data"]
+            inline_data["url"] = (
+                f"{session_url}/messages/{quote(event.id, safe='')}/parts/{index}"
+            )
+
+    actions = event.actions
+    if hasattr(actions, "model_dump"):
+        actions = actions.model_dump(mode="json", exclude_none=True)
+    actions = actions or {}
+
+    artifacts = {}
+    for filename, version in (actions.get("artifact_delta") or {}).items():
+        reference = {
+            "version": version,
+            "url": f"{session_url}/artifacts/{quote(filename, safe='')}?version={version}",
+        }
+        if inline_artifacts:
+            artifact = load_session_artifact(
+                artifacts_service, event.session_id, filename, version
+            )
+            if artifact and len(artifact[0]) <= max_inline:
+                reference["data"] = base64.b64encode(artifact[0]).decode("utf-8")
+                reference["mimeType"] = artifact[1]
+        artifacts[filename] = reference
+
+    result = {
+        "id": event.id,
+        "invocation_id": event.invocation_id,
+        "author": event.author,
+        "branch": event.branch,
+        "timestamp": event.timestamp.timestamp() if event.timestamp else None,
+        "content": content,
+        "actions": actions,
+        "long_running_tool_ids": (
+            json.loads(event.long_running_tool_ids_json)
+            if event.long_running_tool_ids_json
+            else None
+        ),
+        "grounding_metadata": event.grounding_metadata,
+        "partial": event.partial,
+        "turn_complete": event.turn_complete,
+        "error_code": event.error_code,
+        "error_message": event.error_message,
+        "interrupted": event.interrupted,
+    }
+    if artifacts:
+        result["artifacts"] = artifacts
+    return result
+
+
+def load_session_artifact(
+    artifacts_service: BaseArtifactService,
+    session_id: str,
+    filename: str,
+    version: Optional[int] = None,
+) -> Optional[Tuple[bytes, str]]:
+    """Returns (bytes, mime type) of a session artifact"""
+    user_id, app_name = parse_session_id(session_id)
+    try:
+        artifact = artifacts_service.load_artifact(
+            app_name=app_name,
+            user_id=user_id,
+            session_id=session_id,
+            filename=filename,
+            version=version,
+        )
+    except Exception as e:
+        logger.error(f"Error loading artifact {filename}: {str(e)}")
+        return None
+
+    if not artifact or not getattr(artifact, "inline_data", None):
+        return None
+    data = artifact.inline_data.data
+    if isinstance(data, str):
+        data = base64.b64decode(data)
+    return data, artifact.inline_data.mime_type or "application/octet-stream"
+
+
+def load_event_part(
+    db: Session, session_id: str, event_id: str, part_index: int
+) -> Optional[Tuple[bytes, str]]:
+    """Returns (bytes, mime type) of a binary part of a session event"""
+    user_id, app_name = parse_session_id(session_id)
+    content = (
+        db.query(SessionEvent.content)
+        .filter(
+            SessionEvent.app_name == app_name,
+            SessionEvent.user_id == user_id,
+            SessionEvent.session_id == session_id,
+            SessionEvent.id == event_id,
+        )
+        .scalar()
+    )
+    if isinstance(content, str):
+        content = json.loads(content)
+    parts = (content or {}).get("parts") or []
+    if part_index < 0 or part_index >= len(parts):
+        return None
+
+    inline_data = parts[part_index].get("inline_data")
+    if not inline_data or "data" not in inline_data:
+        return None
+    data = base64.b64decode(_inline_part_data(inline_data))
+    return data, inline_data.get("mime_type") or "application/octet-stream"
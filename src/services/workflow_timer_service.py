@@ -0,0 +1,412 @@
+"""
+┌──────────────────────────────────────────────────────────────────────────────┐
+│ @author: Eduardo Oliveira                                                     │
+│ @file: workflow_timer_service.py                                             │
+│ Developed by: Eduardo Oliveira                                                │
+│ Creation date: October 18, 2026                                              │
+│ Contact: contato@evolution-api.com                                           │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @copyright © Falai 2025. All rights reserved.                        │
+│ Licensed under the Apache License, Version 2.0                               │
+│                                                                              │
+│ You may not use this file except in compliance with the License.             │
+│ You may obtain a copy of the License at                                      │
+│                                                                              │
+│    http://www.apache.org/licenses/LICENSE-2.0                                │
+│                                                                              │
+│ Unless required by applicable law or agreed to in writing, software          │
+│ distributed under the License is distributed on an "AS IS" BASIS,            │
+│ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.     │
+│ See the License for the specific language governing permissions and          │
+│ limitations under the License.                                               │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @important                                                                   │
+│ For any future changes to the code in this file, it is recommended to        │
+│ include, together with the modification, the information of the developer    │
+│ who changed it and the date of modification.                                 │
+└──────────────────────────────────────────────────────────────────────────────┘
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set
+
+from google.adk.runners import Runner
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from src.config.database import SessionLocal
+from src.config.settings import settings
+from src.models.models import WorkflowTimer
+from src.services.agent_service import get_agent
+from src.services.push_notification_service import enqueue_push_notification
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def create_workflow_timer(
+    db: Session,
+    agent_id: uuid.UUID,
+    app_name: str,
+    user_id: str,
+    session_id: str,
+    node_id: str,
+    resume_node_id: str,
+    checkpoint: Dict[str, Any],
+    fire_at: datetime,
+    resume_message: Optional[str] = None,
+    push_notification_config: Optional[Dict[str, Any]] = None,
+) -> WorkflowTimer:
+    """Persists a durable timer for a suspended workflow"""
+    try:
+        timer = WorkflowTimer(
+            agent_id=agent_id,
+            app_name=app_name,
+            user_id=user_id,
+            session_id=session_id,
+            node_id=node_id,
+            resume_node_id=resume_node_id,
+            checkpoint=checkpoint,
+            fire_at=fire_at,
+            resume_message=resume_message,
+            push_notification_config=push_notification_config,
+            status="pending",
+            attempts=0,
+        )
+        db.add(timer)
+        db.commit()
+        db.refresh(timer)
+        logger.info(
+            f"Workflow timer {timer.id} registered for node {node_id}, firing at {fire_at.isoformat()}"
+        )
+        return timer
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Error registering workflow timer: {str(e)}")
+        raise
+
+
+def claim_due_timers(
+    db: Session, limit: int, exclude: Optional[Set[uuid.UUID]] = None
+) -> List[uuid.UUID]:
+    """Marks due timers as running and returns their ids.
+
+    Rows are locked with SKIP LOCKED so several API workers can poll the same
+    table without resuming a workflow twice. Running timers whose lease expired
+    (e.g. the process died mid-resume) are claimed again, except the ones in
+    exclude (already resuming in this process). Each claim bumps attempts,
+    which is the lease token checked by the heartbeat and by _finish_timer.
+    """
+    if limit <= 0:
+        return []
+
+    now = datetime.now(timezone.utc)
+    lease_expired = now - timedelta(seconds=settings.WORKFLOW_TIMER_LEASE_SECONDS)
+
+    try:
+        timers = (
+            db.query(WorkflowTimer)
+            .filter(
+                or_(
+                    and_(
+                        WorkflowTimer.status == "pending",
+                        WorkflowTimer.fire_at <= now,
+                    ),
+                    and_(
+                        WorkflowTimer.status == "running",
+                        WorkflowTimer.updated_at <= lease_expired,
+                    ),
+                ),
+                ~WorkflowTimer.id.in_(exclude or set()),
+            )
+            .order_by(WorkflowTimer.fire_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+        for timer in timers:
+            timer.status = "running"
+            timer.attempts = (timer.attempts or 0) + 1
+            timer.updated_at = now
+
+        db.commit()
+        return [timer.id for timer in timers]
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Error claiming workflow timers: {str(e)}")
+        return []
+
+
+def _lease_filter(timer_id: uuid.UUID, lease: int):
+    return and_(
+        WorkflowTimer.id == timer_id,
+        WorkflowTimer.status == "running",
+        WorkflowTimer.attempts == lease,
+    )
+
+
+def _renew_lease(timer_id: uuid.UUID, lease: int) -> bool:
+    """Pushes updated_at forward while the timer is still held with this lease"""
+    db = SessionLocal()
+    try:
+        renewed = (
+            db.query(WorkflowTimer)
+            .filter(_lease_filter(timer_id, lease))
+            .update(
+                {WorkflowTimer.updated_at: datetime.now(timezone.utc)},
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+        return bool(renewed)
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Error renewing workflow timer {timer_id}: {str(e)}")
+        return True
+    finally:
+        db.close()
+
+
+async def _heartbeat(timer_id: uuid.UUID, lease: int):
+    """Keeps the lease of a resuming timer alive, however long the run takes"""
+    interval = max(settings.WORKFLOW_TIMER_LEASE_SECONDS / 3, 1)
+    while True:
+        await asyncio.sleep(interval)
+        if not await asyncio.to_thread(_renew_lease, timer_id, lease):
+            logger.warning(f"Workflow timer {timer_id} lease lost")
+            return
+
+
+def _finish_timer(
+    db: Session, timer: WorkflowTimer, lease: int, error: Optional[str] = None
+) -> Optional[str]:
+    """Marks a timer as completed, or schedules a retry / fails it on error.
+
+    Only applies while the timer is still held with this lease. Returns the
+    new status, or None if the timer was claimed again in the meantime.
+    """
+    values: Dict[Any, Any] = {WorkflowTimer.updated_at: datetime.now(timezone.utc)}
+    if error is None:
+        new_status = "completed"
+        values[WorkflowTimer.last_error] = None
+    elif lease < settings.WORKFLOW_TIMER_MAX_ATTEMPTS:
+        new_status = "pending"
+        values[WorkflowTimer.last_error] = error
+        values[WorkflowTimer.fire_at] = datetime.now(timezone.utc) + timedelta(
+            seconds=settings.WORKFLOW_TIMER_POLL_INTERVAL * (2**lease)
+        )
+    else:
+        new_status = "failed"
+        values[WorkflowTimer.last_error] = error
+    values[WorkflowTimer.status] = new_status
+
+    try:
+        updated = (
+            db.query(WorkflowTimer)
+            .filter(_lease_filter(timer.id, lease))
+            .update(values, synchronize_session=False)
+        )
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Error updating workflow timer {timer.id}: {str(e)}")
+        return None
+
+    if not updated:
+        logger.warning(
+            f"Workflow timer {timer.id} was claimed again, dropping this run's result"
+        )
+        return None
+    return new_status
+
+
+def _deliver_push_notification(
+    db: Session, timer: WorkflowTimer, final_response: str, state: str
+):
+    """Queues a notification about the resumed run for the configured client"""
+    if not timer.push_notification_config:
+        return
+
+    # Report against the A2A task that registered the webhook when it is known
+    task_id = (timer.checkpoint or {}).get("a2a_task_id") or timer.session_id
+    task_response = {
+        "id": task_id,
+        "contextId": timer.user_id,
+        "status": {
+            "state": state,
+            "message": {
+                "role": "agent",
+                "parts": [{"type": "text", "text": final_response}],
+                "messageId": str(uuid.uuid4()),
+                "kind": "message",
+            },
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        },
+        "metadata": {"workflow_timer_id": str(timer.id)},
+        "kind": "task",
+    }
+
+    try:
+        enqueue_push_notification(
+            db, task_response, timer.push_notification_config, task_id=task_id
+        )
+    except Exception as e:
+        logger.error(
+            f"Error sending push notification for workflow timer {timer.id}: {str(e)}"
+        )
+
+
+async def resume_workflow_timer(timer_id: uuid.UUID) -> None:
+    """Resumes a suspended workflow from its checkpoint.
+
+    The workflow agent is rebuilt with the stored checkpoint and executed
+    through a Runner bound to the original session, so the events produced
+    after the delay are appended to the same conversation.
+    """
+    # Imports moved to inside the function to avoid circular import
+    from src.services.adk.agent_builder import AgentBuilder
+    from src.services.service_providers import (
+        session_service,
+        artifacts_service,
+        memory_service,
+    )
+
+    db = SessionLocal()
+    exit_stack = None
+    timer = None
+    heartbeat = None
+    try:
+        timer = db.query(WorkflowTimer).filter(WorkflowTimer.id == timer_id).first()
+        if not timer:
+            logger.warning(f"Workflow timer {timer_id} not found")
+            return
+        # The attempt number set by the claim identifies this run's lease
+        lease = timer.attempts
+        heartbeat = asyncio.create_task(_heartbeat(timer.id, lease))
+
+        agent = get_agent(db, timer.agent_id)
+        if not agent or agent.type != "workflow":
+            _finish_timer(
+                db, timer, lease, f"Workflow agent {timer.agent_id} not found"
+            )
+            return
+
+        logger.info(
+            f"Resuming workflow {agent.name} at node {timer.resume_node_id} (timer {timer.id})"
+        )
+
+        workflow_agent, exit_stack = await AgentBuilder(db).build_agent(agent)
+        workflow_agent.resume_checkpoint = {
+            **(timer.checkpoint or {}),
+            "node_id": timer.node_id,
+            "resume_node_id": timer.resume_node_id,
+        }
+
+        runner = Runner(
+            agent=workflow_agent,
+            app_name=timer.app_name,
+            session_service=session_service,
+            artifact_service=artifacts_service,
+            memory_service=memory_service,
+        )
+
+        # No new user turn: the workflow continues from its checkpoint
+        final_response = "Finished without specific response"
+        async for event in runner.run_async(
+            user_id=timer.user_id,
+            session_id=timer.session_id,
+            new_message=None,
+        ):
+            if event.content and event.content.parts and event.content.parts[0].text:
+                final_response = event.content.parts[0].text
+
+        if _finish_timer(db, timer, lease) == "completed":
+            _deliver_push_notification(db, timer, final_response, "completed")
+            logger.info(f"Workflow timer {timer.id} completed")
+
+    except Exception as e:
+        logger.error(f"Error resuming workflow timer {timer_id}: {str(e)}", exc_info=True)
+        if timer is not None:
+            if _finish_timer(db, timer, lease, str(e)) == "failed":
+                _deliver_push_notification(db, timer, str(e), "failed")
+    finally:
+        if heartbeat:
+            heartbeat.cancel()
+        if exit_stack:
+            try:
+                await exit_stack.aclose()
+            except Exception as e:
+                logger.error(f"Error closing MCP connection: {e}")
+        db.close()
+
+
+class WorkflowTimerWorker:
+    """Background loop that resumes workflows whose timers are due"""
+
+    def __init__(self):
+        self._loop_task: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()
+        self._in_flight: Set[uuid.UUID] = set()
+
+    def start(self):
+        """Starts the polling loop in the current event loop"""
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(self._run())
+            logger.info("Workflow timer worker started")
+
+    async def stop(self):
+        """Stops the polling loop; resumed workflows in flight are cancelled"""
+        if self._loop_task:
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except asyncio.CancelledError:
+                pass
+            self._loop_task = None
+
+        for task in list(self._running):
+            task.cancel()
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+        logger.info("Workflow timer worker stopped")
+
+    @staticmethod
+    def _claim(limit: int, exclude: Set[uuid.UUID]) -> List[uuid.UUID]:
+        db = SessionLocal()
+        try:
+            return claim_due_timers(db, limit, exclude)
+        finally:
+            db.close()
+
+    async def _run(self):
+        while True:
+            try:
+                available = settings.WORKFLOW_TIMER_MAX_CONCURRENCY - len(self._running)
+                if available > 0:
+                    timer_ids = await asyncio.to_thread(
+                        self._claim, available, set(self._in_flight)
+                    )
+
+                    for timer_id in timer_ids:
+                        task = asyncio.create_task(resume_workflow_timer(timer_id))
+                        self._running.add(task)
+                        self._in_flight.add(timer_id)
+                        task.add_done_callback(self._running.discard)
+                        task.add_done_callback(
+                            lambda _, timer_id=timer_id: self._in_flight.discard(
+                                timer_id
+                            )
+                        )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error polling workflow timers: {str(e)}")
+
+            await asyncio.sleep(settings.WORKFLOW_TIMER_POLL_INTERVAL)
+
+
+workflow_timer_worker = WorkflowTimerWorker()
@@ -37,13 +37,28 @@ automatically detecting and using the best available implementation.
 import logging
 import asyncio
 import json
-from typing import Dict, Any, Optional, AsyncIterator, Union, List
+import re
+import time
+from collections import deque
+from typing import (
+    Dict,
+    Any,
+    Optional,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Union,
+    List,
+    Tuple,
+)
 from uuid import uuid4, UUID
 from dataclasses import dataclass
 from enum import Enum
 
 import httpx
 
+from src.config.settings import settings
+
 try:
     from a2a.client import A2AClient as SDKClient
     from a2a.types import (
@@ -106,6 +121,83 @@ class A2AResponse:
     raw_response: Optional[Any] = None
 
 
+@dataclass
+class CachedEntry:
+    """Value cached by the A2A client registry."""
+
+    value: Any
+    expires_at: float
+    etag: Optional[str] = None
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+
+class RemoteStats:
+    """
+    Latency samples and circuit breaker state of one remote A2A base URL.
+
+    After A2A_CIRCUIT_FAILURE_THRESHOLD consecutive failures the circuit opens
+    and the remote is skipped for A2A_CIRCUIT_RESET_TIMEOUT seconds; the next
+    request after that is a trial that closes or reopens it.
+    """
+
+    def __init__(self):
+        self.latencies: Deque[float] = deque(maxlen=settings.A2A_LATENCY_WINDOW)
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.requests = 0
+        self.failures = 0
+
+    def record_success(self, latency: float):
+        self.requests += 1
+        self.latencies.append(latency)
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+
+    def record_failure(self):
+        self.requests += 1
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= settings.A2A_CIRCUIT_FAILURE_THRESHOLD:
+            self.open_until = time.monotonic() + settings.A2A_CIRCUIT_RESET_TIMEOUT
+
+    @property
+    def is_open(self) -> bool:
+        return time.monotonic() < self.open_until
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """Latency percentile in seconds, None until enough samples exist."""
+        if len(self.latencies) < max(settings.A2A_HEDGE_MIN_SAMPLES, 1):
+            return None
+        ordered = sorted(self.latencies)
+        index = round(percentile / 100 * (len(ordered) - 1))
+        return ordered[min(max(index, 0), len(ordered) - 1)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "circuit_open": self.is_open,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+        }
+
+
+def _cache_ttl(response: Optional[httpx.Response], default_ttl: int) -> int:
+    """Uses Cache-Control max-age from the response when present."""
+    if response is None:
+        return default_ttl
+    cache_control = response.headers.get("cache-control", "")
+    if "no-store" in cache_control or "no-cache" in cache_control:
+        return 0
+    match = re.search(r"max-age=(\d+)", cache_control)
+    if match:
+        return int(match.group(1))
+    return default_ttl
+
+
 class EnhancedA2AClient:
     """
     Enhanced A2A client that supports both custom implementation and official SDK.
@@ -114,12 +206,38 @@ class EnhancedA2AClient:
     and provides a unified interface for communication with A2A agents.
     """
 
-    def __init__(self, config: A2AClientConfig):
+    def __init__(
+        self,
+        config: A2AClientConfig,
+        httpx_client: Optional[httpx.AsyncClient] = None,
+        registry: Optional["A2AClientRegistry"] = None,
+    ):
         self.config = config
-        self.httpx_client = None
+        self.httpx_client = httpx_client
         self.sdk_client = None
         self.available_implementations = []
-        self._agent_cards_cache = {}
+        self._agent_cards_cache: Dict[str, CachedEntry] = {}
+        self._owns_httpx_client = httpx_client is None
+        self._registry = registry
+        self._initialized = False
+        # Shared by every client of the same remote when pooled by the registry
+        self.stats = (
+            registry.stats_for(config.base_url) if registry is not None else RemoteStats()
+        )
+        self._headers = {
+            "x-api-key": config.api_key,
+            "Content-Type": "application/json",
+        }
+        if config.custom_headers:
+            self._headers.update(config.custom_headers)
+
+    def _request_kwargs(self, headers: Optional[Dict[str, str]] = None, **kwargs):
+        """Per-request headers and timeout, so pooled HTTP clients can be shared."""
+        request_headers = dict(self._headers)
+        if headers:
+            request_headers.update(headers)
+        kwargs.setdefault("timeout", self.config.timeout)
+        return {"headers": request_headers, **kwargs}
 
     async def __aenter__(self):
         """Context manager entry."""
@@ -132,25 +250,33 @@ class EnhancedA2AClient:
 
     async def initialize(self):
         """Initialize the client and detect available implementations."""
-        # Initialize HTTP client
-        headers = {"x-api-key": self.config.api_key, "Content-Type": "application/json"}
-        if self.config.custom_headers:
-            headers.update(self.config.custom_headers)
+        if self._initialized:
+            return
 
-        self.httpx_client = httpx.AsyncClient(
-            timeout=self.config.timeout, headers=headers
-        )
+        # Initialize HTTP client, unless a pooled one was provided by the registry
+        if self.httpx_client is None:
+            self.httpx_client = httpx.AsyncClient(
+                timeout=self.config.timeout, headers=self._headers
+            )
+            self._owns_httpx_client = True
 
-        # Detect available implementations
-        await self._detect_available_implementations()
+        # Detect available implementations (cached per base URL by the registry)
+        if self._registry is not None:
+            self.available_implementations = (
+                await self._registry.get_available_implementations(self)
+            )
+        else:
+            await self._detect_available_implementations()
 
         # Initialize SDK client if available
         if A2AImplementation.SDK in self.available_implementations and SDK_AVAILABLE:
             await self._initialize_sdk_client()
 
+        self._initialized = True
+
     async def close(self):
-        """Close client resources."""
-        if self.httpx_client:
+        """Close client resources. Pooled HTTP clients are closed by the registry."""
+        if self.httpx_client and self._owns_httpx_client:
             await self.httpx_client.aclose()
 
         if self.sdk_client:
@@ -164,7 +290,9 @@ class EnhancedA2AClient:
         # Test custom implementation
         try:
             custom_health_url = f"{self.config.base_url}/api/v1/a2a/health"
-            response = await self.httpx_client.get(custom_health_url)
+            response = await self.httpx_client.get(
+                custom_health_url, **self._request_kwargs()
+            )
             if response.status_code == 200:
                 implementations.append(A2AImplementation.CUSTOM)
                 logger.info("Custom A2A implementation detected")
@@ -174,7 +302,9 @@ class EnhancedA2AClient:
         # Test SDK implementation
         try:
             sdk_health_url = f"{self.config.base_url}/api/v1/a2a-sdk/health"
-            response = await self.httpx_client.get(sdk_health_url)
+            response = await self.httpx_client.get(
+                sdk_health_url, **self._request_kwargs()
+            )
             if response.status_code == 200:
                 implementations.append(A2AImplementation.SDK)
                 logger.info("SDK A2A implementation detected")
@@ -233,26 +363,45 @@ class EnhancedA2AClient:
         Get agent card using the specified implementation or the best available.
         """
         agent_id_str = str(agent_id)
+        chosen_impl = self._choose_implementation(implementation)
 
-        # Check
-        cache_key = f"{agent_id_str}_{implementation}"
-        if cache_key in self._agent_cards_cache:
+        # Cards are shared process-wide when the client comes from the registry
+        cache = (
+            self._registry.agent_cards
+            if self._registry is not None
+            else self._agent_cards_cache
+        )
+        cache_key = f"{self.config.base_url}|{chosen_impl.value}|{agent_id_str}"
+        cached = cache.get(cache_key)
+        if cached and cached.is_fresh:
             logger.debug(f"Returning cached agent card for {agent_id_str}")
-            return self._agent_cards_cache[cache_key]
-
-        chosen_impl = self._choose_implementation(implementation)
+            return cached.value
 
         try:
+            # Revalidate a stale card with its ETag instead of downloading it again
+            etag = cached.etag if cached else None
             if chosen_impl == A2AImplementation.SDK:
-                response = await self._get_agent_card_sdk(agent_id_str)
+                response = await self._get_agent_card_sdk(agent_id_str, etag)
             else:
-                response = await self._get_agent_card_custom(agent_id_str)
+                response = await self._get_agent_card_custom(agent_id_str, etag)
+
+            raw = response.raw_response
+            ttl = _cache_ttl(raw, settings.A2A_CLIENT_CACHE_TTL)
+
+            if raw is not None and raw.status_code == 304 and cached:
+                logger.debug(f"Agent card for {agent_id_str} not modified")
+                cached.expires_at = time.monotonic() + ttl
+                return cached.value
 
             response.implementation_used = chosen_impl
 
             # Cache successful responses
             if response.success:
-                self._agent_cards_cache[cache_key] = response
+                cache[cache_key] = CachedEntry(
+                    value=response,
+                    expires_at=time.monotonic() + ttl,
+                    etag=raw.headers.get("etag") if raw is not None else None,
+                )
 
             return response
 
@@ -264,25 +413,32 @@ class EnhancedA2AClient:
                 implementation_used=chosen_impl,
             )
 
-    async def _get_agent_card_custom(self, agent_id: str) -> A2AResponse:
-        """Get agent card using custom implementation."""
-        url = f"{self.config.base_url}/api/v1/a2a/{agent_id}/.well-known/agent.json"
-
-        response = await self.httpx_client.get(url)
+    async def _fetch_agent_card(
+        self, url: str, etag: Optional[str] = None
+    ) -> A2AResponse:
+        """GETs an agent card, sending If-None-Match when an ETag is known."""
+        headers = {"If-None-Match": etag} if etag else None
+        response = await self.httpx_client.get(url, **self._request_kwargs(headers))
+        if response.status_code == 304:
+            return A2AResponse(success=True, data=None, raw_response=response)
         response.raise_for_status()
 
         data = response.json()
         return A2AResponse(success=True, data=data, raw_response=response)
 
-    async def _get_agent_card_sdk(self, agent_id: str) -> A2AResponse:
+    async def _get_agent_card_custom(
+        self, agent_id: str, etag: Optional[str] = None
+    ) -> A2AResponse:
+        """Get agent card using custom implementation."""
+        url = f"{self.config.base_url}/api/v1/a2a/{agent_id}/.well-known/agent.json"
+        return await self._fetch_agent_card(url, etag)
+
+    async def _get_agent_card_sdk(
+        self, agent_id: str, etag: Optional[str] = None
+    ) -> A2AResponse:
         """Get agent card using SDK implementation."""
         url = f"{self.config.base_url}/api/v1/a2a-sdk/{agent_id}/.well-known/agent.json"
-
-        response = await self.httpx_client.get(url)
-        response.raise_for_status()
-
-        data = response.json()
-        return A2AResponse(success=True, data=data, raw_response=response)
+        return await self._fetch_agent_card(url, etag)
 
     async def send_message(
         self,
@@ -299,6 +455,7 @@ class EnhancedA2AClient:
         session_id = session_id or str(uuid4())
 
         chosen_impl = self._choose_implementation(implementation)
+        started = time.monotonic()
 
         try:
             if chosen_impl == A2AImplementation.SDK:
@@ -311,9 +468,11 @@ class EnhancedA2AClient:
                 )
 
             response.implementation_used = chosen_impl
+            self.stats.record_success(time.monotonic() - started)
             return response
 
         except Exception as e:
+            self.stats.record_failure()
             logger.error(f"Error sending message with {chosen_impl.value}: {e}")
             return A2AResponse(
                 success=False,
@@ -352,7 +511,9 @@ class EnhancedA2AClient:
             },
         }
 
-        response = await self.httpx_client.post(url, json=request_data)
+        response = await self.httpx_client.post(
+            url, json=request_data, **self._request_kwargs()
+        )
         response.raise_for_status()
 
         data = response.json()
@@ -394,7 +555,9 @@ class EnhancedA2AClient:
             },
         }
 
-        response = await self.httpx_client.post(url, json=request_data)
+        response = await self.httpx_client.post(
+            url, json=request_data, **self._request_kwargs()
+        )
         response.raise_for_status()
 
         data = response.json()
@@ -415,22 +578,33 @@ class EnhancedA2AClient:
         session_id = session_id or str(uuid4())
 
         chosen_impl = self._choose_implementation(implementation)
+        # Latency of a stream is its time to first event
+        started = time.monotonic()
+        observed = False
 
         try:
             if chosen_impl == A2AImplementation.SDK:
-                async for response in self._send_message_streaming_sdk(
+                stream = self._send_message_streaming_sdk(
                     agent_id_str, message, session_id, metadata
-                ):
-                    response.implementation_used = chosen_impl
-                    yield response
+                )
             else:
-                async for response in self._send_message_streaming_custom(
+                stream = self._send_message_streaming_custom(
                     agent_id_str, message, session_id, metadata
-                ):
-                    response.implementation_used = chosen_impl
-                    yield response
+                )
+
+            async for response in stream:
+                response.implementation_used = chosen_impl
+                if not observed:
+                    observed = True
+                    if response.success:
+                        self.stats.record_success(time.monotonic() - started)
+                    else:
+                        self.stats.record_failure()
+                yield response
 
         except Exception as e:
+            if not observed:
+                self.stats.record_failure()
             logger.error(f"Error in streaming with {chosen_impl.value}: {e}")
             yield A2AResponse(
                 success=False,
@@ -470,7 +644,10 @@ class EnhancedA2AClient:
         }
 
         async with self.httpx_client.stream(
-            "POST", url, json=request_data, headers={"Accept": "text/event-stream"}
+            "POST",
+            url,
+            json=request_data,
+            **self._request_kwargs({"Accept": "text/event-stream"}),
         ) as response:
             response.raise_for_status()
 
@@ -518,7 +695,10 @@ class EnhancedA2AClient:
         }
 
         async with self.httpx_client.stream(
-            "POST", url, json=request_data, headers={"Accept": "text/event-stream"}
+            "POST",
+            url,
+            json=request_data,
+            **self._request_kwargs({"Accept": "text/event-stream"}),
         ) as response:
             response.raise_for_status()
 
@@ -599,7 +779,9 @@ class EnhancedA2AClient:
         # Test custom implementation
         try:
             custom_health_url = f"{self.config.base_url}/api/v1/a2a/health"
-            response = await self.httpx_client.get(custom_health_url)
+            response = await self.httpx_client.get(
+                custom_health_url, **self._request_kwargs()
+            )
             health["implementations_health"]["custom"] = {
                 "available": response.status_code == 200,
                 "status": response.status_code,
@@ -614,7 +796,9 @@ class EnhancedA2AClient:
         # Test SDK implementation
         try:
             sdk_health_url = f"{self.config.base_url}/api/v1/a2a-sdk/health"
-            response = await self.httpx_client.get(sdk_health_url)
+            response = await self.httpx_client.get(
+                sdk_health_url, **self._request_kwargs()
+            )
             health["implementations_health"]["sdk"] = {
                 "available": response.status_code == 200,
                 "status": response.status_code,
@@ -667,7 +851,9 @@ class EnhancedA2AClient:
                 health_url = f"{self.config.base_url}/api/v1/a2a/health"
 
             try:
-                response = await self.httpx_client.get(health_url, timeout=5.0)
+                response = await self.httpx_client.get(
+                    health_url, **self._request_kwargs(timeout=5.0)
+                )
                 if response.status_code == 200:
                     logger.info(f"✓ {impl.value} implementation is available")
                     return impl
@@ -683,6 +869,272 @@ class EnhancedA2AClient:
         return A2AImplementation.CUSTOM
 
 
+class A2AClientRegistry:
+    """
+    Process-wide registry of A2A clients.
+
+    Keeps one pooled httpx client per remote base URL and caches the
+    implementation detection and agent cards with a TTL, so A2A hops reuse
+    connections and skip the health/card round trips on every run.
+    """
+
+    def __init__(self):
+        self._http_clients: Dict[str, httpx.AsyncClient] = {}
+        self._clients: Dict[Tuple, EnhancedA2AClient] = {}
+        self._detections: Dict[str, CachedEntry] = {}
+        self.agent_cards: Dict[str, CachedEntry] = {}
+        self._stats: Dict[str, RemoteStats] = {}
+        self._lock = asyncio.Lock()
+
+    def stats_for(self, base_url: str) -> RemoteStats:
+        """Latency and circuit breaker state of a remote."""
+        stats = self._stats.get(base_url)
+        if stats is None:
+            stats = RemoteStats()
+            self._stats[base_url] = stats
+        return stats
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        return {base_url: stats.to_dict() for base_url, stats in self._stats.items()}
+
+    def _http_client_for(self, base_url: str) -> httpx.AsyncClient:
+        client = self._http_clients.get(base_url)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=settings.A2A_CLIENT_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=settings.A2A_CLIENT_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.A2A_CLIENT_MAX_KEEPALIVE,
+                ),
+            )
+            self._http_clients[base_url] = client
+        return client
+
+    async def get_client(self, config: A2AClientConfig) -> EnhancedA2AClient:
+        """Returns an initialized client sharing the pooled HTTP client of the remote."""
+        key = (
+            config.base_url,
+            config.api_key,
+            config.implementation,
+            config.timeout,
+            tuple(sorted((config.custom_headers or {}).items())),
+        )
+        async with self._lock:
+            client = self._clients.get(key)
+            if client is None or client.httpx_client.is_closed:
+                client = EnhancedA2AClient(
+                    config,
+                    httpx_client=self._http_client_for(config.base_url),
+                    registry=self,
+                )
+                self._clients[key] = client
+
+        await client.initialize()
+        return client
+
+    async def get_available_implementations(
+        self, client: EnhancedA2AClient
+    ) -> List[A2AImplementation]:
+        """Detection results are cached per base URL."""
+        base_url = client.config.base_url
+        cached = self._detections.get(base_url)
+        if cached and cached.is_fresh:
+            return list(cached.value)
+
+        await client._detect_available_implementations()
+        implementations = list(client.available_implementations)
+        # Failed detections are retried on the next run
+        if implementations:
+            self._detections[base_url] = CachedEntry(
+                value=implementations,
+                expires_at=time.monotonic() + settings.A2A_CLIENT_CACHE_TTL,
+            )
+        return implementations
+
+    def invalidate(self, base_url: Optional[str] = None):
+        """Drops cached detections and agent cards (for a remote or all)."""
+        if base_url is None:
+            self._detections.clear()
+            self.agent_cards.clear()
+            return
+        self._detections.pop(base_url, None)
+        for key in [k for k in self.agent_cards if k.startswith(f"{base_url}|")]:
+            self.agent_cards.pop(key, None)
+
+    async def aclose(self):
+        """Closes every pooled HTTP client."""
+        for client in self._http_clients.values():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing pooled A2A client: {e}")
+        self._http_clients.clear()
+        self._clients.clear()
+
+
+a2a_client_registry = A2AClientRegistry()
+
+
+async def get_shared_a2a_client(config: A2AClientConfig) -> EnhancedA2AClient:
+    """Returns a pooled client for the remote described by config."""
+    return await a2a_client_registry.get_client(config)
+
+
+@dataclass
+class A2ATarget:
+    """One replica of a remote agent: the client of its base URL and its agent id."""
+
+    client: EnhancedA2AClient
+    agent_id: str
+
+
+async def _hedged_responses(
+    targets: List[A2ATarget],
+    open_stream: Callable[[A2ATarget], AsyncIterator[A2AResponse]],
+    hedge_percentile: Optional[float] = None,
+) -> AsyncIterator[A2AResponse]:
+    """
+    Races the replicas of a remote agent for the first successful response.
+
+    Replicas whose circuit is open are skipped. The first available replica is
+    called; if it has not answered after its hedge_percentile latency, the
+    next replica is called too (once) and the slower one is cancelled. A
+    failed attempt fails over to the next replica. The winner's remaining
+    responses are then passed through.
+    """
+    if hedge_percentile is None:
+        hedge_percentile = settings.A2A_HEDGE_PERCENTILE
+
+    candidates = [target for target in targets if not target.client.stats.is_open]
+    if not candidates:
+        yield A2AResponse(
+            success=False, error="All A2A replicas are unavailable (circuit open)"
+        )
+        return
+
+    loop = asyncio.get_running_loop()
+    pending: Dict[asyncio.Future, Tuple[A2ATarget, AsyncIterator[A2AResponse]]] = {}
+    next_index = 0
+    hedged = False
+    hedge_at: Optional[float] = None
+    last_error: Optional[str] = None
+
+    def launch():
+        nonlocal next_index, hedge_at
+        target = candidates[next_index]
+        next_index += 1
+        stream = open_stream(target)
+        pending[asyncio.ensure_future(stream.__anext__())] = (target, stream)
+        delay = None
+        if hedge_percentile:
+            delay = target.client.stats.percentile(hedge_percentile)
+        hedge_at = loop.time() + delay if delay is not None else None
+
+    async def discard(attempt: asyncio.Future):
+        _, stream = pending.pop(attempt)
+        attempt.cancel()
+        await asyncio.gather(attempt, return_exceptions=True)
+        await stream.aclose()
+
+    launch()
+    winner = None
+    try:
+        while pending and winner is None:
+            timeout = None
+            if not hedged and hedge_at is not None and next_index < len(candidates):
+                timeout = max(hedge_at - loop.time(), 0)
+
+            done, _ = await asyncio.wait(
+                list(pending), timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                hedged = True
+                logger.info(
+                    f"Hedging A2A request to {candidates[next_index].client.config.base_url}"
+                )
+                launch()
+                continue
+
+            for attempt in done:
+                try:
+                    response = attempt.result()
+                except StopAsyncIteration:
+                    response = A2AResponse(success=False, error="Empty response")
+                except Exception as e:
+                    response = A2AResponse(success=False, error=str(e))
+
+                if response.success:
+                    winner = (attempt, response)
+                    break
+
+                last_error = response.error
+                await discard(attempt)
+                if next_index < len(candidates):
+                    launch()
+
+        if winner is None:
+            yield A2AResponse(success=False, error=last_error or "No replica answered")
+            return
+
+        attempt, response = winner
+        _, stream = pending.pop(attempt)
+        for loser in list(pending):
+            await discard(loser)
+
+        yield response
+        async for response in stream:
+            yield response
+    finally:
+        for attempt in list(pending):
+            await discard(attempt)
+
+
+async def send_message_hedged(
+    targets: List[A2ATarget],
+    message: str,
+    session_id: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+    hedge_percentile: Optional[float] = None,
+) -> A2AResponse:
+    """send_message against the replicas of a remote agent, with hedging and failover."""
+    session_id = session_id or str(uuid4())
+
+    async def open_stream(target: A2ATarget):
+        yield await target.client.send_message(
+            target.agent_id, message, session_id=session_id, metadata=metadata
+        )
+
+    responses = _hedged_responses(targets, open_stream, hedge_percentile)
+    try:
+        return await responses.__anext__()
+    finally:
+        await responses.aclose()
+
+
+async def send_message_streaming_hedged(
+    targets: List[A2ATarget],
+    message: str,
+    session_id: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+    hedge_percentile: Optional[float] = None,
+) -> AsyncIterator[A2AResponse]:
+    """send_message_streaming against the replicas of a remote agent, racing for
+    the first event."""
+    session_id = session_id or str(uuid4())
+
+    def open_stream(target: A2ATarget):
+        return target.client.send_message_streaming(
+            target.agent_id, message, session_id=session_id, metadata=metadata
+        )
+
+    responses = _hedged_responses(targets, open_stream, hedge_percentile)
+    try:
+        async for response in responses:
+            yield response
+    finally:
+        await responses.aclose()
+
+
 # Utility function to create client easily
 async def create_enhanced_a2a_client(
     base_url: str,
@@ -28,40 +28,140 @@
 """
 
 import asyncio
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Callable, Optional
 from fastapi import HTTPException
 
+from src.config.settings import settings
+from src.utils.logger import setup_logger
 
-class SSEUtils:
-    @staticmethod
-    async def with_timeout(
-        generator: AsyncGenerator, timeout: int = 30, retry_attempts: int = 3
-    ) -> AsyncGenerator:
-        """
-        Adds timeout and retry to an SSE event generator.
+logger = setup_logger(__name__)
 
-        Args:
-            generator: Event generator
-            timeout: Maximum wait time in seconds
-            retry_attempts: Number of reconnection attempts
+# What to do when a client reads slower than events are produced and the send
+# buffer is full: drop the oldest buffered event, or close the stream (clients
+# of replayable streams then resubscribe with Last-Event-ID)
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_CLOSE = "close"
+
+HEARTBEAT_EVENT = {"comment": "keep-alive"}
+
+_END = object()
+
+
+async def guard_event_stream(
+    source: AsyncGenerator,
+    idle_timeout: Optional[float] = None,
+    heartbeat_interval: Optional[float] = None,
+    max_buffer: Optional[int] = None,
+    overflow: Optional[str] = None,
+    on_abort: Optional[Callable[[], Any]] = None,
+) -> AsyncGenerator:
+    """
+    Wraps an SSE event generator with idle timeouts, heartbeats and backpressure.
+
+    The source is consumed by a separate task into a bounded buffer, so a slow
+    client never blocks the producer; when the buffer is full the overflow
+    policy applies. Heartbeat comments are sent while no event is available,
+    and the stream ends if the source stays silent for idle_timeout seconds.
+
+    When the stream ends before the source does (client disconnected, idle
+    timeout or overflow), the source is closed and on_abort is called, so the
+    caller can cancel the work feeding it.
+
+    Args:
+        source: Event generator
+        idle_timeout: Seconds without events before closing (0 disables)
+        heartbeat_interval: Seconds between heartbeat comments (0 disables)
+        max_buffer: Maximum number of events waiting to be sent
+        overflow: OVERFLOW_DROP_OLDEST or OVERFLOW_CLOSE
+        on_abort: Called when the stream ends before the source
+
+    Yields:
+        Events from the generator and heartbeat comments
+    """
+    if idle_timeout is None:
+        idle_timeout = settings.SSE_IDLE_TIMEOUT
+    if heartbeat_interval is None:
+        heartbeat_interval = settings.SSE_HEARTBEAT_INTERVAL
+    if max_buffer is None:
+        max_buffer = settings.SSE_MAX_BUFFERED_EVENTS
+    if overflow is None:
+        overflow = settings.SSE_OVERFLOW_POLICY
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_buffer)
+    state = {"failure": None, "overflowed": False, "dropped": 0}
+
+    async def produce():
+        try:
+            async for event in source:
+                if queue.full():
+                    if overflow == OVERFLOW_CLOSE:
+                        state["overflowed"] = True
+                        break
+                    queue.get_nowait()
+                    state["dropped"] += 1
+                queue.put_nowait(event)
+        except Exception as e:
+            state["failure"] = e
+        finally:
+            aclose = getattr(source, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+        if state["overflowed"]:
+            while not queue.empty():
+                queue.get_nowait()
+        await queue.put(_END)
+
+    producer = asyncio.create_task(produce())
+    completed = False
+    last_event_at = loop.time()
+
+    try:
+        while True:
+            wait = heartbeat_interval or None
+            if idle_timeout:
+                remaining = max(idle_timeout - (loop.time() - last_event_at), 0)
+                wait = min(wait, remaining) if wait else remaining
 
-        Yields:
-            Events from the generator
-        """
-        attempts = 0
-        while attempts < retry_attempts:
             try:
-                async for event in asyncio.wait_for(generator, timeout):
-                    yield event
-                break
+                item = await asyncio.wait_for(queue.get(), wait)
             except asyncio.TimeoutError:
-                attempts += 1
-                if attempts >= retry_attempts:
-                    raise HTTPException(
-                        status_code=408, detail="Timeout after multiple attempts"
+                if idle_timeout and loop.time() - last_event_at >= idle_timeout:
+                    logger.info(f"Closing SSE stream idle for {idle_timeout}s")
+                    return
+                yield HEARTBEAT_EVENT
+                continue
+
+            if item is _END:
+                if state["failure"] is not None:
+                    raise state["failure"]
+                if state["overflowed"]:
+                    logger.warning(
+                        f"Closing SSE stream of a slow consumer ({max_buffer} events buffered)"
                     )
-                await asyncio.sleep(1)  # Wait before trying again
+                    return
+                completed = True
+                return
+
+            last_event_at = loop.time()
+            yield item
+    finally:
+        if not producer.done():
+            producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+        if state["dropped"]:
+            logger.warning(
+                f"Dropped {state['dropped']} SSE events for a slow consumer"
+            )
+        if not completed and on_abort is not None:
+            try:
+                on_abort()
+            except Exception as e:
+                logger.error(f"Error aborting SSE stream source: {str(e)}")
 
+
+class SSEUtils:
     @staticmethod
     def format_error_event(error: Exception) -> str:
         """
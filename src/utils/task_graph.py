@@ -0,0 +1,51 @@
+"""
+┌──────────────────────────────────────────────────────────────────────────────┐
+│ @author: Eduardo Oliveira                                                     │
+│ @file: task_graph.py                                                         │
+│ Developed by: Eduardo Oliveira                                                │
+│ Creation date: October 19, 2026                                              │
+│ Contact: contato@evolution-api.com                                           │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @copyright © Falai 2025. All rights reserved.                        │
+│ Licensed under the Apache License, Version 2.0                               │
+│                                                                              │
+│ You may not use this file except in compliance with the License.             │
+│ You may obtain a copy of the License at                                      │
+│                                                                              │
+│    http://www.apache.org/licenses/LICENSE-2.0                                │
+│                                                                              │
+│ Unless required by applicable law or agreed to in writing, software          │
+│ distributed under the License is distributed on an "AS IS" BASIS,            │
+│ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.     │
+│ See the License for the specific language governing permissions and          │
+│ limitations under the License.                                               │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @important                                                                   │
+│ For any future changes to the code in this file, it is recommended to        │
+│ include, together with the modification, the information of the developer    │
+│ who changed it and the date of modification.                                 │
+└──────────────────────────────────────────────────────────────────────────────┘
+"""
+
+from typing import Dict, List
+
+
+def has_dependency_cycle(dependencies: Dict[str, List[str]]) -> bool:
+    """Checks whether a task graph (task id -> ids it depends on) has a cycle.
+
+    Uses Kahn's algorithm; every dependency must be a key of the mapping.
+    A dependency listed twice counts once.
+    """
+    remaining = {task_id: len(set(deps)) for task_id, deps in dependencies.items()}
+    ready = [task_id for task_id, count in remaining.items() if count == 0]
+    visited = 0
+    while ready:
+        current = ready.pop()
+        visited += 1
+        for task_id, deps in dependencies.items():
+            if current in deps:
+                remaining[task_id] -= 1
+                if remaining[task_id] == 0:
+                    ready.append(task_id)
+
+    return visited != len(dependencies)
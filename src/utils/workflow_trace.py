@@ -0,0 +1,217 @@
+"""
+┌──────────────────────────────────────────────────────────────────────────────┐
+│ @author: Eduardo Oliveira                                                     │
+│ @file: workflow_trace.py                                                     │
+│ Developed by: Eduardo Oliveira                                                │
+│ Creation date: October 18, 2026                                              │
+│ Contact: contato@evolution-api.com                                           │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @copyright © Falai 2025. All rights reserved.                        │
+│ Licensed under the Apache License, Version 2.0                               │
+│                                                                              │
+│ You may not use this file except in compliance with the License.             │
+│ You may obtain a copy of the License at                                      │
+│                                                                              │
+│    http://www.apache.org/licenses/LICENSE-2.0                                │
+│                                                                              │
+│ Unless required by applicable law or agreed to in writing, software          │
+│ distributed under the License is distributed on an "AS IS" BASIS,            │
+│ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.     │
+│ See the License for the specific language governing permissions and          │
+│ limitations under the License.                                               │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @important                                                                   │
+│ For any future changes to the code in this file, it is recommended to        │
+│ include, together with the modification, the information of the developer    │
+│ who changed it and the date of modification.                                 │
+└──────────────────────────────────────────────────────────────────────────────┘
+"""
+
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from opentelemetry import trace
+
+from src.utils.otel import get_tracer
+
+
+def _state_size(state: Optional[Dict[str, Any]]) -> Dict[str, int]:
+    """Cheap size metrics for a workflow state (no serialization)."""
+    if not state:
+        return {"content_events": 0, "content_chars": 0, "node_outputs": 0}
+
+    content = state.get("content") or []
+    content_chars = 0
+    for event in content:
+        parts = getattr(getattr(event, "content", None), "parts", None) or []
+        for part in parts:
+            text = getattr(part, "text", None)
+            if text:
+                content_chars += len(text)
+
+    return {
+        "content_events": len(content),
+        "content_chars": content_chars,
+        "node_outputs": len(state.get("node_outputs") or {}),
+    }
+
+
+class NodeTrace:
+    """Timing and size information for a single node visit."""
+
+    def __init__(self, node_id: str, node_type: str, span: trace.Span):
+        self.node_id = node_id
+        self.node_type = node_type
+        self.span = span
+        self.started_at = time.perf_counter()
+        self.wall_time_ms = 0.0
+        self.llm_time_ms = 0.0
+        self.tool_time_ms = 0.0
+        self.inner_events = 0
+        self.cycle = 0
+        self.status: Optional[str] = None
+        self.state_size_in: Dict[str, int] = {}
+        self.state_size_out: Dict[str, int] = {}
+        self._last_mark = self.started_at
+        self._waiting_tool = False
+
+    def record_inner_event(self, event: Any):
+        """Attributes the time since the previous inner event to LLM or tools.
+
+        Time elapsed after an event carrying function calls is spent running
+        tools; any other wait is spent on the model.
+        """
+        now = time.perf_counter()
+        elapsed_ms = (now - self._last_mark) * 1000
+        if self._waiting_tool:
+            self.tool_time_ms += elapsed_ms
+        else:
+            self.llm_time_ms += elapsed_ms
+        self._last_mark = now
+        self.inner_events += 1
+
+        get_calls = getattr(event, "get_function_calls", None)
+        self._waiting_tool = bool(get_calls()) if callable(get_calls) else False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "node_id": self.node_id,
+            "node_type": self.node_type,
+            "status": self.status,
+            "cycle": self.cycle,
+            "wall_time_ms": round(self.wall_time_ms, 2),
+            "llm_time_ms": round(self.llm_time_ms, 2),
+            "tool_time_ms": round(self.tool_time_ms, 2),
+            "inner_events": self.inner_events,
+            "state_size_in": self.state_size_in,
+            "state_size_out": self.state_size_out,
+        }
+
+
+class WorkflowTraceRecorder:
+    """Structured trace of a workflow run.
+
+    Every node visit becomes an OpenTelemetry child span of the workflow span,
+    and the collected data can be returned to the caller with to_dict().
+    """
+
+    def __init__(self, workflow_name: str, attributes: Optional[Dict[str, Any]] = None):
+        self.workflow_name = workflow_name
+        self.tracer = get_tracer()
+        self.span = self.tracer.start_span(
+            f"workflow {workflow_name}", attributes=attributes or {}
+        )
+        self.started_at = time.perf_counter()
+        self.started_at_iso = datetime.now().isoformat()
+        self.nodes: List[NodeTrace] = []
+        self.routes: List[Dict[str, Any]] = []
+        self.active: Dict[str, NodeTrace] = {}
+        self.status: Optional[str] = None
+        self.wall_time_ms = 0.0
+
+    def start_node(
+        self, node_id: str, node_type: str, state: Optional[Dict[str, Any]] = None
+    ) -> NodeTrace:
+        span = self.tracer.start_span(
+            f"workflow.node {node_type}",
+            context=trace.set_span_in_context(self.span),
+            attributes={"workflow.node_id": node_id, "workflow.node_type": node_type},
+        )
+        node_trace = NodeTrace(node_id, node_type, span)
+        node_trace.state_size_in = _state_size(state)
+        self.active[node_id] = node_trace
+        return node_trace
+
+    def finish_node(
+        self,
+        node_trace: NodeTrace,
+        state: Optional[Dict[str, Any]] = None,
+        error: Optional[BaseException] = None,
+    ):
+        node_trace.wall_time_ms = (time.perf_counter() - node_trace.started_at) * 1000
+        node_trace.state_size_out = _state_size(state)
+        if state:
+            node_trace.status = state.get("status")
+            node_trace.cycle = state.get("cycle_count", 0)
+        if error is not None:
+            node_trace.status = "error"
+            node_trace.span.record_exception(error)
+            node_trace.span.set_status(trace.Status(trace.StatusCode.ERROR, str(error)))
+
+        node_trace.span.set_attributes(
+            {
+                "workflow.node_status": node_trace.status or "",
+                "workflow.cycle": node_trace.cycle,
+                "workflow.wall_time_ms": node_trace.wall_time_ms,
+                "workflow.llm_time_ms": node_trace.llm_time_ms,
+                "workflow.tool_time_ms": node_trace.tool_time_ms,
+                "workflow.content_events": node_trace.state_size_out.get(
+                    "content_events", 0
+                ),
+            }
+        )
+        node_trace.span.end()
+
+        self.active.pop(node_trace.node_id, None)
+        self.nodes.append(node_trace)
+
+    def record_inner_event(self, node_id: str, event: Any):
+        node_trace = self.active.get(node_id)
+        if node_trace:
+            node_trace.record_inner_event(event)
+
+    def record_route(self, source: str, target: str, reason: str):
+        self.routes.append({"from": source, "to": target, "reason": reason})
+        self.span.add_event(
+            "workflow.route", {"from": source, "to": target, "reason": reason}
+        )
+
+    def finish(self, status: str, error: Optional[BaseException] = None):
+        if self.status is not None:
+            return
+        self.status = status
+        self.wall_time_ms = (time.perf_counter() - self.started_at) * 1000
+        if error is not None:
+            self.span.record_exception(error)
+            self.span.set_status(trace.Status(trace.StatusCode.ERROR, str(error)))
+        self.span.set_attributes(
+            {
+                "workflow.status": status,
+                "workflow.nodes_executed": len(self.nodes),
+                "workflow.wall_time_ms": self.wall_time_ms,
+            }
+        )
+        self.span.end()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "workflow": self.workflow_name,
+            "status": self.status,
+            "started_at": self.started_at_iso,
+            "wall_time_ms": round(self.wall_time_ms, 2),
+            "llm_time_ms": round(sum(n.llm_time_ms for n in self.nodes), 2),
+            "tool_time_ms": round(sum(n.tool_time_ms for n in self.nodes), 2),
+            "nodes": [node.to_dict() for node in self.nodes],
+            "routes": self.routes,
+        }
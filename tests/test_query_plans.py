@@ -0,0 +1,278 @@
+"""
+┌──────────────────────────────────────────────────────────────────────────────┐
+│ @author: Eduardo Oliveira                                                     │
+│ @file: test_query_plans.py                                                   │
+│ Developed by: Eduardo Oliveira                                                │
+│ Creation date: October 19, 2026                                              │
+│ Contact: contato@evolution-api.com                                           │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @copyright © Falai 2025. All rights reserved.                        │
+│ Licensed under the Apache License, Version 2.0                               │
+│                                                                              │
+│ You may not use this file except in compliance with the License.             │
+│ You may obtain a copy of the License at                                      │
+│                                                                              │
+│    http://www.apache.org/licenses/LICENSE-2.0                                │
+│                                                                              │
+│ Unless required by applicable law or agreed to in writing, software          │
+│ distributed under the License is distributed on an "AS IS" BASIS,            │
+│ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.     │
+│ See the License for the specific language governing permissions and          │
+│ limitations under the License.                                               │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @important                                                                   │
+│ For any future changes to the code in this file, it is recommended to        │
+│ include, together with the modification, the information of the developer    │
+│ who changed it and the date of modification.                                 │
+└──────────────────────────────────────────────────────────────────────────────┘
+
+Checks that the hot lookups of the services are served by indexes.
+
+Seeds a realistic volume of rows inside a transaction, runs ANALYZE and
+asserts through EXPLAIN that each query scans the index meant for it. The
+transaction is rolled back, so it can run against any migrated database.
+Skipped unless TEST_POSTGRES_CONNECTION_STRING points to one:
+
+    TEST_POSTGRES_CONNECTION_STRING=postgresql://... pytest tests/test_query_plans.py
+"""
+
+import json
+import os
+from typing import Any, Dict, List
+
+import pytest
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.dialects import postgresql
+
+from src.models.models import Agent, AgentFolder, ApiKey, AuditLog, Session, User
+
+DATABASE_URL = os.getenv("TEST_POSTGRES_CONNECTION_STRING")
+# Multiplier of the seeded volume
+SCALE = float(os.getenv("QUERY_PLAN_SCALE", 1.0))
+
+pytestmark = pytest.mark.skipif(
+    not DATABASE_URL, reason="TEST_POSTGRES_CONNECTION_STRING is not set"
+)
+
+INDEX_SCANS = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+
+SEED_STATEMENTS = [
+    """
+    INSERT INTO clients (id, name, email)
+    SELECT gen_random_uuid(), 'plan_client_' || n, 'plan_client_' || n || '@plans.test'
+    FROM generate_series(1, :clients) AS n
+    """,
+    """
+    INSERT INTO users (id, email, password_hash, language, client_id, is_active,
+                       verification_token, password_reset_token)
+    SELECT gen_random_uuid(), 'plan_user_' || n || '@plans.test', 'x', 'en',
+           (SELECT id FROM clients WHERE email LIKE '%@plans.test'
+            ORDER BY email OFFSET n % :clients LIMIT 1),
+           true,
+           CASE WHEN n % 100 = 0 THEN md5('verify' || n) END,
+           CASE WHEN n % 100 = 1 THEN md5('reset' || n) END
+    FROM generate_series(1, :users) AS n
+    """,
+    """
+    INSERT INTO agent_folders (id, client_id, name)
+    SELECT gen_random_uuid(), c.id, 'folder_' || n
+    FROM clients c, generate_series(1, :folders_per_client) AS n
+    WHERE c.email LIKE '%@plans.test'
+    """,
+    """
+    INSERT INTO agents (id, client_id, name, type, config, folder_id, created_at)
+    SELECT gen_random_uuid(), f.client_id, 'agent_' || n || '_' || f.name, 'llm',
+           '{}', f.id, now() - n * interval '1 minute'
+    FROM agent_folders f
+    JOIN clients c ON c.id = f.client_id AND c.email LIKE '%@plans.test',
+    generate_series(1, :agents_per_folder) AS n
+    """,
+    """
+    INSERT INTO api_keys (id, client_id, name, provider, encrypted_key, is_active)
+    SELECT gen_random_uuid(), c.id, 'key_' || n, 'openai', 'x', true
+    FROM clients c, generate_series(1, :keys_per_client) AS n
+    WHERE c.email LIKE '%@plans.test'
+    """,
+    """
+    INSERT INTO audit_logs (id, user_id, action, resource_type, resource_id,
+                            created_at)
+    SELECT gen_random_uuid(), u.id, 'update',
+           (ARRAY['agent', 'user', 'client', 'api_key', 'mcp_server'])[1 + n % 5],
+           n::text, now() - n * interval '1 second'
+    FROM users u,
+    generate_series(1, :logs_per_user) AS n
+    WHERE u.email LIKE '%@plans.test'
+    """,
+    """
+    INSERT INTO sessions (app_name, user_id, id, state, create_time, update_time)
+    SELECT a.id::text, 'plan_user_' || n, 'plan_user_' || n || '_' || a.id,
+           '{}', now(), now() - n * interval '1 minute'
+    FROM (SELECT a.id FROM agents a
+          JOIN clients c ON c.id = a.client_id AND c.email LIKE '%@plans.test'
+          LIMIT :session_agents) a,
+    generate_series(1, :sessions_per_agent) AS n
+    """,
+]
+
+
+HOT_QUERIES = {
+    "idx_agents_client_name": lambda ids: (
+        select(Agent)
+        .where(Agent.client_id == ids["client_id"])
+        .order_by(Agent.name)
+        .limit(100)
+    ),
+    "idx_agents_client_created_at": lambda ids: (
+        select(Agent)
+        .where(Agent.client_id == ids["client_id"])
+        .order_by(Agent.created_at.desc())
+        .limit(100)
+    ),
+    "idx_agents_folder_id": lambda ids: (
+        select(Agent)
+        .where(Agent.folder_id == ids["folder_id"])
+        .limit(100)
+    ),
+    "idx_agent_folders_client_name": lambda ids: (
+        select(AgentFolder)
+        .where(AgentFolder.client_id == ids["client_id"])
+        .limit(100)
+    ),
+    "idx_api_keys_client_name": lambda ids: (
+        select(ApiKey)
+        .where(ApiKey.client_id == ids["client_id"], ApiKey.is_active)
+        .order_by(ApiKey.name)
+        .limit(100)
+    ),
+    "idx_audit_logs_created_at": lambda ids: (
+        select(AuditLog)
+        .order_by(AuditLog.created_at.desc())
+        .limit(100)
+    ),
+    "idx_audit_logs_user_created_at": lambda ids: (
+        select(AuditLog)
+        .where(AuditLog.user_id == ids["user_id"])
+        .order_by(AuditLog.created_at.desc())
+        .limit(100)
+    ),
+    "idx_audit_logs_resource_created_at": lambda ids: (
+        select(AuditLog)
+        .where(AuditLog.resource_type == "mcp_server")
+        .order_by(AuditLog.created_at.desc())
+        .limit(100)
+    ),
+    "idx_users_verification_token": lambda ids: (
+        select(User)
+        .where(User.verification_token == ids["verification_token"])
+    ),
+    "idx_users_password_reset_token": lambda ids: (
+        select(User)
+        .where(User.password_reset_token == ids["password_reset_token"])
+    ),
+    "idx_sessions_app_name_update_time": lambda ids: (
+        select(Session)
+        .where(Session.app_name == ids["app_name"])
+        .order_by(Session.update_time.desc(), Session.id)
+        .limit(100)
+    ),
+}
+
+
+@pytest.fixture(scope="module")
+def plan_connection():
+    """Connection holding the seeded rows; nothing seeded is kept"""
+    engine = create_engine(DATABASE_URL)
+    connection = engine.connect()
+    transaction = connection.begin()
+    params = {
+        "clients": max(int(50 * SCALE), 2),
+        "users": max(int(20000 * SCALE), 200),
+        "folders_per_client": 20,
+        "agents_per_folder": 20,
+        "keys_per_client": 50,
+        "logs_per_user": 10,
+        "session_agents": max(int(100 * SCALE), 2),
+        "sessions_per_agent": 1000,
+    }
+    try:
+        for statement in SEED_STATEMENTS:
+            connection.execute(text(statement), params)
+        for table in (
+            "clients",
+            "users",
+            "agent_folders",
+            "agents",
+            "api_keys",
+            "audit_logs",
+            "sessions",
+        ):
+            connection.execute(text(f"ANALYZE {table}"))
+        yield connection
+    finally:
+        transaction.rollback()
+        connection.close()
+        engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def seeded_ids(plan_connection) -> Dict[str, Any]:
+    """Values of seeded rows used as query parameters"""
+    client_id, folder_id = plan_connection.execute(
+        text(
+            "SELECT a.client_id, a.folder_id FROM agents a "
+            "JOIN clients c ON c.id = a.client_id "
+            "WHERE c.email LIKE '%@plans.test' LIMIT 1"
+        )
+    ).one()
+    user_id, verification_token = plan_connection.execute(
+        text(
+            "SELECT id, verification_token FROM users "
+            "WHERE verification_token IS NOT NULL AND email LIKE '%@plans.test' "
+            "LIMIT 1"
+        )
+    ).one()
+    return {
+        "client_id": client_id,
+        "folder_id": folder_id,
+        "user_id": user_id,
+        "verification_token": verification_token,
+        "password_reset_token": plan_connection.execute(
+            text(
+                "SELECT password_reset_token FROM users "
+                "WHERE password_reset_token IS NOT NULL "
+                "AND email LIKE '%@plans.test' LIMIT 1"
+            )
+        ).scalar(),
+        "app_name": plan_connection.execute(
+            text(
+                "SELECT app_name FROM sessions "
+                "WHERE user_id LIKE 'plan_user_%' LIMIT 1"
+            )
+        ).scalar(),
+    }
+
+
+def _scanned_indexes(plan: Dict[str, Any]) -> List[str]:
+    indexes = []
+    if plan.get("Node Type") in INDEX_SCANS and plan.get("Index Name"):
+        indexes.append(plan["Index Name"])
+    for child in plan.get("Plans", []):
+        indexes.extend(_scanned_indexes(child))
+    return indexes
+
+
+@pytest.mark.parametrize("index_name", list(HOT_QUERIES))
+def test_hot_query_uses_index(plan_connection, seeded_ids, index_name):
+    """The planner picks the index created for the lookup"""
+    statement = HOT_QUERIES[index_name](seeded_ids)
+    sql = statement.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    result = plan_connection.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+    plan = (json.loads(result) if isinstance(result, str) else result)[0]["Plan"]
+
+    indexes = _scanned_indexes(plan)
+    assert index_name in indexes, (
+        f"expected {index_name}, scanned {indexes or 'no index'}\n"
+        f"{json.dumps(plan, indent=2)}"
+    )